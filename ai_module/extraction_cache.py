@@ -0,0 +1,342 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from dotenv import load_dotenv
+
+
+def normalize_input(text: str) -> str:
+    return " ".join(text.split()).lower()
+
+
+def make_cache_key(user_input: str, prompt_hash: str, model_name: str) -> str:
+    raw = "\0".join([model_name, prompt_hash, normalize_input(user_input)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class CacheBackend:
+    name = "base"
+    # Whether get/set do blocking I/O; the async path then calls them on a
+    # thread instead of the event loop.
+    blocking = False
+
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def after_fork(self) -> None:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    name = "memory"
+
+    def __init__(self, max_size: int = 1024, ttl: float = 3600.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                return None
+
+            value, stored_at = entry
+            if self.ttl > 0 and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    name = "sqlite"
+    blocking = True
+
+    def __init__(
+        self,
+        path: str,
+        max_size: int = 100000,
+        ttl: float = 86400.0,
+        touch_batch_size: int = 256,
+        touch_interval: float = 5.0,
+    ):
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.touch_batch_size = touch_batch_size
+        self.touch_interval = touch_interval
+
+        # The table is trimmed back to max_size only once it grows 10% past it,
+        # and the size is only checked every few inserts, so eviction runs once
+        # per batch of writes instead of on every one.
+        self.high_water = max_size + max(1, max_size // 10)
+        self.evict_check_interval = max(1, min(64, self.high_water - max_size))
+
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connect()
+
+    def _connect(self) -> None:
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        # WAL lets pre-forked workers read while another one writes, and with
+        # synchronous=NORMAL a commit does not wait for an fsync.
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS extraction_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute(
+            """
+            CREATE INDEX IF NOT EXISTS extraction_cache_accessed_at
+            ON extraction_cache (accessed_at)
+            """
+        )
+        self._connection.commit()
+
+        # Access times of recent hits, written in one batch (see _flush_touches).
+        self._touched: Dict[str, float] = {}
+        self._flushed_at = time.monotonic()
+        self._inserts = 0
+
+    def after_fork(self) -> None:
+        # A SQLite connection must not be shared with the process it was
+        # opened in; each pre-forked worker opens its own.
+        self._lock = threading.Lock()
+        self._connect()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, stored_at FROM extraction_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            value, stored_at = row
+            if self.ttl > 0 and now - stored_at > self.ttl:
+                self._touched.pop(key, None)
+                self._connection.execute(
+                    "DELETE FROM extraction_cache WHERE key = ?", (key,)
+                )
+                self._connection.commit()
+                return None
+
+            # A hit only reorders eviction, so it does not pay for a write and
+            # a commit of its own.
+            self._touched[key] = now
+            self._flush_touches()
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO extraction_cache VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._touched.pop(key, None)
+
+            self._inserts += 1
+            if self._inserts >= self.evict_check_interval:
+                self._inserts = 0
+                self._evict()
+
+            self._connection.commit()
+
+    def _flush_touches(self, force: bool = False) -> None:
+        if not self._touched:
+            return
+
+        if (
+            not force
+            and len(self._touched) < self.touch_batch_size
+            and time.monotonic() - self._flushed_at < self.touch_interval
+        ):
+            return
+
+        self._connection.executemany(
+            "UPDATE extraction_cache SET accessed_at = ? WHERE key = ?",
+            [(accessed_at, key) for key, accessed_at in self._touched.items()],
+        )
+        self._connection.commit()
+        self._touched.clear()
+        self._flushed_at = time.monotonic()
+
+    def _evict(self) -> None:
+        [(rows,)] = self._connection.execute(
+            "SELECT COUNT(*) FROM extraction_cache"
+        ).fetchall()
+
+        if rows <= self.high_water:
+            return
+
+        # Pending access times first, so recently hit entries are kept.
+        self._flush_touches(force=True)
+        self._connection.execute(
+            """
+            DELETE FROM extraction_cache WHERE key IN (
+                SELECT key FROM extraction_cache ORDER BY accessed_at LIMIT ?
+            )
+            """,
+            (rows - self.max_size,),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._touched.clear()
+            self._connection.execute("DELETE FROM extraction_cache")
+            self._connection.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM extraction_cache"
+            ).fetchone()[0]
+
+
+class ExtractionCache:
+    def __init__(self, backend: Optional[CacheBackend]):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.backend is None:
+            return None
+
+        value = self.backend.get(key)
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        return json.loads(value)
+
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        if self.backend is not None:
+            self.backend.set(key, json.dumps(result))
+
+    async def get_async(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.backend is None or not self.backend.blocking:
+            return self.get(key)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get, key)
+
+    async def set_async(self, key: str, result: Dict[str, Any]) -> None:
+        if self.backend is None or not self.backend.blocking:
+            return self.set(key, result)
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.set, key, result)
+
+    def clear(self) -> None:
+        if self.backend is not None:
+            self.backend.clear()
+
+    def after_fork(self) -> None:
+        if self.backend is not None:
+            self.backend.after_fork()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+
+        return {
+            "backend": self.backend.name if self.backend is not None else "disabled",
+            "size": len(self.backend) if self.backend is not None else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def build_extraction_cache() -> ExtractionCache:
+    load_dotenv()
+
+    backend_name = os.getenv("EXTRACTION_CACHE", "memory").lower()
+    ttl = float(os.getenv("EXTRACTION_CACHE_TTL", "3600"))
+
+    if backend_name == "memory":
+        max_size = int(os.getenv("EXTRACTION_CACHE_SIZE", "1024"))
+        return ExtractionCache(MemoryCacheBackend(max_size=max_size, ttl=ttl))
+
+    if backend_name == "sqlite":
+        max_size = int(os.getenv("EXTRACTION_CACHE_SIZE", "100000"))
+        path = os.getenv("EXTRACTION_CACHE_PATH", "data/cache/extraction_cache.sqlite")
+        return ExtractionCache(SQLiteCacheBackend(path, max_size=max_size, ttl=ttl))
+
+    if backend_name in ("off", "none", "disabled"):
+        return ExtractionCache(None)
+
+    raise ValueError(f"Unknown EXTRACTION_CACHE backend: {backend_name}")
+
+
+_extraction_cache: Optional[ExtractionCache] = None
+_extraction_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> ExtractionCache:
+    # Built on first use rather than at import: the SQLite backend creates its
+    # directory and opens the database, and each pre-forked worker must open
+    # its own connection anyway.
+    global _extraction_cache
+
+    if _extraction_cache is None:
+        with _extraction_cache_lock:
+            if _extraction_cache is None:
+                _extraction_cache = build_extraction_cache()
+
+    return _extraction_cache
@@ -1,21 +1,126 @@
+import asyncio
 import os
-from google import genai
-from google.genai import types
+import threading
 from dotenv import load_dotenv
 
-load_dotenv()
+from ai_module.resilient_client import ResilientLLMClient, TokenBucket, CircuitBreaker
+from monitoring.metrics import count
 
-client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+load_dotenv()
 
 MODEL_NAME = "gemini-2.5-flash"
 
-def call_gemini(prompt: str) -> str:
-    response = client.models.generate_content(
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "256"))
+
+# Socket timeout (seconds) of each HTTP request. The client's deadline only
+# stops the caller waiting; without this an abandoned sync call keeps its pool
+# thread until the backend answers.
+GEMINI_HTTP_TIMEOUT = float(
+    os.getenv("GEMINI_HTTP_TIMEOUT", os.getenv("GEMINI_DEADLINE", "10"))
+)
+
+_GENERATION_CONFIG = {
+    "temperature": 0.0,
+    "response_mime_type": "application/json",
+}
+
+_client = None
+_client_lock = threading.Lock()
+_async_semaphore = None
+
+_TOKEN_FIELDS = {
+    "prompt": "prompt_token_count",
+    "output": "candidates_token_count",
+    "total": "total_token_count",
+}
+
+
+def get_client():
+    # google.genai takes about half a second to import, so it is only loaded
+    # (and the client built) on first use instead of at app import.
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from google import genai
+
+                _client = genai.Client(
+                    api_key=os.getenv("GEMINI_API_KEY"),
+                    http_options={"timeout": GEMINI_HTTP_TIMEOUT},
+                )
+
+    return _client
+
+
+def _record_usage(response) -> None:
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+
+    for kind, field in _TOKEN_FIELDS.items():
+        tokens = getattr(usage, field, None)
+        if tokens:
+            count("sleep_gemini_tokens_total", tokens, type=kind)
+
+
+def _generate(prompt: str) -> str:
+    response = get_client().models.generate_content(
         model=MODEL_NAME,
         contents=prompt,
-        config=types.GenerateContentConfig(
-            temperature=0.0,
-            response_mime_type="application/json",
+        config=_GENERATION_CONFIG,
+    )
+    _record_usage(response)
+    return response.text
+
+
+async def _generate_async(prompt: str) -> str:
+    global _async_semaphore
+
+    if _async_semaphore is None:
+        _async_semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+
+    async with _async_semaphore:
+        response = await get_client().aio.models.generate_content(
+            model=MODEL_NAME,
+            contents=prompt,
+            config=_GENERATION_CONFIG,
+        )
+    _record_usage(response)
+    return response.text
+
+
+def build_resilient_client(
+    call=_generate, call_async=_generate_async
+) -> ResilientLLMClient:
+    rate = float(os.getenv("GEMINI_RATE_LIMIT", "0"))
+
+    return ResilientLLMClient(
+        call,
+        call_async,
+        deadline=float(os.getenv("GEMINI_DEADLINE", "10")),
+        max_retries=int(os.getenv("GEMINI_MAX_RETRIES", "2")),
+        backoff=float(os.getenv("GEMINI_RETRY_BACKOFF", "0.2")),
+        rate_limiter=(
+            TokenBucket(rate, float(os.getenv("GEMINI_RATE_BURST", str(max(rate, 1)))))
+            if rate > 0
+            else None
         ),
+        breaker=CircuitBreaker(
+            failure_threshold=int(os.getenv("GEMINI_BREAKER_FAILURES", "5")),
+            reset_timeout=float(os.getenv("GEMINI_BREAKER_RESET", "30")),
+        ),
+        hedge=os.getenv("GEMINI_HEDGE", "1").lower() in ("1", "true", "yes"),
+        hedge_min_samples=int(os.getenv("GEMINI_HEDGE_MIN_SAMPLES", "50")),
     )
-    return response.text
\ No newline at end of file
+
+
+gemini = build_resilient_client()
+
+
+def call_gemini(prompt: str) -> str:
+    return gemini.generate(prompt)
+
+
+async def call_gemini_async(prompt: str) -> str:
+    return await gemini.generate_async(prompt)
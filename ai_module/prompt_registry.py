@@ -0,0 +1,116 @@
+import hashlib
+import os
+import threading
+import time
+import yaml
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PROMPT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prompt")
+DEFAULT_PROMPT = os.getenv("EXTRACTION_PROMPT", "extract_sleep")
+
+
+class PromptTemplate:
+    def __init__(self, name: str, path: str):
+        self.name = name
+        self.path = path
+
+        with open(path, "rb") as f:
+            raw = f.read()
+
+        self.mtime = os.stat(path).st_mtime
+        self.content_hash = hashlib.sha256(raw).hexdigest()
+
+        prompt_data = yaml.safe_load(raw.decode("utf-8"))
+        system_prompt = prompt_data["system"]["content"]
+
+        # Only the user part is a format string; the system part is literal text
+        # and may contain JSON braces, so it is never passed through str.format.
+        self._system = f"SYSTEM:{system_prompt}"
+        self._user_marker = "\n                          USER:"
+        self._head = self._system + self._user_marker
+        self._user = prompt_data["user"]["content"]
+        self._tail = "\n                       "
+
+    def render(self, user_input: str, fields: Optional[List[str]] = None) -> str:
+        head = self._head
+
+        if fields:
+            # The other fields were already filled locally; asking for fewer
+            # fields keeps the response (and the call) short.
+            head = (
+                self._system
+                + "\nExtract ONLY the following fields; the others are already "
+                + f"known: {', '.join(fields)}.\n"
+                + self._user_marker
+            )
+
+        return head + self._user.format(user_input=user_input) + self._tail
+
+
+class PromptRegistry:
+    def __init__(self, prompt_dir: str = PROMPT_DIR, check_interval: float = 1.0):
+        self.prompt_dir = prompt_dir
+        self.check_interval = check_interval
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._names = self._scan()
+        self._names_checked_at = time.monotonic()
+
+        for name in self._names:
+            self._load(name)
+
+    def names(self) -> List[str]:
+        # Checked on every /predict, so the directory is rescanned at most once
+        # per check_interval rather than listed on each request.
+        now = time.monotonic()
+
+        if now - self._names_checked_at >= self.check_interval:
+            self._names = self._scan()
+            self._names_checked_at = now
+
+        return self._names
+
+    def _scan(self) -> List[str]:
+        return sorted(
+            os.path.splitext(file)[0]
+            for file in os.listdir(self.prompt_dir)
+            if file.endswith(".yaml")
+        )
+
+    def get(self, name: Optional[str] = None) -> PromptTemplate:
+        name = name or DEFAULT_PROMPT
+        template = self._templates.get(name)
+        now = time.monotonic()
+
+        if template is not None and now - self._checked_at[name] < self.check_interval:
+            return template
+
+        path = os.path.join(self.prompt_dir, f"{name}.yaml")
+
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            raise KeyError(f"Unknown prompt version: {name}") from None
+
+        if template is not None and template.mtime == mtime:
+            self._checked_at[name] = now
+            return template
+
+        return self._load(name)
+
+    def _load(self, name: str) -> PromptTemplate:
+        with self._lock:
+            template = PromptTemplate(
+                name, os.path.join(self.prompt_dir, f"{name}.yaml")
+            )
+            self._templates[name] = template
+            self._checked_at[name] = time.monotonic()
+            return template
+
+
+prompt_registry = PromptRegistry()
@@ -0,0 +1,411 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, Awaitable, Callable, Optional
+
+import numpy as np
+
+
+class LLMUnavailable(RuntimeError):
+    pass
+
+
+class CircuitOpen(LLMUnavailable):
+    pass
+
+
+class DeadlineExceeded(LLMUnavailable):
+    pass
+
+
+class RateLimited(LLMUnavailable):
+    pass
+
+
+def is_transient(error: Exception) -> bool:
+    # Only errors that a later attempt may not hit again are retried and count
+    # toward the breaker: timeouts, connection errors, 429 and 5xx. An HTTP
+    # error's status is read from `.code` (google.genai) or `.response`.
+    status = getattr(error, "code", None)
+    if not isinstance(status, int):
+        status = getattr(getattr(error, "response", None), "status_code", None)
+
+    if isinstance(status, int):
+        return status in (408, 429) or status >= 500
+
+    # requests' Timeout and ConnectionError are OSErrors, like socket errors.
+    return isinstance(error, (DeadlineExceeded, asyncio.TimeoutError, OSError))
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        # Takes a token if one is available; otherwise returns how long to wait.
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+
+        while True:
+            wait_for = self._reserve()
+            if wait_for == 0.0:
+                return True
+            if time.monotonic() + wait_for > deadline:
+                return False
+            time.sleep(wait_for)
+
+    async def acquire_async(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+
+        while True:
+            wait_for = self._reserve()
+            if wait_for == 0.0:
+                return True
+            if time.monotonic() + wait_for > deadline:
+                return False
+            await asyncio.sleep(wait_for)
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+
+            # Half-open: a single probe call decides whether to close again.
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def release(self) -> None:
+        # The call failed through no fault of the service (e.g. a 400), so it
+        # neither opens nor closes the breaker; a half-open breaker probes again.
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    def __init__(self, window: int = 500):
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            return float(np.percentile(list(self._samples), q))
+
+
+class ResilientLLMClient:
+    def __init__(
+        self,
+        call: Callable[[str], str],
+        call_async: Optional[Callable[[str], Awaitable[str]]] = None,
+        deadline: float = 10.0,
+        max_retries: int = 2,
+        backoff: float = 0.2,
+        rate_limiter: Optional[TokenBucket] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        hedge: bool = True,
+        hedge_min_samples: int = 50,
+        hedge_min_delay: float = 0.05,
+        max_workers: int = 32,
+    ):
+        self.call = call
+        self.call_async = call_async
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.rate_limiter = rate_limiter
+        self.breaker = breaker or CircuitBreaker()
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_delay = hedge_min_delay
+        self.latency = LatencyTracker()
+
+        # Sync calls run on this pool so a hung request can be abandoned at its
+        # deadline instead of blocking the caller's worker thread.
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="llm-call"
+        )
+
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.rejected = 0
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + n)
+
+    def _hedge_delay(self) -> Optional[float]:
+        if not self.hedge or len(self.latency) < self.hedge_min_samples:
+            return None
+        return max(self.latency.percentile(95), self.hedge_min_delay)
+
+    def _may_hedge(self) -> bool:
+        # A hedge is one more real request: it needs its own rate-limit token,
+        # and a half-open breaker allows a single probe only.
+        if self.breaker.state != CircuitBreaker.CLOSED:
+            return False
+        return self.rate_limiter is None or self.rate_limiter.acquire(0)
+
+    def _backoff(self, attempt: int, remaining: float) -> float:
+        # Full jitter, never sleeping past the deadline.
+        return min(random.uniform(0, self.backoff * (2**attempt)), max(remaining, 0))
+
+    def _before_call(self) -> float:
+        if not self.breaker.allow():
+            self._count("rejected")
+            raise CircuitOpen("LLM circuit breaker is open")
+
+        self._count("calls")
+        return time.monotonic() + self.deadline
+
+    def _after_failure(self, error: Exception) -> None:
+        self._count("failures")
+
+        if is_transient(error):
+            self.breaker.record_failure()
+        else:
+            self.breaker.release()
+
+        if isinstance(error, LLMUnavailable):
+            raise error
+        raise LLMUnavailable(f"LLM call failed: {error}") from error
+
+    def generate(self, prompt: str) -> str:
+        deadline = self._before_call()
+        last_error: Exception = DeadlineExceeded("LLM call exceeded its deadline")
+
+        for attempt in range(self.max_retries + 1):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            if self.rate_limiter and not self.rate_limiter.acquire(remaining):
+                last_error = RateLimited("LLM rate limit reached before the deadline")
+                break
+
+            try:
+                result = self._attempt(prompt, deadline)
+                self.breaker.record_success()
+                return result
+            except Exception as e:
+                last_error = e
+
+            if not is_transient(last_error):
+                break
+
+            if attempt < self.max_retries:
+                self._count("retries")
+                time.sleep(self._backoff(attempt, deadline - time.monotonic()))
+
+        self._after_failure(last_error)
+
+    def _attempt(self, prompt: str, deadline: float) -> str:
+        start = time.monotonic()
+        futures = {self._executor.submit(self.call, prompt): "primary"}
+        hedge_delay = self._hedge_delay()
+
+        if hedge_delay is not None:
+            done, _ = wait(futures, timeout=min(hedge_delay, deadline - start))
+            if not done and time.monotonic() < deadline and self._may_hedge():
+                self._count("hedges")
+                futures[self._executor.submit(self.call, prompt)] = "hedge"
+
+        while futures:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise DeadlineExceeded("LLM call exceeded its deadline")
+
+            done, _ = wait(futures, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                raise DeadlineExceeded("LLM call exceeded its deadline")
+
+            for future in done:
+                kind = futures.pop(future)
+                if future.exception() is not None:
+                    # The other request may still succeed.
+                    if not futures:
+                        raise future.exception()
+                    continue
+
+                self.latency.add(time.monotonic() - start)
+                if kind == "hedge":
+                    self._count("hedge_wins")
+                return future.result()
+
+        raise DeadlineExceeded("LLM call exceeded its deadline")
+
+    async def generate_async(self, prompt: str) -> str:
+        if self.call_async is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.generate, prompt)
+
+        deadline = self._before_call()
+
+        try:
+            return await self._generate_async(prompt, deadline)
+        except asyncio.CancelledError:
+            # The caller went away (e.g. the client disconnected). Neither a
+            # success nor a failure, but a half-open probe must free its slot or
+            # the breaker never leaves HALF_OPEN.
+            self.breaker.release()
+            raise
+
+    async def _generate_async(self, prompt: str, deadline: float) -> str:
+        last_error: Exception = DeadlineExceeded("LLM call exceeded its deadline")
+
+        for attempt in range(self.max_retries + 1):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            if self.rate_limiter and not await self.rate_limiter.acquire_async(
+                remaining
+            ):
+                last_error = RateLimited("LLM rate limit reached before the deadline")
+                break
+
+            try:
+                result = await self._attempt_async(prompt, deadline)
+                self.breaker.record_success()
+                return result
+            except Exception as e:
+                last_error = e
+
+            if not is_transient(last_error):
+                break
+
+            if attempt < self.max_retries:
+                self._count("retries")
+                await asyncio.sleep(self._backoff(attempt, deadline - time.monotonic()))
+
+        self._after_failure(last_error)
+
+    async def _attempt_async(self, prompt: str, deadline: float) -> str:
+        start = time.monotonic()
+        tasks = {asyncio.ensure_future(self.call_async(prompt)): "primary"}
+        hedge_delay = self._hedge_delay()
+
+        try:
+            if hedge_delay is not None:
+                done, _ = await asyncio.wait(
+                    tasks, timeout=min(hedge_delay, deadline - start)
+                )
+                if not done and time.monotonic() < deadline and self._may_hedge():
+                    self._count("hedges")
+                    tasks[asyncio.ensure_future(self.call_async(prompt))] = "hedge"
+
+            while tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise DeadlineExceeded("LLM call exceeded its deadline")
+
+                done, _ = await asyncio.wait(
+                    tasks, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    raise DeadlineExceeded("LLM call exceeded its deadline")
+
+                for task in done:
+                    kind = tasks.pop(task)
+                    if task.exception() is not None:
+                        if not tasks:
+                            raise task.exception()
+                        continue
+
+                    self.latency.add(time.monotonic() - start)
+                    if kind == "hedge":
+                        self._count("hedge_wins")
+                    return task.result()
+
+            raise DeadlineExceeded("LLM call exceeded its deadline")
+
+        finally:
+            # Unlike threads, the losing (or timed-out) requests can be cancelled.
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        p50 = self.latency.percentile(50)
+        p95 = self.latency.percentile(95)
+
+        with self._stats_lock:
+            return {
+                "calls": self.calls,
+                "failures": self.failures,
+                "retries": self.retries,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "rejected": self.rejected,
+                "breaker_state": self.breaker.state,
+                "latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            }
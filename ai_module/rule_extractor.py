@@ -0,0 +1,256 @@
+import re
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from ai_module.validation import ALLOWED_FIELDS
+
+# Deterministic extractor for text that is already close to structured
+# ("Age: 45, Gender: male, BP 130/85, ..."). A field is only filled when a
+# pattern matches unambiguously; everything else is left to Gemini.
+
+_NUMBER = r"(\d+(?:[.,]\d+)?)"
+_SEP = r"\s*(?:[:=]|\bis\b|\bof\b|\bé\b|\bde\b)?\s*"
+
+GENDERS = {
+    "male": "Male",
+    "man": "Male",
+    "m": "Male",
+    "masculino": "Male",
+    "homem": "Male",
+    "female": "Female",
+    "woman": "Female",
+    "f": "Female",
+    "feminino": "Female",
+    "mulher": "Female",
+}
+
+OCCUPATIONS = {
+    "doctor": "Doctor",
+    "physician": "Doctor",
+    "médico": "Doctor",
+    "médica": "Doctor",
+    "medico": "Doctor",
+    "medica": "Doctor",
+    "nurse": "Nurse",
+    "enfermeiro": "Nurse",
+    "enfermeira": "Nurse",
+    "engineer": "Engineer",
+    "engenheiro": "Engineer",
+    "engenheira": "Engineer",
+    "teacher": "Teacher",
+    "professor": "Teacher",
+    "professora": "Teacher",
+    "accountant": "Accountant",
+    "contador": "Accountant",
+    "contadora": "Accountant",
+    "lawyer": "Lawyer",
+    "advogado": "Lawyer",
+    "advogada": "Lawyer",
+    "salesperson": "Salesperson",
+    "vendedor": "Salesperson",
+    "vendedora": "Salesperson",
+}
+
+BMI_CATEGORIES = {
+    "underweight": "Underweight",
+    "abaixo do peso": "Underweight",
+    "normal weight": "Normal",
+    "normal": "Normal",
+    "overweight": "Overweight",
+    "sobrepeso": "Overweight",
+    "obese": "Obese",
+    "obesity": "Obese",
+    "obeso": "Obese",
+    "obesa": "Obese",
+    "obesidade": "Obese",
+}
+
+
+def _alternatives(words) -> str:
+    return "|".join(sorted((re.escape(w) for w in words), key=len, reverse=True))
+
+
+def _to_float(raw: str) -> float:
+    return float(raw.replace(",", "."))
+
+
+def _to_steps(raw: str, thousands: str) -> Optional[int]:
+    if thousands:
+        return int(round(_to_float(raw) * 1000))
+
+    digits = re.sub(r"[.,\s]", "", raw)
+    return int(digits) if digits.isdigit() else None
+
+
+def _in_range(low: float, high: float) -> Callable[[Any], bool]:
+    return lambda value: low <= value <= high
+
+
+def _valid_blood_pressure(bp: str) -> bool:
+    systolic, diastolic = (int(part) for part in bp.split("/"))
+    return 70 <= systolic <= 250 and 40 <= diastolic <= 150
+
+
+# field -> list of (pattern, converter, validator)
+#
+# Every pattern is key-anchored: the field is named next to its value ("Age:
+# 45", "BMI is overweight", "BP 130/85"). Free text ("my son sleeps 10 hours",
+# "a nurse 10 years ago") often describes someone else or another time, so it
+# is left to Gemini, which is told not to infer.
+PATTERNS: Dict[str, List[Tuple[re.Pattern, Callable, Callable]]] = {
+    "Gender": [
+        (
+            re.compile(
+                rf"\b(?:gender|sex|sexo|g[êe]nero){_SEP}({_alternatives(GENDERS)})\b"
+            ),
+            lambda m: GENDERS[m.group(1)],
+            bool,
+        ),
+    ],
+    "Age": [
+        (
+            re.compile(rf"\b(?:age|idade){_SEP}(\d{{1,3}})\b"),
+            lambda m: int(m.group(1)),
+            _in_range(1, 120),
+        ),
+    ],
+    "Occupation": [
+        (
+            re.compile(
+                rf"\b(?:occupation|job|profession|ocupa[çc][ãa]o|profiss[ãa]o){_SEP}"
+                rf"(?:an?\s+)?({_alternatives(OCCUPATIONS)})\b"
+            ),
+            lambda m: OCCUPATIONS[m.group(1)],
+            bool,
+        ),
+    ],
+    "Sleep Duration": [
+        (
+            re.compile(
+                rf"\b(?:sleep duration|dura[çc][ãa]o do sono){_SEP}{_NUMBER}"
+                r"\s*(?:h\b|hours?\b|hrs?\b|horas?\b)?"
+            ),
+            lambda m: _to_float(m.group(1)),
+            _in_range(0, 24),
+        ),
+    ],
+    "Quality of Sleep": [
+        (
+            re.compile(
+                rf"\b(?:quality of sleep|sleep quality|qualidade do sono){_SEP}"
+                r"(\d{1,2})(?:\s*/\s*10)?\b"
+            ),
+            lambda m: int(m.group(1)),
+            _in_range(1, 10),
+        ),
+    ],
+    "Physical Activity Level": [
+        (
+            re.compile(
+                rf"\b(?:physical activity level|physical activity|activity level|"
+                rf"atividade f[íi]sica){_SEP}(\d{{1,3}})\b"
+            ),
+            lambda m: int(m.group(1)),
+            _in_range(0, 600),
+        ),
+    ],
+    "Stress Level": [
+        (
+            re.compile(
+                rf"\b(?:stress level|stress|n[íi]vel de estresse|estresse){_SEP}"
+                r"(\d{1,2})(?:\s*/\s*10)?\b"
+            ),
+            lambda m: int(m.group(1)),
+            _in_range(1, 10),
+        ),
+    ],
+    "BMI Category": [
+        (
+            re.compile(
+                rf"\b(?:bmi category|bmi|imc){_SEP}({_alternatives(BMI_CATEGORIES)})\b"
+            ),
+            lambda m: BMI_CATEGORIES[m.group(1)],
+            bool,
+        ),
+    ],
+    "Blood Pressure": [
+        (
+            re.compile(
+                rf"\b(?:blood pressure|bp|pressure|press[ãa]o arterial|press[ãa]o){_SEP}"
+                r"(\d{2,3})\s*/\s*(\d{2,3})\b"
+            ),
+            lambda m: f"{m.group(1)}/{m.group(2)}",
+            _valid_blood_pressure,
+        ),
+    ],
+    "Heart Rate": [
+        (
+            re.compile(
+                rf"\b(?:heart rate|hr|pulse|resting heart rate|frequ[êe]ncia card[íi]aca|"
+                rf"batimentos){_SEP}(\d{{2,3}})\b"
+            ),
+            lambda m: int(m.group(1)),
+            _in_range(30, 220),
+        ),
+    ],
+    "Daily Steps": [
+        (
+            re.compile(
+                rf"\b(?:daily steps|steps per day|step count|steps|passos){_SEP}"
+                r"(\d{1,3}(?:[.,]\d{3})+|\d+(?:[.,]\d+)?)\s*(k)?\b"
+            ),
+            lambda m: _to_steps(m.group(1), m.group(2)),
+            _in_range(0, 100000),
+        ),
+    ],
+}
+
+_AMBIGUOUS = object()
+
+# A key owned by someone else ("my wife's pressure", "his age") is not the
+# user's value.
+_OTHER_PERSON = re.compile(
+    r"(?:\b(?:his|her|their)|\b(?!(?:it|that|here|what)'s)\w+'s|\ws')\s*$"
+)
+
+
+def _match_field(
+    text: str, patterns: List[Tuple[re.Pattern, Callable, Callable]]
+) -> Optional[Any]:
+    for pattern, convert, is_valid in patterns:
+        values = set()
+
+        for match in pattern.finditer(text):
+            before = text[max(match.start() - 24, 0) : match.start()]
+            if _OTHER_PERSON.search(before):
+                continue
+
+            try:
+                value = convert(match)
+            except (ValueError, KeyError):
+                continue
+            if value is not None and is_valid(value):
+                values.add(value)
+
+        # Two different readings of the same field are ambiguous; leave it to
+        # the LLM rather than guess.
+        if len(values) == 1:
+            return values.pop()
+        if len(values) > 1:
+            return _AMBIGUOUS
+
+    return None
+
+
+def extract_with_rules(text: str) -> Dict[str, Any]:
+    lowered = text.lower()
+    extracted = {}
+
+    for field in ALLOWED_FIELDS:
+        value = _match_field(lowered, PATTERNS[field])
+        if value is not None and value is not _AMBIGUOUS:
+            extracted[field] = value
+
+    return {
+        "extracted": extracted,
+        "missing_fields": sorted(ALLOWED_FIELDS - extracted.keys()),
+    }
@@ -1,28 +1,144 @@
-import yaml
 import json
-from ai_module.gemini_client import call_gemini
+import os
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from ai_module.gemini_client import call_gemini, call_gemini_async, MODEL_NAME
+from ai_module.extraction_cache import get_extraction_cache, make_cache_key
+from ai_module.prompt_registry import prompt_registry
+from ai_module.rule_extractor import extract_with_rules
+from ai_module.resilient_client import LLMUnavailable
+from monitoring.metrics import timed, count
+
+load_dotenv()
+
+RULE_EXTRACTOR = os.getenv("RULE_EXTRACTOR", "1").lower() in ("1", "true", "yes")
 
 
 class AISelector:
-    def __init__(self, user_input: str):
+    def __init__(
+        self,
+        user_input: str,
+        cache=None,
+        prompt_version=None,
+        use_rules: bool = RULE_EXTRACTOR,
+    ):
         self.user_input = user_input
-        self.extract_prompt_path = "ai_module/prompt/extract_sleep.yaml"
+        with timed("prompt_load"):
+            self.prompt = prompt_registry.get(prompt_version)
+        self.cache = cache if cache is not None else get_extraction_cache()
+        self.cache_key = make_cache_key(
+            user_input, self.prompt.content_hash, MODEL_NAME
+        )
+        self.use_rules = use_rules
+        self.rule_result = None
+        # "rules", "cache", "rules+llm", "llm" or "fallback": where the
+        # extraction came from.
+        self.source = None
 
     def extract_information(self) -> dict:
-        with open(self.extract_prompt_path, "r", encoding="utf-8") as f:
-            prompt_data = yaml.safe_load(f)
+        result = self._extract_locally()
+
+        if result is None:
+            with timed("cache_lookup"):
+                cached = self.cache.get(self.cache_key)
+            result = self._from_cache(cached)
+
+        if result is not None:
+            return result
+
+        try:
+            with timed("llm_call"):
+                output = call_gemini(self._prompt())
+        except LLMUnavailable:
+            return self._fallback()
+
+        result = self._parse(output)
+        self.cache.set(self.cache_key, result)
+        return result
+
+    async def extract_information_async(self) -> dict:
+        # Same steps; a blocking cache backend (SQLite) runs on a thread so it
+        # does not stall the event loop.
+        result = self._extract_locally()
+
+        if result is None:
+            with timed("cache_lookup"):
+                cached = await self.cache.get_async(self.cache_key)
+            result = self._from_cache(cached)
+
+        if result is not None:
+            return result
+
+        try:
+            with timed("llm_call"):
+                output = await call_gemini_async(self._prompt())
+        except LLMUnavailable:
+            return self._fallback()
+
+        result = self._parse(output)
+        await self.cache.set_async(self.cache_key, result)
+        return result
+
+    def _fallback(self) -> dict:
+        # Gemini is down, throttled or too slow: answer with whatever the local
+        # extractor found, so the caller gets the missing fields back instead of
+        # an error. Not cached, so the next request tries Gemini again.
+        self.source = "fallback"
+        count("sleep_extractions_total", source=self.source)
+        rule_result = self.rule_result or extract_with_rules(self.user_input)
+        return {"extracted": dict(rule_result["extracted"])}
+
+    def _extract_locally(self) -> Optional[dict]:
+        # Structured input is handled locally; Gemini is only asked for the
+        # fields the rule extractor could not read.
+        if not self.use_rules:
+            return None
+
+        with timed("rule_extract"):
+            self.rule_result = extract_with_rules(self.user_input)
+
+        if self.rule_result["missing_fields"]:
+            return None
+
+        self.source = "rules"
+        count("sleep_extractions_total", source=self.source)
+        return {"extracted": dict(self.rule_result["extracted"])}
+
+    def _from_cache(self, cached: Optional[dict]) -> Optional[dict]:
+        if cached is not None:
+            self.source = "cache"
+            count("sleep_extractions_total", source=self.source)
+        return cached
+
+    def _prompt(self) -> str:
+        if self.rule_result and self.rule_result["extracted"]:
+            self.source = "rules+llm"
+            return self.prompt.render(
+                self.user_input, fields=self.rule_result["missing_fields"]
+            )
+
+        self.source = "llm"
+        return self.prompt.render(self.user_input)
 
-        system_prompt = prompt_data["system"]["content"]
-        user_prompt = prompt_data["user"]["content"].format(user_input=self.user_input)
+    def _parse(self, output: str) -> dict:
+        with timed("parse"):
+            cleaned = self._clean_json_output(output)
+            result = json.loads(cleaned)
 
-        full_prompt = f"""SYSTEM:{system_prompt}
-                          USER:{user_prompt}
-                       """
+        count("sleep_extractions_total", source=self.source)
 
-        output = call_gemini(full_prompt)
-        cleaned = self._clean_json_output(output)
+        if self.source == "rules+llm":
+            # Key-anchored values ("Age: 45") take precedence; fields Gemini
+            # left out stay empty.
+            extracted = {
+                **(result.get("extracted") or {}),
+                **self.rule_result["extracted"],
+            }
+            result = {**result, "extracted": extracted}
 
-        return json.loads(cleaned)
+        return result
 
     def _clean_json_output(self, text: str) -> str:
         text = text.strip()
@@ -0,0 +1,177 @@
+import gc
+import os
+import threading
+from typing import Dict, Any, Callable, Generic, Optional, Tuple, TypeVar
+
+from dotenv import load_dotenv
+
+from ai_module.extraction_cache import ExtractionCache, get_extraction_cache
+from ai_module.gemini_client import get_client
+from models.model_manager import ModelManager, build_model_manager, start_model_watcher
+from monitoring.audit import AuditLog, build_audit_log
+from predict.micro_batcher import MicroBatcher, build_micro_batcher
+
+load_dotenv()
+
+# Start loading models and the Gemini client as soon as the app is created,
+# instead of on the first request.
+EAGER_INIT = os.getenv("EAGER_INIT", "1").lower() in ("1", "true", "yes")
+
+T = TypeVar("T")
+
+_UNSET = object()
+
+
+class LazyResource(Generic[T]):
+    def __init__(self, name: str, factory: Callable[[], T]):
+        self.name = name
+        self.factory = factory
+        self.error: Optional[Exception] = None
+        self._value: Any = _UNSET
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        value = self._value
+        if value is not _UNSET:
+            return value
+
+        # Concurrent first callers wait for a single build. A failed build is
+        # retried by the next caller (e.g. models published after startup).
+        with self._lock:
+            if self._value is _UNSET:
+                try:
+                    self._value = self.factory()
+                    self.error = None
+                except Exception as e:
+                    self.error = e
+                    raise
+
+            return self._value
+
+    def peek(self) -> Optional[T]:
+        # The value if already built, without triggering the build.
+        return None if self._value is _UNSET else self._value
+
+    @property
+    def ready(self) -> bool:
+        return self._value is not _UNSET
+
+    def status(self) -> str:
+        if self.ready:
+            return "ready"
+        if self.error is not None:
+            return f"error: {self.error}"
+        return "loading"
+
+
+class AppState:
+    def __init__(self, models_root: str = "models"):
+        self.model_manager: LazyResource[ModelManager] = LazyResource(
+            "models", lambda: build_model_manager(models_root, watch=self._watch_models)
+        )
+        self.micro_batcher: LazyResource[Optional[MicroBatcher]] = LazyResource(
+            "micro_batcher",
+            lambda: build_micro_batcher(lambda: self.model_manager.get().models),
+        )
+        self.audit_log: LazyResource[Optional[AuditLog]] = LazyResource(
+            "audit_log", build_audit_log
+        )
+        self.llm_client = LazyResource("llm_client", get_client)
+        self.extraction_cache: LazyResource[ExtractionCache] = LazyResource(
+            "extraction_cache", get_extraction_cache
+        )
+        self._init_thread: Optional[threading.Thread] = None
+        self._watch_models = True
+
+    @property
+    def resources(self) -> Tuple[LazyResource, ...]:
+        return (
+            self.model_manager,
+            self.micro_batcher,
+            self.audit_log,
+            self.llm_client,
+            self.extraction_cache,
+        )
+
+    @property
+    def models(self) -> Dict[str, Any]:
+        return self.model_manager.get().models
+
+    def initialize(self) -> bool:
+        # Builds everything; failures are kept on the resource for /ready.
+        for resource in self.resources:
+            try:
+                resource.get()
+            except Exception as e:
+                print(f"Initialization of {resource.name} failed: {e}")
+
+        return self.is_ready()
+
+    def start_background_init(self) -> None:
+        if self._init_thread is None:
+            self._init_thread = threading.Thread(
+                target=self.initialize, name="app-init", daemon=True
+            )
+            self._init_thread.start()
+
+    def prefork(self) -> None:
+        # Pre-fork serving (gunicorn --preload): the master loads and warms the
+        # models (warm_up covers every gender/occupation/BMI category) and
+        # imports the Gemini client once. Nothing that starts a thread is built
+        # here, since threads do not survive the fork.
+        #
+        # The GC stays off while loading so no freed holes are left in shared
+        # pages, then everything is frozen: collections in the workers skip
+        # these objects instead of writing to their headers and un-sharing
+        # the pages copy-on-write. The master's GC is turned back on after the
+        # freeze; it keeps running for the lifetime of the server.
+        gc.disable()
+        self._watch_models = False
+
+        try:
+            self.model_manager.get()
+
+            try:
+                self.llm_client.get()
+            except Exception as e:
+                print(f"Initialization of {self.llm_client.name} failed: {e}")
+        finally:
+            gc.collect()
+            gc.freeze()
+            gc.enable()
+
+    def post_fork(self) -> None:
+        gc.enable()
+        self._watch_models = True
+
+        cache = self.extraction_cache.peek()
+        if cache is not None:
+            cache.after_fork()
+
+        manager = self.model_manager.peek()
+        if manager is not None:
+            start_model_watcher(manager)
+
+    def is_ready(self) -> bool:
+        return all(resource.ready for resource in self.resources)
+
+    def readiness(self) -> Dict[str, Any]:
+        manager = self.model_manager.peek()
+
+        return {
+            "status": "ready" if self.is_ready() else "starting",
+            "model_version": manager.version if manager is not None else None,
+            "components": {
+                resource.name: resource.status() for resource in self.resources
+            },
+        }
+
+    def shutdown(self) -> None:
+        for resource in (self.micro_batcher, self.audit_log):
+            component = resource.peek()
+            if component is not None:
+                component.stop()
+
+        manager = self.model_manager.peek()
+        if manager is not None:
+            manager.stop_watcher()
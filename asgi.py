@@ -0,0 +1,406 @@
+import asyncio
+import contextlib
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional
+
+from dotenv import load_dotenv
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from ai_module.selector import AISelector
+from ai_module.prompt_registry import prompt_registry
+from ai_module.gemini_client import gemini
+from app_state import AppState, LazyResource, EAGER_INIT
+from predict.pipeline import prepare_model_input, run_prediction, predict_records
+from predict.micro_batcher import BatcherFull
+from predict.prediction_cache import prediction_cache
+from models.model_manager import is_admin_token_valid
+from monitoring.audit import build_audit_record
+from monitoring.metrics import metrics, start_request, finish_request, METRICS_ENABLED
+
+load_dotenv()
+
+REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", "30"))
+PREDICT_WORKERS = int(os.getenv("PREDICT_WORKERS", "4"))
+DISCONNECT_POLL_INTERVAL = 0.1
+
+
+class ClientDisconnected(Exception):
+    pass
+
+
+def audit(audit_log, status, start, **fields):
+    if audit_log is not None:
+        latency_ms = (time.perf_counter() - start) * 1000
+        audit_log.record(build_audit_record(status, latency_ms=latency_ms, **fields))
+
+
+def audit_batch(audit_log, results, start):
+    # One record per row, all with the latency of the whole batch.
+    for result in results:
+        audit(
+            audit_log,
+            result["status"],
+            start,
+            extracted=result.get("extracted"),
+            model_input=result.get("model_input"),
+            prediction=result.get("prediction"),
+        )
+
+
+class RequestMetricsMiddleware:
+    # Plain ASGI middleware: the request timer lives in a context variable, so it
+    # must be set in the same task that runs the endpoint.
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timer = start_request()
+        if timer is None:
+            return await self.app(scope, receive, send)
+
+        route = scope["path"] if scope["path"] in ROUTE_PATHS else "unmatched"
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                server_timing = finish_request(timer, route)
+                if server_timing is not None:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", server_timing.encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
+
+
+async def run_in_executor(executor: Optional[ThreadPoolExecutor], fn, *args):
+    # Carries the request context into the worker thread so stage timings
+    # recorded there still reach the request's Server-Timing header.
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(executor, partial(context.run, fn, *args))
+
+
+async def resolve(resource: LazyResource, executor: Optional[ThreadPoolExecutor]):
+    # The first build (loading models, importing google.genai) blocks, so it
+    # runs on the executor rather than the event loop.
+    if resource.ready:
+        return resource.peek()
+    return await run_in_executor(executor, resource.get)
+
+
+def state(request: Request) -> AppState:
+    return request.app.state.app_state
+
+
+def executor_of(request: Request) -> Optional[ThreadPoolExecutor]:
+    # The app's own pool, created by its lifespan; None (the loop's default
+    # executor) if the lifespan has not run, e.g. under a bare ASGI transport.
+    return getattr(request.app.state, "executor", None)
+
+
+async def json_object(request: Request) -> Optional[dict]:
+    try:
+        data = await request.json()
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    while not await request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
+
+
+async def run_cancellable(request: Request, coro):
+    # Runs the request pipeline under REQUEST_TIMEOUT and cancels it (including an
+    # in-flight Gemini call) as soon as the client goes away.
+    task = asyncio.ensure_future(coro)
+    watcher = asyncio.ensure_future(_wait_for_disconnect(request))
+
+    try:
+        done, _ = await asyncio.wait(
+            {task, watcher},
+            timeout=REQUEST_TIMEOUT,
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+    finally:
+        watcher.cancel()
+
+    if task in done:
+        return task.result()
+
+    task.cancel()
+
+    if watcher in done:
+        raise ClientDisconnected()
+    raise asyncio.TimeoutError()
+
+
+async def _predict(
+    app_state: AppState,
+    executor: Optional[ThreadPoolExecutor],
+    original_text: str,
+    prompt_version,
+) -> JSONResponse:
+    start = time.perf_counter()
+    audit_log = await resolve(app_state.audit_log, executor)
+    cache = await resolve(app_state.extraction_cache, executor)
+    ai = AISelector(original_text, cache=cache, prompt_version=prompt_version)
+    extraction_result = await ai.extract_information_async()
+
+    prepared = prepare_model_input(extraction_result)
+
+    if prepared["status"] == "incomplete":
+        audit(
+            audit_log,
+            "incomplete",
+            start,
+            extracted=prepared["extracted"],
+            prompt_version=ai.prompt.name,
+        )
+        return JSONResponse(
+            {
+                "status": "incomplete",
+                "original_text": original_text,
+                "extracted": prepared["extracted"],
+                "missing_fields": prepared["missing_fields"],
+                "extraction_source": ai.source,
+            }
+        )
+
+    model_input = prepared["model_input"]
+
+    micro_batcher = await resolve(app_state.micro_batcher, executor)
+    manager = await resolve(app_state.model_manager, executor)
+
+    if micro_batcher is not None:
+        prediction = await asyncio.wrap_future(micro_batcher.submit(model_input))
+    else:
+        prediction = await run_in_executor(
+            executor, run_prediction, model_input, manager.models
+        )
+
+    audit(
+        audit_log,
+        "success",
+        start,
+        extracted=prepared["extracted"],
+        model_input=model_input,
+        prediction=prediction,
+        prompt_version=ai.prompt.name,
+    )
+
+    return JSONResponse(
+        {
+            "status": "success",
+            "original_text": original_text,
+            "extracted_fields": prepared["extracted"],
+            "model_input": model_input,
+            "prediction": prediction,
+            "prompt_version": ai.prompt.name,
+            "extraction_source": ai.source,
+        }
+    )
+
+
+async def predict_sleep_disorder(request: Request) -> Response:
+    start = time.perf_counter()
+    data = await json_object(request)
+
+    if not data or "text" not in data:
+        return JSONResponse({"error": "Field 'text' is required"}, status_code=400)
+
+    prompt_version = data.get("prompt_version")
+
+    if prompt_version is not None and prompt_version not in prompt_registry.names():
+        return JSONResponse(
+            {"error": f"Unknown prompt_version '{prompt_version}'"}, status_code=400
+        )
+
+    pipeline = _predict(
+        state(request), executor_of(request), data["text"], prompt_version
+    )
+
+    try:
+        return await run_cancellable(request, pipeline)
+    except ClientDisconnected:
+        status, response = "disconnected", Response(status_code=499)
+    except BatcherFull as e:
+        status = "overloaded"
+        response = JSONResponse({"status": "error", "message": str(e)}, status_code=503)
+    except asyncio.TimeoutError:
+        status = "timeout"
+        response = JSONResponse(
+            {"status": "error", "message": "Request timed out"}, status_code=504
+        )
+    except Exception as e:
+        status = "error"
+        response = JSONResponse({"status": "error", "message": str(e)}, status_code=500)
+
+    # _predict audits the requests it answers; failed ones are recorded here.
+    audit(state(request).audit_log.peek(), status, start, prompt_version=prompt_version)
+    return response
+
+
+async def predict_sleep_disorder_batch(request: Request) -> Response:
+    start = time.perf_counter()
+    data = await json_object(request)
+
+    if not data or not isinstance(data.get("records"), list):
+        return JSONResponse(
+            {"error": "Field 'records' must be a list"}, status_code=400
+        )
+
+    app_state = state(request)
+    executor = executor_of(request)
+
+    try:
+        manager = await resolve(app_state.model_manager, executor)
+        audit_log = await resolve(app_state.audit_log, executor)
+        results = await asyncio.wait_for(
+            run_in_executor(executor, predict_records, data["records"], manager.models),
+            REQUEST_TIMEOUT,
+        )
+        audit_batch(audit_log, results, start)
+        return JSONResponse({"status": "success", "results": results})
+    except asyncio.TimeoutError:
+        status = "timeout"
+        response = JSONResponse(
+            {"status": "error", "message": "Request timed out"}, status_code=504
+        )
+    except Exception as e:
+        status = "error"
+        response = JSONResponse({"status": "error", "message": str(e)}, status_code=500)
+
+    audit(app_state.audit_log.peek(), status, start)
+    return response
+
+
+async def health(request: Request) -> Response:
+    # Liveness only: answers while models are still loading.
+    app_state = state(request)
+    manager = app_state.model_manager.peek()
+    status = {
+        "status": "online",
+        "model_version": manager.version if manager is not None else None,
+        "prediction_cache": prediction_cache.stats(),
+        "llm_client": gemini.stats(),
+    }
+
+    cache = app_state.extraction_cache.peek()
+    if cache is not None:
+        status["extraction_cache"] = cache.stats()
+
+    micro_batcher = app_state.micro_batcher.peek()
+    if micro_batcher is not None:
+        status["micro_batcher"] = micro_batcher.stats()
+
+    audit_log = app_state.audit_log.peek()
+    if audit_log is not None:
+        status["audit_log"] = audit_log.stats()
+
+    return JSONResponse(status)
+
+
+async def ready(request: Request) -> Response:
+    readiness = state(request).readiness()
+    return JSONResponse(
+        readiness, status_code=200 if readiness["status"] == "ready" else 503
+    )
+
+
+async def prometheus_metrics(request: Request) -> Response:
+    if not METRICS_ENABLED:
+        return JSONResponse({"error": "Metrics are disabled"}, status_code=404)
+
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+async def model_status(request: Request) -> Response:
+    if not is_admin_token_valid(request.headers.get("X-Admin-Token")):
+        return JSONResponse({"error": "Forbidden"}, status_code=403)
+
+    manager = await resolve(state(request).model_manager, executor_of(request))
+    return JSONResponse(manager.status())
+
+
+async def reload_models(request: Request) -> Response:
+    if not is_admin_token_valid(request.headers.get("X-Admin-Token")):
+        return JSONResponse({"error": "Forbidden"}, status_code=403)
+
+    data = await json_object(request)
+    executor = executor_of(request)
+
+    try:
+        manager = await resolve(state(request).model_manager, executor)
+        version = await run_in_executor(
+            executor, manager.reload, (data or {}).get("version")
+        )
+        return JSONResponse({"status": "success", "model_version": version})
+    except KeyError as e:
+        return JSONResponse({"status": "error", "message": str(e)}, status_code=404)
+    except Exception as e:
+        return JSONResponse({"status": "error", "message": str(e)}, status_code=500)
+
+
+routes = [
+    Route("/predict", predict_sleep_disorder, methods=["POST"]),
+    Route("/predict/batch", predict_sleep_disorder_batch, methods=["POST"]),
+    Route("/health", health, methods=["GET"]),
+    Route("/ready", ready, methods=["GET"]),
+    Route("/metrics", prometheus_metrics, methods=["GET"]),
+    Route("/admin/models", model_status, methods=["GET"]),
+    Route("/admin/models/reload", reload_models, methods=["POST"]),
+]
+ROUTE_PATHS = {route.path for route in routes}
+
+
+def create_app(app_state: Optional[AppState] = None) -> Starlette:
+    # Cheap to call: models and the Gemini client are built in the background
+    # once the server starts (EAGER_INIT=1) or by the first request.
+    app_state = app_state or AppState()
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette):
+        # Each app owns its pool, so shutting one down never affects another.
+        app.state.executor = ThreadPoolExecutor(max_workers=PREDICT_WORKERS)
+        if EAGER_INIT:
+            app_state.start_background_init()
+
+        try:
+            yield
+        finally:
+            app.state.executor.shutdown(wait=False)
+            app_state.shutdown()
+
+    app = Starlette(
+        routes=routes,
+        middleware=[
+            Middleware(RequestMetricsMiddleware),
+            Middleware(CORSMiddleware, allow_origins=["*"]),
+        ],
+        lifespan=lifespan,
+    )
+    app.state.app_state = app_state
+    return app
+
+
+app = create_app()
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=5000)
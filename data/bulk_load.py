@@ -0,0 +1,122 @@
+import os
+import tempfile
+import time
+import pandas as pd
+from typing import Dict, Any, List
+
+from data.database import SLEEP_DATA_COLUMNS
+
+
+def _csv_column(name: str) -> str:
+    return name.strip().lower().replace(" ", "_")
+
+
+def _max_person_id(connection, table: str) -> int:
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"SELECT MAX(person_id) FROM {table}")
+        row = cursor.fetchone()
+        return int(row[0]) if row and row[0] is not None else 0
+    finally:
+        cursor.close()
+
+
+def _insert_rows(
+    connection, database, table: str, rows: List[tuple], batch_size: int
+) -> None:
+    row_placeholders = (
+        "(" + ", ".join([database.placeholder] * len(SLEEP_DATA_COLUMNS)) + ")"
+    )
+    cursor = connection.cursor()
+
+    try:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start : start + batch_size]
+            sql_command = (
+                f"INSERT INTO {table} ({', '.join(SLEEP_DATA_COLUMNS)}) VALUES "
+                + ", ".join([row_placeholders] * len(batch))
+            )
+            cursor.execute(sql_command, [value for row in batch for value in row])
+    finally:
+        cursor.close()
+
+
+def _load_data_infile(connection, table: str, chunk: pd.DataFrame) -> None:
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".csv", delete=False, encoding="utf-8", newline=""
+    ) as f:
+        chunk.to_csv(f, index=False, header=False)
+        path = f.name
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE {table} "
+            "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' "
+            "LINES TERMINATED BY '\\n' "
+            f"({', '.join(SLEEP_DATA_COLUMNS)})"
+        )
+    finally:
+        cursor.close()
+        os.remove(path)
+
+
+def load_csv_to_sql(
+    csv_path: str,
+    database,
+    table: str = "sleep_data",
+    chunk_size: int = 50000,
+    batch_size: int = 1000,
+    mode: str = "insert",
+    resume: bool = True,
+) -> Dict[str, Any]:
+    if mode not in ("insert", "load_data"):
+        raise ValueError(f"Unknown load mode: {mode}")
+
+    if mode == "load_data" and not database.supports_load_data:
+        raise ValueError("LOAD DATA LOCAL INFILE is not supported by this database")
+
+    inserted = 0
+    last_person_id = 0
+    start = time.perf_counter()
+
+    with database.connection() as connection:
+        # Rows are committed chunk by chunk in person_id order, so the largest
+        # stored person_id marks where an interrupted load should pick up again.
+        last_person_id = _max_person_id(connection, table) if resume else 0
+        if last_person_id:
+            print(f"Resuming after person_id {last_person_id}")
+
+        for chunk in pd.read_csv(csv_path, chunksize=chunk_size):
+            chunk.columns = [_csv_column(c) for c in chunk.columns]
+            chunk = chunk[SLEEP_DATA_COLUMNS].fillna("None")
+            chunk = chunk[chunk["person_id"] > last_person_id]
+
+            if chunk.empty:
+                continue
+
+            if mode == "insert":
+                rows = [tuple(row) for row in chunk.astype(object).values.tolist()]
+                _insert_rows(connection, database, table, rows, batch_size)
+            else:
+                _load_data_infile(connection, table, chunk)
+
+            connection.commit()
+
+            inserted += len(chunk)
+            last_person_id = int(chunk["person_id"].iloc[-1])
+            elapsed = time.perf_counter() - start
+
+            print(
+                f"{inserted} rows inserted (last person_id {last_person_id}, "
+                f"{inserted / elapsed:.0f} rows/sec)"
+            )
+
+    elapsed = time.perf_counter() - start
+
+    return {
+        "rows_inserted": inserted,
+        "last_person_id": last_person_id,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(inserted / elapsed, 1) if elapsed > 0 else 0.0,
+    }
@@ -0,0 +1,279 @@
+import os
+import queue
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from data.db_config import load_env_variables
+
+SLEEP_DATA_COLUMNS = [
+    "person_id",
+    "gender",
+    "age",
+    "occupation",
+    "sleep_duration",
+    "quality_of_sleep",
+    "physical_activity_level",
+    "stress_level",
+    "bmi_category",
+    "blood_pressure",
+    "heart_rate",
+    "daily_steps",
+    "sleep_disorder",
+]
+
+SQLITE_SLEEP_DATA_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sleep_data (
+    person_id INTEGER PRIMARY KEY,
+    gender VARCHAR(10),
+    age INT,
+    occupation VARCHAR(50),
+    sleep_duration FLOAT,
+    quality_of_sleep INT,
+    physical_activity_level INT,
+    stress_level INT,
+    bmi_category VARCHAR(20),
+    blood_pressure VARCHAR(10),
+    heart_rate INT,
+    daily_steps INT,
+    sleep_disorder VARCHAR(20)
+)
+"""
+
+
+class DatabaseError(RuntimeError):
+    pass
+
+
+class Database:
+    placeholder = "%s"
+    supports_load_data = False
+
+    # Driver errors worth retrying (pool exhausted, server gone away, locked).
+    transient_errors: Tuple[type, ...] = ()
+    driver_errors: Tuple[type, ...] = ()
+
+    def __init__(self, retries: int = 3, backoff: float = 0.1):
+        self.retries = retries
+        self.backoff = backoff
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        connection = self._acquire_with_retry()
+
+        try:
+            yield connection
+        except self.driver_errors as error:
+            self._rollback(connection)
+            raise DatabaseError(
+                f"Error while trying to access the database: {error}"
+            ) from error
+        except BaseException:
+            self._rollback(connection)
+            raise
+        finally:
+            self._release(connection)
+
+    def query(self, sql: str, params: Optional[tuple] = None) -> List[tuple]:
+        with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(sql, params or ())
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+
+    def streaming_cursor(self, connection):
+        return connection.cursor()
+
+    def _acquire_with_retry(self):
+        for attempt in range(self.retries + 1):
+            try:
+                connection = self._acquire()
+
+                if self._is_healthy(connection):
+                    return connection
+
+                self._discard(connection)
+                raise DatabaseError("Pooled connection failed its health check")
+
+            except self.transient_errors + (DatabaseError,) as error:
+                if attempt == self.retries:
+                    raise DatabaseError(
+                        f"Error while trying to access the database: {error}"
+                    ) from error
+
+                # Exponential backoff with full jitter.
+                time.sleep(random.uniform(0, self.backoff * (2**attempt)))
+
+    def _rollback(self, connection) -> None:
+        try:
+            connection.rollback()
+        except Exception:
+            pass
+
+    def _acquire(self):
+        raise NotImplementedError
+
+    def _release(self, connection) -> None:
+        raise NotImplementedError
+
+    def _discard(self, connection) -> None:
+        raise NotImplementedError
+
+    def _is_healthy(self, connection) -> bool:
+        raise NotImplementedError
+
+
+class MySQLDatabase(Database):
+    placeholder = "%s"
+    supports_load_data = True
+
+    def __init__(
+        self,
+        db_config: Dict[str, str],
+        pool_size: int = 5,
+        allow_local_infile: bool = False,
+        retries: int = 3,
+        backoff: float = 0.1,
+    ):
+        super().__init__(retries=retries, backoff=backoff)
+
+        import mysql.connector
+        from mysql.connector import pooling
+
+        self.transient_errors = (
+            mysql.connector.errors.PoolError,
+            mysql.connector.errors.InterfaceError,
+            mysql.connector.errors.OperationalError,
+        )
+        self.driver_errors = (mysql.connector.Error,)
+
+        try:
+            self._pool = pooling.MySQLConnectionPool(
+                pool_name="sleep_data_pool",
+                pool_size=pool_size,
+                pool_reset_session=True,
+                host=db_config["host"],
+                user=db_config["user"],
+                password=db_config["password"],
+                database=db_config["database"],
+                allow_local_infile=allow_local_infile,
+                consume_results=True,
+            )
+        except mysql.connector.Error as error:
+            raise DatabaseError(
+                f"Error while trying to access the database: {error}"
+            ) from error
+
+    def streaming_cursor(self, connection):
+        # Unbuffered: rows stay on the server until fetched.
+        return connection.cursor(buffered=False)
+
+    def _acquire(self):
+        return self._pool.get_connection()
+
+    def _release(self, connection) -> None:
+        # Closing a pooled connection hands it back to the pool.
+        connection.close()
+
+    def _discard(self, connection) -> None:
+        connection.close()
+
+    def _is_healthy(self, connection) -> bool:
+        try:
+            connection.ping(reconnect=True, attempts=1)
+            return True
+        except self.driver_errors:
+            return False
+
+
+class SQLiteDatabase(Database):
+    placeholder = "?"
+    supports_load_data = False
+    transient_errors = (sqlite3.OperationalError,)
+    driver_errors = (sqlite3.Error,)
+
+    def __init__(
+        self, path: str, pool_size: int = 5, retries: int = 3, backoff: float = 0.1
+    ):
+        super().__init__(retries=retries, backoff=backoff)
+        self.path = path
+        self.pool_size = pool_size
+        self._pool: "queue.LifoQueue" = queue.LifoQueue(maxsize=pool_size)
+        self._opened = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self.connection() as connection:
+            connection.execute(SQLITE_SLEEP_DATA_SCHEMA)
+            connection.commit()
+
+    def _acquire(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._opened < self.pool_size:
+                self._opened += 1
+                return sqlite3.connect(self.path, check_same_thread=False)
+
+        try:
+            return self._pool.get(timeout=self.backoff)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Connection pool exhausted") from None
+
+    def _release(self, connection) -> None:
+        self._pool.put_nowait(connection)
+
+    def _discard(self, connection) -> None:
+        connection.close()
+        with self._lock:
+            self._opened -= 1
+
+    def _is_healthy(self, connection) -> bool:
+        try:
+            connection.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+
+_default_database: Optional[Database] = None
+_default_database_lock = threading.Lock()
+
+
+def build_database(**kwargs) -> Database:
+    load_dotenv()
+
+    backend = os.getenv("DB_BACKEND", "mysql").lower()
+    pool_size = int(os.getenv("DB_POOL_SIZE", "5"))
+
+    if backend == "mysql":
+        return MySQLDatabase(load_env_variables(), pool_size=pool_size, **kwargs)
+
+    if backend == "sqlite":
+        return SQLiteDatabase(
+            os.getenv("SQLITE_PATH", "data/sleep.db"), pool_size=pool_size, **kwargs
+        )
+
+    raise ValueError(f"Unknown DB_BACKEND: {backend}")
+
+
+def get_database() -> Database:
+    global _default_database
+
+    with _default_database_lock:
+        if _default_database is None:
+            _default_database = build_database()
+        return _default_database
@@ -1,27 +1,120 @@
-import mysql.connector
+import os
 import pandas as pd
-from typing import Dict
+from typing import Iterator, List, Optional
 
+from data.database import Database, SLEEP_DATA_COLUMNS
+
+SLEEP_DATA_DTYPES = {
+    "person_id": "int32",
+    "gender": "category",
+    "age": "int16",
+    "occupation": "category",
+    "sleep_duration": "float32",
+    "quality_of_sleep": "int16",
+    "physical_activity_level": "int16",
+    "stress_level": "int16",
+    "bmi_category": "category",
+    "blood_pressure": "object",
+    "heart_rate": "int16",
+    "daily_steps": "int32",
+    "sleep_disorder": "category",
+}
+
+
+def fetch_sql_sleep_data(database: Database) -> pd.DataFrame:
+    with database.connection() as connection:
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT * FROM sleep_data")
+            columns = [column[0] for column in cursor.description]
+            data = cursor.fetchall()
+        finally:
+            cursor.close()
+
+    return pd.DataFrame.from_records(data, columns=columns)
 
-def fetch_sql_sleep_data(db_config: Dict[str, str]) -> pd.DataFrame:
-    try:
-        connection = mysql.connector.connect(
-            host=db_config["host"],
-            user=db_config["user"],
-            password=db_config["password"],
-            database=db_config["database"],
-        )
 
-        cursor = connection.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM sleep_data")
-        data = cursor.fetchall()
+def apply_sleep_data_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    dtypes = {col: dtype for col, dtype in SLEEP_DATA_DTYPES.items() if col in df}
+    return df.astype(dtypes)
 
-        return pd.DataFrame(data)
 
-    except mysql.connector.Error as error:
-        raise RuntimeError(f"Error while trying to access the database: {error}")
+def iter_sql_sleep_data_chunks(
+    database: Database, chunk_size: int = 50000
+) -> Iterator[pd.DataFrame]:
+    with database.connection() as connection:
+        # Streaming cursor with tuple rows: the server streams the result and
+        # only one chunk of rows is held in Python at a time.
+        cursor = database.streaming_cursor(connection)
+        try:
+            cursor.execute("SELECT * FROM sleep_data ORDER BY person_id")
+            columns = [column[0] for column in cursor.description]
 
-    finally:
-        if "connection" in locals() and connection.is_connected():
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+
+                df = pd.DataFrame.from_records(rows, columns=columns)
+                yield apply_sleep_data_dtypes(df)
+        finally:
             cursor.close()
-            connection.close()
+
+
+def iter_csv_sleep_data_chunks(
+    csv_path: str, chunk_size: int = 50000
+) -> Iterator[pd.DataFrame]:
+    # Same frames as iter_sql_sleep_data_chunks, read from a dataset CSV
+    # ("Person ID", "Sleep Disorder", ...) instead of the sleep_data table.
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_size):
+        chunk.columns = [c.strip().lower().replace(" ", "_") for c in chunk.columns]
+        chunk = chunk[SLEEP_DATA_COLUMNS].fillna({"sleep_disorder": "None"})
+        yield apply_sleep_data_dtypes(chunk)
+
+
+def concat_chunks(chunks: List[pd.DataFrame]) -> pd.DataFrame:
+    if not chunks:
+        return apply_sleep_data_dtypes(pd.DataFrame(columns=list(SLEEP_DATA_DTYPES)))
+
+    # pd.concat falls back to object for categoricals whose categories differ
+    # between chunks, so align them on the union first.
+    for col in chunks[0].select_dtypes(include="category"):
+        categories = sorted(
+            set().union(*(chunk[col].cat.categories for chunk in chunks))
+        )
+        for chunk in chunks:
+            chunk[col] = chunk[col].cat.set_categories(categories)
+
+    return pd.concat(chunks, ignore_index=True)
+
+
+def _table_fingerprint(database: Database) -> str:
+    [(row_count, max_id)] = database.query(
+        "SELECT COUNT(*), MAX(person_id) FROM sleep_data"
+    )
+    return f"{row_count}_{max_id}"
+
+
+def fetch_sql_sleep_data_chunked(
+    database: Database,
+    chunk_size: int = 50000,
+    snapshot_dir: Optional[str] = None,
+) -> pd.DataFrame:
+    snapshot_path = None
+
+    if snapshot_dir:
+        snapshot_path = os.path.join(
+            snapshot_dir, f"sleep_data_{_table_fingerprint(database)}.parquet"
+        )
+
+        if os.path.exists(snapshot_path):
+            print(f"Loading sleep_data snapshot {snapshot_path}")
+            return pd.read_parquet(snapshot_path)
+
+    df = concat_chunks(list(iter_sql_sleep_data_chunks(database, chunk_size)))
+
+    if snapshot_path:
+        os.makedirs(snapshot_dir, exist_ok=True)
+        df.to_parquet(snapshot_path, index=False)
+
+    return df
@@ -0,0 +1,49 @@
+import os
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Pre-fork serving mode: models are loaded and warmed once in the master and
+# shared copy-on-write by the workers.
+#
+#   gunicorn -c gunicorn.conf.py
+#   APP_MODULE="asgi:create_app()" WORKER_CLASS=uvicorn.workers.UvicornWorker \
+#       gunicorn -c gunicorn.conf.py
+
+bind = os.getenv("BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+worker_class = os.getenv("WORKER_CLASS", "sync")
+wsgi_app = os.getenv("APP_MODULE", "main:create_app()")
+preload_app = True
+
+# The master initializes synchronously in when_ready; a background init
+# thread would not survive the fork.
+os.environ["EAGER_INIT"] = "0"
+
+# An admin reload only swaps the models of the worker that handled it (and
+# moves models/CURRENT); the other workers follow through the watcher.
+if workers > 1:
+    os.environ.setdefault("MODEL_WATCH_INTERVAL", "5")
+
+
+def _app_state(server):
+    app = server.app.wsgi()
+
+    if hasattr(app, "extensions"):
+        return app.extensions["app_state"]
+    return app.state.app_state
+
+
+def when_ready(server):
+    start = time.perf_counter()
+    _app_state(server).prefork()
+    server.log.info(
+        "Models loaded and warmed in %.2fs before forking workers",
+        time.perf_counter() - start,
+    )
+
+
+def post_fork(server, worker):
+    _app_state(server).post_fork()
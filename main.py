@@ -1,93 +1,262 @@
-from flask import Flask, request, jsonify, render_template
+import time
+
+from typing import Optional
+
+from flask import Blueprint, Flask, Response, current_app, g, request, jsonify
 from flask_cors import CORS
 from ai_module.selector import AISelector
-from ai_module.validation import (
-    validate_extraction,
-    normalize_fields,
-    split_blood_pressure,
-)
-from predict.predict_combined import predict_combined
-from predict.feature_mapper import map_to_model_features
-from models.load_models import load_models
-
-app = Flask(__name__)
-CORS(app)
-
-MODELS = load_models()
-TREE_MODEL = MODELS["tree_model"]
-TREE_ENCODERS = MODELS["tree_encoders"]
-NN_MODEL = MODELS["nn_model"]
-NN_SCALER = MODELS["nn_scaler"]
-NN_TARGET_ENCODER = MODELS["nn_target_encoder"]
-NN_DUMMY_COLUMNS = MODELS["nn_dummy_columns"]
-
-
-@app.route("/predict", methods=["POST"])
+from ai_module.prompt_registry import prompt_registry
+from ai_module.gemini_client import gemini
+from app_state import AppState, EAGER_INIT
+from predict.pipeline import prepare_model_input, run_prediction, predict_records
+from predict.micro_batcher import BatcherFull, BatcherTimeout
+from predict.prediction_cache import prediction_cache
+from models.model_manager import is_admin_token_valid
+from monitoring.audit import build_audit_record
+from monitoring.metrics import metrics, start_request, finish_request, METRICS_ENABLED
+
+api = Blueprint("api", __name__)
+
+
+def state() -> AppState:
+    return current_app.extensions["app_state"]
+
+
+def audit(status, start, **fields):
+    audit_log = state().audit_log.get()
+
+    if audit_log is not None:
+        latency_ms = (time.perf_counter() - start) * 1000
+        audit_log.record(build_audit_record(status, latency_ms=latency_ms, **fields))
+
+
+def audit_batch(results, start):
+    # One record per row, all with the latency of the whole batch.
+    for result in results:
+        audit(
+            result["status"],
+            start,
+            extracted=result.get("extracted"),
+            model_input=result.get("model_input"),
+            prediction=result.get("prediction"),
+        )
+
+
+@api.before_app_request
+def start_request_timer():
+    g.request_timer = start_request()
+
+
+@api.after_app_request
+def finish_request_timer(response):
+    route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+    server_timing = finish_request(g.pop("request_timer", None), route)
+
+    if server_timing is not None:
+        response.headers["Server-Timing"] = server_timing
+
+    return response
+
+
+@api.route("/predict", methods=["POST"])
 def predict_sleep_disorder():
+    start = time.perf_counter()
+    prompt_version = None
+
     try:
         data = request.get_json()
-        
-        if not data or "text" not in data:
+
+        if not isinstance(data, dict) or "text" not in data:
             return jsonify({"error": "Field 'text' is required"}), 400
-        
+
         original_text = data["text"]
-        
-        ai = AISelector(original_text)
+        prompt_version = data.get("prompt_version")
+
+        if prompt_version is not None and prompt_version not in prompt_registry.names():
+            return jsonify({"error": f"Unknown prompt_version '{prompt_version}'"}), 400
+
+        ai = AISelector(
+            original_text,
+            cache=state().extraction_cache.get(),
+            prompt_version=prompt_version,
+        )
         extraction_result = ai.extract_information()
-        print("Raw extraction:", extraction_result)
-        
-        validated = validate_extraction(extraction_result)
-        
-        if validated["missing_fields"]:
+
+        prepared = prepare_model_input(extraction_result)
+
+        if prepared["status"] == "incomplete":
+            audit(
+                "incomplete",
+                start,
+                extracted=prepared["extracted"],
+                prompt_version=ai.prompt.name,
+            )
             return (
                 jsonify(
                     {
                         "status": "incomplete",
                         "original_text": original_text,
-                        "extracted": validated.get("extracted", {}),
-                        "missing_fields": validated["missing_fields"],
+                        "extracted": prepared["extracted"],
+                        "missing_fields": prepared["missing_fields"],
+                        "extraction_source": ai.source,
                     }
                 ),
                 200,
             )
-        
-        extracted = normalize_fields(validated["extracted"])
-        extracted = split_blood_pressure(extracted)
-        print("Normalized extraction:", extracted)
-        
-        model_input = map_to_model_features(extracted)
-        
-        prediction = predict_combined(
-            input_data=model_input,
-            tree_model=TREE_MODEL,
-            nn_model=NN_MODEL,
-            scaler=NN_SCALER,
-            target_encoder=NN_TARGET_ENCODER,
-            encoders=TREE_ENCODERS,
-            dummy_columns=NN_DUMMY_COLUMNS,
+
+        extracted = prepared["extracted"]
+
+        model_input = prepared["model_input"]
+
+        micro_batcher = state().micro_batcher.get()
+
+        if micro_batcher is not None:
+            prediction = micro_batcher.predict(model_input)
+        else:
+            prediction = run_prediction(model_input, state().models)
+
+        audit(
+            "success",
+            start,
+            extracted=extracted,
+            model_input=model_input,
+            prediction=prediction,
+            prompt_version=ai.prompt.name,
         )
-        
+
         return (
             jsonify(
                 {
                     "status": "success",
                     "original_text": original_text,
                     "extracted_fields": extracted,  # O que foi extraído
-                    "model_input": model_input,     # O que foi enviado para o modelo
-                    "prediction": prediction
+                    "model_input": model_input,  # O que foi enviado para o modelo
+                    "prediction": prediction,
+                    "prompt_version": ai.prompt.name,
+                    "extraction_source": ai.source,
                 }
             ),
             200,
         )
-        
+
+    except BatcherFull as e:
+        audit("overloaded", start, prompt_version=prompt_version)
+        return jsonify({"status": "error", "message": str(e)}), 503
+
+    except BatcherTimeout as e:
+        audit("timeout", start, prompt_version=prompt_version)
+        return jsonify({"status": "error", "message": str(e)}), 504
+
     except Exception as e:
+        audit("error", start, prompt_version=prompt_version)
         return jsonify({"status": "error", "message": str(e)}), 500
 
 
-@app.route("/health", methods=["GET"])
+@api.route("/predict/batch", methods=["POST"])
+def predict_sleep_disorder_batch():
+    start = time.perf_counter()
+
+    try:
+        data = request.get_json()
+
+        if not isinstance(data, dict) or not isinstance(data.get("records"), list):
+            return jsonify({"error": "Field 'records' must be a list"}), 400
+
+        results = predict_records(data["records"], state().models)
+        audit_batch(results, start)
+
+        return jsonify({"status": "success", "results": results}), 200
+
+    except Exception as e:
+        audit("error", start)
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@api.route("/health", methods=["GET"])
 def health():
-    return jsonify({"status": "online"}), 200
+    # Liveness only: answers while models are still loading.
+    manager = state().model_manager.peek()
+    status = {
+        "status": "online",
+        "model_version": manager.version if manager is not None else None,
+        "prediction_cache": prediction_cache.stats(),
+        "llm_client": gemini.stats(),
+    }
+
+    cache = state().extraction_cache.peek()
+    if cache is not None:
+        status["extraction_cache"] = cache.stats()
+
+    micro_batcher = state().micro_batcher.peek()
+    if micro_batcher is not None:
+        status["micro_batcher"] = micro_batcher.stats()
+
+    audit_log = state().audit_log.peek()
+    if audit_log is not None:
+        status["audit_log"] = audit_log.stats()
+
+    return jsonify(status), 200
+
+
+@api.route("/ready", methods=["GET"])
+def ready():
+    readiness = state().readiness()
+    return jsonify(readiness), 200 if readiness["status"] == "ready" else 503
+
+
+@api.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    if not METRICS_ENABLED:
+        return jsonify({"error": "Metrics are disabled"}), 404
+
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+@api.route("/admin/models", methods=["GET"])
+def model_status():
+    if not is_admin_token_valid(request.headers.get("X-Admin-Token")):
+        return jsonify({"error": "Forbidden"}), 403
+
+    return jsonify(state().model_manager.get().status()), 200
+
+
+@api.route("/admin/models/reload", methods=["POST"])
+def reload_models():
+    if not is_admin_token_valid(request.headers.get("X-Admin-Token")):
+        return jsonify({"error": "Forbidden"}), 403
+
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            data = {}
+        version = state().model_manager.get().reload(data.get("version"))
+        return jsonify({"status": "success", "model_version": version}), 200
+
+    except KeyError as e:
+        return jsonify({"status": "error", "message": str(e)}), 404
+
+    except Exception as e:
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+def create_app(app_state: Optional[AppState] = None) -> Flask:
+    # Cheap to call: models and the Gemini client are built in the background
+    # (EAGER_INIT=1) or by the first request that needs them.
+    app = Flask(__name__)
+    CORS(app)
+
+    app_state = app_state or AppState()
+    app.extensions["app_state"] = app_state
+    app.register_blueprint(api)
+
+    if EAGER_INIT:
+        app_state.start_background_init()
+
+    return app
+
+
+app = create_app()
 
 
 if __name__ == "__main__":
-    app.run(debug=True, host="0.0.0.0", port=5000)
\ No newline at end of file
+    app.run(debug=True, host="0.0.0.0", port=5000)
@@ -1,16 +1,70 @@
+import os
+import json
 import joblib
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
+from predict.feature_encoder import FeatureEncoder
+from predict.tree_evaluator import CompiledTree
+from predict.mlp_engine import load_mlp_engine
+from models.save_models import MANIFEST_FILE
 
-def load_models(base_path: str = "models") -> Dict[str, Any]:
+NN_ENGINE_DIRS = {"float32": "engine", "int8": "engine_int8"}
+
+
+def load_manifest(base_path: str = "models") -> Dict[str, Any]:
+    path = os.path.join(base_path, MANIFEST_FILE)
+
+    if not os.path.exists(path):
+        return {}
+
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_models(
+    base_path: str = "models",
+    nn_engine: Optional[str] = None,
+    mmap: Optional[bool] = None,
+) -> Dict[str, Any]:
     tree_path = f"{base_path}/tree"
     nn_path = f"{base_path}/nn"
 
-    return {
-        "tree_model": joblib.load(f"{tree_path}/model.joblib"),
-        "tree_encoders": joblib.load(f"{tree_path}/encoders.joblib"),
-        "nn_model": joblib.load(f"{nn_path}/model.joblib"),
-        "nn_scaler": joblib.load(f"{nn_path}/scaler.joblib"),
-        "nn_target_encoder": joblib.load(f"{nn_path}/target_encoder.joblib"),
-        "nn_dummy_columns": joblib.load(f"{nn_path}/dummy_columns.joblib"),
+    nn_engine = (nn_engine or os.getenv("NN_ENGINE", "off")).lower()
+
+    if nn_engine != "off" and nn_engine not in NN_ENGINE_DIRS:
+        raise ValueError(f"Unknown NN_ENGINE: {nn_engine}")
+
+    # Models saved with a manifest are mapped read-only, so N workers share one
+    # page-cache copy of the arrays instead of N private ones.
+    manifest = load_manifest(base_path)
+    mmap_mode = manifest.get("mmap_mode")
+
+    if mmap is not None:
+        mmap_mode = "r" if mmap else None
+
+    def load(path: str) -> Any:
+        return joblib.load(path, mmap_mode=mmap_mode)
+
+    models = {
+        "tree_model": load(f"{tree_path}/model.joblib"),
+        "tree_encoders": load(f"{tree_path}/encoders.joblib"),
+        "nn_scaler": load(f"{nn_path}/scaler.joblib"),
+        "nn_target_encoder": load(f"{nn_path}/target_encoder.joblib"),
+        "nn_dummy_columns": load(f"{nn_path}/dummy_columns.joblib"),
+        "manifest": manifest,
+        "version": manifest.get("version", "unversioned"),
     }
+
+    # With an exported engine the float64 MLPClassifier is never used, so each
+    # worker only keeps the memory-mapped engine weights.
+    if nn_engine == "off":
+        models["nn_model"] = load(f"{nn_path}/model.joblib")
+        models["nn_engine"] = None
+    else:
+        models["nn_model"] = None
+        models["nn_engine"] = load_mlp_engine(f"{nn_path}/{NN_ENGINE_DIRS[nn_engine]}")
+
+    models["feature_encoder"] = FeatureEncoder.from_models(models)
+    models["compiled_tree"] = CompiledTree(models["tree_model"])
+
+    return models
@@ -0,0 +1,119 @@
+import hmac
+import os
+import threading
+from typing import Dict, Any, Callable, List, Optional
+
+from models.load_models import load_models
+from models.registry import ModelRegistry
+from predict.prediction_cache import prediction_cache
+from predict.warmup import warm_up
+
+
+class ModelManager:
+    def __init__(self, registry: ModelRegistry):
+        self.registry = registry
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._models = self._load(registry.current_path())
+
+    @property
+    def models(self) -> Dict[str, Any]:
+        # Callers grab the bundle once per request; a concurrent swap only
+        # affects requests that start after it.
+        return self._models
+
+    @property
+    def version(self) -> str:
+        return self._models["version"]
+
+    def status(self) -> Dict[str, Any]:
+        manifest = self._models.get("manifest", {})
+
+        return {
+            "active_version": self._models["version"],
+            "trained_at": manifest.get("trained_at"),
+            "metrics": manifest.get("metrics", {}),
+            "feature_schema_hash": manifest.get("feature_schema_hash"),
+            "available_versions": self.registry.list_versions(),
+        }
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        self._listeners.append(listener)
+
+    def reload(self, version: Optional[str] = None) -> str:
+        with self._lock:
+            if version is None:
+                path = self.registry.current_path()
+            elif version in self.registry.list_versions():
+                path = self.registry.version_path(version)
+            else:
+                raise KeyError(f"Unknown model version: {version}")
+
+            # CURRENT only moves once the version has loaded and warmed up, so
+            # a broken one is never picked up by restarts or other workers.
+            models = self._load(path)
+
+            if version is not None:
+                self.registry.activate(version)
+
+            if models["version"] == self._models["version"]:
+                return models["version"]
+
+            self._models = models
+
+        for listener in self._listeners:
+            listener(models)
+
+        print(f"Model version {models['version']} is now active")
+        return models["version"]
+
+    def start_watcher(self, interval: float) -> None:
+        if self._watcher is not None or interval <= 0:
+            return
+
+        self._watcher = threading.Thread(
+            target=self._watch, args=(interval,), name="model-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        self._stop.set()
+
+    def _watch(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            current = self.registry.current_version()
+
+            if current is None or current == self._models["version"]:
+                continue
+
+            try:
+                self.reload()
+            except Exception as e:
+                print(f"Model reload to {current} failed: {e}")
+
+    def _load(self, path: str) -> Dict[str, Any]:
+        models = load_models(path)
+        warm_up(models)
+        return models
+
+
+def build_model_manager(root: str = "models", watch: bool = True) -> ModelManager:
+    manager = ModelManager(ModelRegistry(root))
+    manager.add_listener(prediction_cache.invalidate)
+
+    if watch:
+        start_model_watcher(manager)
+
+    return manager
+
+
+def start_model_watcher(manager: ModelManager) -> None:
+    manager.start_watcher(float(os.getenv("MODEL_WATCH_INTERVAL", "0")))
+
+
+def is_admin_token_valid(token: Optional[str]) -> bool:
+    # Admin endpoints stay disabled unless ADMIN_TOKEN is configured.
+    expected = os.getenv("ADMIN_TOKEN")
+    return bool(expected) and hmac.compare_digest(token or "", expected)
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+
+from models.save_models import save_models, MANIFEST_FILE
+
+VERSIONS_DIR = "versions"
+CURRENT_FILE = "CURRENT"
+
+
+def feature_schema_hash(models: Dict[str, Any]) -> str:
+    tree_columns = getattr(models["tree_model"], "feature_names_in_", None)
+
+    schema = {
+        "tree_columns": list(tree_columns) if tree_columns is not None else None,
+        "tree_encoders": {
+            col: [str(c) for c in encoder.classes_]
+            for col, encoder in models["tree_encoders"].items()
+        },
+        "nn_dummy_columns": list(models["nn_dummy_columns"]),
+        "nn_classes": [str(c) for c in models["nn_target_encoder"].classes_],
+    }
+    raw = json.dumps(schema, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+class ModelRegistry:
+    def __init__(self, root: str = "models"):
+        self.root = root
+        self.versions_path = os.path.join(root, VERSIONS_DIR)
+
+    def version_path(self, version: str) -> str:
+        return os.path.join(self.versions_path, version)
+
+    def list_versions(self) -> List[str]:
+        if not os.path.isdir(self.versions_path):
+            return []
+
+        return sorted(
+            version
+            for version in os.listdir(self.versions_path)
+            if os.path.exists(os.path.join(self.version_path(version), MANIFEST_FILE))
+        )
+
+    def current_version(self) -> Optional[str]:
+        try:
+            with open(
+                os.path.join(self.root, CURRENT_FILE), "r", encoding="utf-8"
+            ) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def current_path(self) -> str:
+        # Before the first publish, the flat models/ layout is served as-is.
+        version = self.current_version()
+        return self.version_path(version) if version else self.root
+
+    def manifest(self, version: str) -> Dict[str, Any]:
+        with open(
+            os.path.join(self.version_path(version), MANIFEST_FILE),
+            "r",
+            encoding="utf-8",
+        ) as f:
+            return json.load(f)
+
+    def publish(
+        self,
+        models: Dict[str, Any],
+        metrics: Optional[Dict[str, Any]] = None,
+        extra: Optional[Dict[str, Any]] = None,
+        activate: bool = True,
+    ) -> str:
+        trained_at = datetime.now(timezone.utc)
+        version = trained_at.strftime("%Y%m%dT%H%M%SZ")
+
+        suffix = 1
+        while os.path.exists(self.version_path(version)):
+            version = f"{trained_at.strftime('%Y%m%dT%H%M%SZ')}-{suffix}"
+            suffix += 1
+
+        manifest_extra = {
+            "version": version,
+            "trained_at": trained_at.isoformat(),
+            "metrics": metrics or {},
+            "feature_schema_hash": feature_schema_hash(models),
+        }
+        manifest_extra.update(extra or {})
+
+        save_models(models, self.version_path(version), manifest_extra=manifest_extra)
+
+        if activate:
+            self.activate(version)
+
+        return version
+
+    def activate(self, version: str) -> None:
+        if version not in self.list_versions():
+            raise KeyError(f"Unknown model version: {version}")
+
+        # os.replace is atomic, so a watcher never reads a half-written file.
+        tmp_path = os.path.join(self.root, f"{CURRENT_FILE}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(tmp_path, os.path.join(self.root, CURRENT_FILE))
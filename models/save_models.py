@@ -1,23 +1,42 @@
 import os
+import json
 import joblib
-from typing import Dict, Any
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
 
+MANIFEST_FILE = "manifest.json"
 
-def save_models(models: Dict[str, Any], base_path: str = "models") -> None:
-    os.makedirs(base_path, exist_ok=True)
+ARTIFACTS = {
+    "tree_model": "tree/model.joblib",
+    "tree_encoders": "tree/encoders.joblib",
+    "nn_model": "nn/model.joblib",
+    "nn_scaler": "nn/scaler.joblib",
+    "nn_target_encoder": "nn/target_encoder.joblib",
+    "nn_dummy_columns": "nn/dummy_columns.joblib",
+}
 
-    # Tree
-    tree_path = os.path.join(base_path, "tree")
-    os.makedirs(tree_path, exist_ok=True)
 
-    joblib.dump(models["tree_model"], f"{tree_path}/model.joblib")
-    joblib.dump(models["tree_encoders"], f"{tree_path}/encoders.joblib")
+def save_models(
+    models: Dict[str, Any],
+    base_path: str = "models",
+    mmap: bool = True,
+    manifest_extra: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    for key, relative_path in ARTIFACTS.items():
+        path = os.path.join(base_path, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        joblib.dump(models[key], path)
 
-    # Neural Network
-    nn_path = os.path.join(base_path, "nn")
-    os.makedirs(nn_path, exist_ok=True)
+    # Uncompressed joblib files keep numpy arrays aligned on disk, so they can be
+    # loaded with mmap_mode="r" and shared through the page cache by every worker.
+    manifest = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "artifacts": ARTIFACTS,
+        "mmap_mode": "r" if mmap else None,
+    }
+    manifest.update(manifest_extra or {})
 
-    joblib.dump(models["nn_model"], f"{nn_path}/model.joblib")
-    joblib.dump(models["nn_scaler"], f"{nn_path}/scaler.joblib")
-    joblib.dump(models["nn_target_encoder"], f"{nn_path}/target_encoder.joblib")
-    joblib.dump(models["nn_dummy_columns"], f"{nn_path}/dummy_columns.joblib")
+    with open(os.path.join(base_path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
@@ -0,0 +1,310 @@
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, single worker only.
+    fcntl = None
+
+from dotenv import load_dotenv
+
+AUDIT_COLUMNS = [
+    "logged_at",
+    "status",
+    "model_version",
+    "model_used",
+    "class_name",
+    "probability",
+    "latency_ms",
+    "prompt_version",
+    "extracted",
+    "model_input",
+]
+
+# Portable between MySQL and SQLite; nested fields are stored as JSON text.
+AUDIT_TABLE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    logged_at DOUBLE,
+    status VARCHAR(20),
+    model_version VARCHAR(64),
+    model_used VARCHAR(32),
+    class_name VARCHAR(64),
+    probability DOUBLE,
+    latency_ms DOUBLE,
+    prompt_version VARCHAR(64),
+    extracted TEXT,
+    model_input TEXT
+)
+"""
+
+
+def build_audit_record(
+    status: str,
+    extracted: Optional[Dict[str, Any]] = None,
+    model_input: Optional[Dict[str, Any]] = None,
+    prediction: Optional[Dict[str, Any]] = None,
+    latency_ms: Optional[float] = None,
+    prompt_version: Optional[str] = None,
+) -> Dict[str, Any]:
+    prediction = prediction or {}
+
+    return {
+        "logged_at": time.time(),
+        "status": status,
+        "model_version": prediction.get("model_version"),
+        "model_used": prediction.get("model_used"),
+        "class_name": prediction.get("class_name"),
+        "probability": prediction.get("probability"),
+        "latency_ms": round(latency_ms, 3) if latency_ms is not None else None,
+        "prompt_version": prompt_version,
+        "extracted": extracted,
+        "model_input": model_input,
+    }
+
+
+class AuditSink:
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class JSONLAuditSink(AuditSink):
+    def __init__(self, path: str, max_bytes: int = 50_000_000, backup_count: int = 5):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        payload = "".join(
+            json.dumps(record, ensure_ascii=False, default=str) + "\n"
+            for record in records
+        )
+
+        # Pre-forked workers share the file: size check, rotation and append
+        # happen under one lock, so no worker writes into a file another one
+        # is renaming away.
+        with self._locked():
+            if self._should_rotate(len(payload)):
+                self._rotate()
+
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(payload)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+
+        with open(f"{self.path}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _should_rotate(self, incoming: int) -> bool:
+        if self.max_bytes <= 0 or not os.path.exists(self.path):
+            return False
+        return os.path.getsize(self.path) + incoming > self.max_bytes
+
+    def _rotate(self) -> None:
+        # predictions.jsonl -> predictions.jsonl.1 -> ... -> .{backup_count}
+        for i in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i + 1}")
+
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+
+class DatabaseAuditSink(AuditSink):
+    def __init__(self, database, table: str = "prediction_audit"):
+        self.database = database
+        self.table = table
+
+        with database.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(AUDIT_TABLE_SCHEMA.format(table=table))
+            finally:
+                cursor.close()
+            connection.commit()
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        row_placeholders = (
+            "(" + ", ".join([self.database.placeholder] * len(AUDIT_COLUMNS)) + ")"
+        )
+        sql_command = (
+            f"INSERT INTO {self.table} ({', '.join(AUDIT_COLUMNS)}) VALUES "
+            + ", ".join([row_placeholders] * len(records))
+        )
+        values = [
+            (
+                json.dumps(record[column], default=str)
+                if column in ("extracted", "model_input")
+                else record[column]
+            )
+            for record in records
+            for column in AUDIT_COLUMNS
+        ]
+
+        with self.database.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(sql_command, values)
+            finally:
+                cursor.close()
+            connection.commit()
+
+
+class AuditLog:
+    def __init__(
+        self,
+        sink: AuditSink,
+        max_queue_size: int = 10000,
+        flush_size: int = 256,
+        flush_interval: float = 1.0,
+    ):
+        self.sink = sink
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+        self._stats_lock = threading.Lock()
+
+        self._running = True
+        self._worker = threading.Thread(target=self._run, name="audit-log", daemon=True)
+        self._worker.start()
+
+    def record(self, entry: Dict[str, Any]) -> bool:
+        # Never blocks the request: a full queue drops the entry and counts it.
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            with self._stats_lock:
+                self.dropped += 1
+            return False
+
+        with self._stats_lock:
+            self.enqueued += 1
+        return True
+
+    def stop(self) -> None:
+        self._running = False
+        self._queue.put(None)
+        self._worker.join()
+        self.sink.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "flushes": self.flushes,
+                "queue_depth": self._queue.qsize(),
+            }
+
+    def _collect(self) -> List[Dict[str, Any]]:
+        batch: List[Dict[str, Any]] = []
+        deadline = time.monotonic() + self.flush_interval
+
+        while len(batch) < self.flush_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+
+            if item is None:
+                self._running = False
+                break
+            batch.append(item)
+
+        return batch
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return batch
+            if item is not None:
+                batch.append(item)
+
+    def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            self.sink.write_batch(batch)
+        except Exception as e:
+            print(f"Audit log flush of {len(batch)} records failed: {e}")
+            with self._stats_lock:
+                self.failed += len(batch)
+            return
+
+        with self._stats_lock:
+            self.written += len(batch)
+            self.flushes += 1
+
+    def _run(self) -> None:
+        while self._running:
+            batch = self._collect()
+            if batch:
+                self._flush(batch)
+
+        remaining = self._drain()
+        for start in range(0, len(remaining), self.flush_size):
+            self._flush(remaining[start : start + self.flush_size])
+
+
+def build_audit_log() -> Optional[AuditLog]:
+    load_dotenv()
+
+    backend = os.getenv("AUDIT_LOG", "jsonl").lower()
+
+    if backend == "off":
+        return None
+
+    if backend == "jsonl":
+        sink: AuditSink = JSONLAuditSink(
+            os.getenv("AUDIT_LOG_PATH", "data/audit/predictions.jsonl"),
+            max_bytes=int(os.getenv("AUDIT_LOG_MAX_BYTES", "50000000")),
+            backup_count=int(os.getenv("AUDIT_LOG_BACKUPS", "5")),
+        )
+    elif backend == "database":
+        from data.database import get_database
+
+        sink = DatabaseAuditSink(get_database())
+    else:
+        raise ValueError(f"Unknown AUDIT_LOG backend: {backend}")
+
+    return AuditLog(
+        sink,
+        max_queue_size=int(os.getenv("AUDIT_QUEUE_SIZE", "10000")),
+        flush_size=int(os.getenv("AUDIT_FLUSH_SIZE", "256")),
+        flush_interval=float(os.getenv("AUDIT_FLUSH_INTERVAL", "1.0")),
+    )
@@ -0,0 +1,251 @@
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+METRICS_ENABLED = os.getenv("METRICS", "1").lower() in ("1", "true", "yes")
+SERVER_TIMING = os.getenv("SERVER_TIMING", "0").lower() in ("1", "true", "yes")
+
+# Seconds; spans the sub-millisecond model stages up to slow LLM calls.
+LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+QUANTILES = (0.5, 0.95, 0.99)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        # Linear interpolation inside the bucket, as histogram_quantile() does.
+        if self.count == 0:
+            return None
+
+        rank = q * self.count
+        cumulative = 0
+
+        for i, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str) -> None:
+        self._help[name] = help_text
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    def inc(self, name: str, amount: float = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def quantiles(self, name: str) -> Dict[str, Dict[str, Optional[float]]]:
+        with self._lock:
+            return {
+                ",".join(f"{k}={v}" for k, v in key): {
+                    f"p{int(q * 100)}": histogram.quantile(q) for q in QUANTILES
+                }
+                for key, histogram in self._histograms.get(name, {}).items()
+            }
+
+    def render(self) -> str:
+        lines: List[str] = []
+
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                self._header(lines, name, "counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_labels(key)} {_number(value)}")
+
+            for name, series in sorted(self._histograms.items()):
+                self._header(lines, name, "histogram")
+                for key, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(
+                            f"{name}_bucket{_labels(key, le=_number(bound))} {cumulative}"
+                        )
+                    lines.append(
+                        f'{name}_bucket{_labels(key, le="+Inf")} {histogram.count}'
+                    )
+                    lines.append(f"{name}_sum{_labels(key)} {_number(histogram.sum)}")
+                    lines.append(f"{name}_count{_labels(key)} {histogram.count}")
+
+                # Pre-computed percentiles for dashboards without PromQL.
+                quantile_name = f"{name}_quantile"
+                self._header(lines, quantile_name, "gauge")
+                for key, histogram in sorted(series.items()):
+                    for q in QUANTILES:
+                        value = histogram.quantile(q)
+                        if value is not None:
+                            lines.append(
+                                f"{quantile_name}{_labels(key, quantile=str(q))} "
+                                f"{_number(value)}"
+                            )
+
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines: List[str], name: str, kind: str) -> None:
+        if name in self._help:
+            lines.append(f"# HELP {name} {self._help[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+
+def _labels(key: LabelKey, **extra: str) -> str:
+    pairs = list(key) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class RequestTimer:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.stages: List[Tuple[str, float]] = []
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages.append((stage, seconds))
+
+    def server_timing(self) -> str:
+        # Repeated stages (one per record on the batch route) are summed.
+        totals: Dict[str, float] = {}
+        for stage, seconds in self.stages:
+            totals[stage] = totals.get(stage, 0.0) + seconds
+
+        entries = [
+            f"{stage};dur={seconds * 1000:.3f}" for stage, seconds in totals.items()
+        ]
+        entries.append(f"total;dur={(time.perf_counter() - self.start) * 1000:.3f}")
+        return ", ".join(entries)
+
+
+metrics = MetricsRegistry()
+metrics.describe("sleep_stage_duration_seconds", "Time spent in each /predict stage")
+metrics.describe("sleep_request_duration_seconds", "End-to-end request latency")
+metrics.describe("sleep_predictions_total", "Predictions by routed model")
+metrics.describe("sleep_extractions_total", "Extractions by source")
+metrics.describe(
+    "sleep_incomplete_extractions_total", "Extractions with missing fields"
+)
+metrics.describe("sleep_gemini_tokens_total", "Gemini token usage")
+
+_request_timer: ContextVar[Optional[RequestTimer]] = ContextVar(
+    "request_timer", default=None
+)
+_paused: ContextVar[bool] = ContextVar("metrics_paused", default=False)
+
+
+@contextmanager
+def paused():
+    # For internal traffic such as model warm-up, which would otherwise skew
+    # the latency histograms and prediction counts.
+    token = _paused.set(True)
+    try:
+        yield
+    finally:
+        _paused.reset(token)
+
+
+def start_request() -> Optional[RequestTimer]:
+    if not METRICS_ENABLED:
+        return None
+
+    timer = RequestTimer()
+    _request_timer.set(timer)
+    return timer
+
+
+def finish_request(timer: Optional[RequestTimer], route: str) -> Optional[str]:
+    # Returns the Server-Timing header value when enabled.
+    if timer is None:
+        return None
+
+    metrics.observe(
+        "sleep_request_duration_seconds", time.perf_counter() - timer.start, route=route
+    )
+    _request_timer.set(None)
+    return timer.server_timing() if SERVER_TIMING else None
+
+
+@contextmanager
+def timed(stage: str):
+    if not METRICS_ENABLED or _paused.get():
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.observe("sleep_stage_duration_seconds", elapsed, stage=stage)
+
+        timer = _request_timer.get()
+        if timer is not None:
+            timer.add(stage, elapsed)
+
+
+def count(name: str, amount: float = 1, **labels: str) -> None:
+    if METRICS_ENABLED and not _paused.get():
+        metrics.inc(name, amount, **labels)
@@ -0,0 +1,87 @@
+import numpy as np
+from typing import Dict, Any, List
+
+from predict.feature_mapper import FIELD_MAP
+
+
+class FeatureEncoder:
+    def __init__(
+        self,
+        tree_columns: List[str],
+        tree_encoders: Dict[str, Any],
+        dummy_columns: List[str],
+        scaler,
+    ):
+        # LabelEncoder.transform is a lookup into the sorted classes_, so the
+        # position in classes_ is the code it would return.
+        self.tree_codes = {
+            col: {category: code for code, category in enumerate(encoder.classes_)}
+            for col, encoder in tree_encoders.items()
+        }
+        self.tree_columns = list(tree_columns)
+        self._tree_layout = [
+            (j, col, self.tree_codes.get(col))
+            for j, col in enumerate(self.tree_columns)
+        ]
+
+        # A one-row get_dummies(drop_first=True) drops every categorical column,
+        # so the dummy columns are always 0 and only the numeric inputs are copied.
+        self.dummy_columns = list(dummy_columns)
+        self._nn_layout = [
+            (j, col)
+            for j, col in enumerate(self.dummy_columns)
+            if col in FIELD_MAP.values()
+        ]
+        self.nn_scale = np.asarray(scaler.scale_, dtype=np.float64)
+        self.nn_min = np.asarray(scaler.min_, dtype=np.float64)
+
+    @classmethod
+    def from_models(cls, models: Dict[str, Any]) -> "FeatureEncoder":
+        tree_columns = getattr(models["tree_model"], "feature_names_in_", None)
+
+        if tree_columns is None:
+            tree_columns = list(FIELD_MAP.values())
+
+        return cls(
+            tree_columns=tree_columns,
+            tree_encoders=models["tree_encoders"],
+            dummy_columns=models["nn_dummy_columns"],
+            scaler=models["nn_scaler"],
+        )
+
+    def tree_matrix(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        X = np.empty((len(records), len(self.tree_columns)), dtype=np.float64)
+
+        for i, record in enumerate(records):
+            for j, col, codes in self._tree_layout:
+                value = self._get(record, col)
+
+                if codes is not None:
+                    if value not in codes:
+                        raise ValueError(f"Unknown category {value!r} for '{col}'")
+                    value = codes[value]
+
+                X[i, j] = value
+
+        return X
+
+    def nn_matrix(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        X = np.zeros((len(records), len(self.dummy_columns)), dtype=np.float64)
+
+        for i, record in enumerate(records):
+            for j, col in self._nn_layout:
+                value = record.get(col)
+
+                if value is not None and not isinstance(value, str):
+                    X[i, j] = value
+
+        # Same two roundings as MinMaxScaler.transform (X *= scale_; X += min_).
+        np.multiply(X, self.nn_scale, out=X)
+        np.add(X, self.nn_min, out=X)
+        return X
+
+    def _get(self, record: Dict[str, Any], col: str) -> Any:
+        try:
+            return record[col]
+        except KeyError:
+            raise ValueError(f"Missing feature '{col}'") from None
@@ -0,0 +1,227 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, List, Callable, Optional
+
+from dotenv import load_dotenv
+
+from predict.pipeline import run_prediction_batch
+
+# Upper bounds of the batch-size histogram buckets.
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+class BatcherFull(RuntimeError):
+    pass
+
+
+class BatcherTimeout(RuntimeError):
+    pass
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        predict_batch: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+        max_queue_size: int = 1024,
+        timeout: float = 10.0,
+    ):
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.timeout = timeout
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+
+        self.batches = 0
+        self.requests = 0
+        self.rejected = 0
+        self.batch_size_histogram = {bucket: 0 for bucket in BATCH_SIZE_BUCKETS}
+        self.batch_size_histogram["+Inf"] = 0
+        self._stats_lock = threading.Lock()
+
+        self._stopped = threading.Event()
+        self._submit_lock = threading.Lock()
+        self._worker = threading.Thread(
+            target=self._run, name="micro-batcher", daemon=True
+        )
+        self._worker.start()
+
+    def submit(self, model_input: Dict[str, Any]) -> Future:
+        future: Future = Future()
+
+        # Under the lock so nothing is queued after stop() drained the queue.
+        with self._submit_lock:
+            if self._stopped.is_set():
+                raise RuntimeError("batcher stopped")
+
+            try:
+                self._queue.put_nowait((model_input, future))
+            except queue.Full:
+                with self._stats_lock:
+                    self.rejected += 1
+                raise BatcherFull("Prediction queue is full") from None
+
+        return future
+
+    def predict(self, model_input: Dict[str, Any], timeout: Optional[float] = None):
+        future = self.submit(model_input)
+
+        try:
+            return future.result(
+                timeout=timeout if timeout is not None else self.timeout
+            )
+        except FutureTimeoutError:
+            # Still queued: dropped by the worker instead of computed for nobody.
+            future.cancel()
+            raise BatcherTimeout("Prediction timed out in the batch queue") from None
+
+    def stop(self) -> None:
+        with self._submit_lock:
+            self._stopped.set()
+
+        # Only wakes a worker blocked on an empty queue; a full queue keeps it
+        # busy anyway, and it checks _stopped after every batch.
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        self._worker.join()
+
+        # Requests still queued are failed rather than left waiting forever.
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None and _claim(item[1]):
+                _resolve(item[1], error=RuntimeError("batcher stopped"))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "batches": self.batches,
+                "requests": self.requests,
+                "rejected": self.rejected,
+                "queue_depth": self._queue.qsize(),
+                "mean_batch_size": (
+                    round(self.requests / self.batches, 2) if self.batches else 0.0
+                ),
+                "batch_size_histogram": {
+                    str(bucket): count
+                    for bucket, count in self.batch_size_histogram.items()
+                },
+            }
+
+    def _collect(self) -> List:
+        item = self._queue.get()
+        if item is None:
+            return []
+
+        batch = [item]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+
+            if item is None:
+                break
+            batch.append(item)
+
+        return batch
+
+    def _record(self, size: int) -> None:
+        with self._stats_lock:
+            self.batches += 1
+            self.requests += size
+
+            for bucket in BATCH_SIZE_BUCKETS:
+                if size <= bucket:
+                    self.batch_size_histogram[bucket] += 1
+                    break
+            else:
+                self.batch_size_histogram["+Inf"] += 1
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            # Futures cancelled while queued (an ASGI request that timed out or
+            # whose client disconnected) are dropped; the claimed ones can no
+            # longer be cancelled, so resolving them below cannot fail.
+            batch = [
+                (model_input, future)
+                for model_input, future in self._collect()
+                if _claim(future)
+            ]
+            if not batch:
+                continue
+
+            inputs = [model_input for model_input, _ in batch]
+            futures = [future for _, future in batch]
+            self._record(len(batch))
+
+            try:
+                results = self.predict_batch(inputs)
+            except Exception:
+                # One bad row must not fail everybody else's request.
+                self._run_individually(inputs, futures)
+                continue
+
+            for future, result in zip(futures, results):
+                _resolve(future, result=result)
+
+    def _run_individually(self, inputs: List[Dict[str, Any]], futures: List) -> None:
+        for model_input, future in zip(inputs, futures):
+            try:
+                result = self.predict_batch([model_input])[0]
+            except Exception as e:
+                _resolve(future, error=e)
+            else:
+                _resolve(future, result=result)
+
+
+def _claim(future: Future) -> bool:
+    try:
+        return future.set_running_or_notify_cancel()
+    except RuntimeError as e:
+        print(f"Skipping prediction future: {e}")
+        return False
+
+
+def _resolve(
+    future: Future, result: Any = None, error: Optional[Exception] = None
+) -> None:
+    # Whatever happens to one future, the worker thread keeps serving the rest.
+    try:
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    except Exception as e:
+        print(f"Could not resolve prediction future: {e}")
+
+
+def build_micro_batcher(
+    get_models: Callable[[], Dict[str, Any]]
+) -> Optional[MicroBatcher]:
+    load_dotenv()
+
+    if os.getenv("MICRO_BATCHING", "0").lower() not in ("1", "true", "yes"):
+        return None
+
+    return MicroBatcher(
+        lambda inputs: run_prediction_batch(inputs, get_models()),
+        max_batch_size=int(os.getenv("MICRO_BATCH_MAX_SIZE", "32")),
+        max_wait_ms=float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", "2")),
+        max_queue_size=int(os.getenv("MICRO_BATCH_QUEUE_SIZE", "1024")),
+        timeout=float(os.getenv("MICRO_BATCH_TIMEOUT", "10")),
+    )
@@ -0,0 +1,151 @@
+import json
+import os
+import numpy as np
+from typing import Dict, Any, List, Optional
+
+ENGINE_DTYPE = np.float32
+INT8_MAX = 127
+# Columns of an int8 weight matrix dequantized at a time.
+INT8_BLOCK_COLUMNS = 128
+
+
+def _relu(X: np.ndarray) -> np.ndarray:
+    return np.maximum(X, 0, out=X)
+
+
+def _softmax(X: np.ndarray) -> np.ndarray:
+    np.exp(X - X.max(axis=1)[:, np.newaxis], out=X)
+    X /= X.sum(axis=1)[:, np.newaxis]
+    return X
+
+
+def _logistic(X: np.ndarray) -> np.ndarray:
+    proba = 1.0 / (1.0 + np.exp(-X))
+    return np.hstack([1.0 - proba, proba])
+
+
+HIDDEN_ACTIVATIONS = {"relu": _relu}
+OUTPUT_ACTIVATIONS = {"softmax": _softmax, "logistic": _logistic}
+
+
+def quantize_int8(coef: np.ndarray):
+    # Symmetric per-output-unit scales, so each column of the weight matrix uses
+    # the full int8 range.
+    scale = np.abs(coef).max(axis=0) / INT8_MAX
+    scale[scale == 0] = 1.0
+    quantized = np.clip(np.rint(coef / scale), -INT8_MAX, INT8_MAX).astype(np.int8)
+    return quantized, scale.astype(ENGINE_DTYPE)
+
+
+def _int8_matmul(X: np.ndarray, coef: np.ndarray, scale: np.ndarray) -> np.ndarray:
+    # Dequantizes the shared int8 weights one block of columns at a time, so no
+    # float32 copy of the matrix is kept (or allocated whole) per worker. The
+    # per-column scale is applied to the output instead of the weights.
+    out = np.empty((X.shape[0], coef.shape[1]), dtype=ENGINE_DTYPE)
+
+    for start in range(0, coef.shape[1], INT8_BLOCK_COLUMNS):
+        block = slice(start, start + INT8_BLOCK_COLUMNS)
+        np.matmul(X, coef[:, block].astype(ENGINE_DTYPE), out=out[:, block])
+
+    out *= scale
+    return out
+
+
+class MLPEngine:
+    def __init__(
+        self,
+        coefs: List[np.ndarray],
+        intercepts: List[np.ndarray],
+        activation: str = "relu",
+        out_activation: str = "softmax",
+        scales: Optional[List[np.ndarray]] = None,
+    ):
+        self.coefs = coefs
+        self.intercepts = intercepts
+        self.scales = scales
+        self.activation = activation
+        self.out_activation = out_activation
+        self._hidden = HIDDEN_ACTIVATIONS[activation]
+        self._output = OUTPUT_ACTIVATIONS[out_activation]
+
+    @property
+    def quantized(self) -> bool:
+        return self.scales is not None
+
+    @classmethod
+    def from_model(cls, model, quantize: bool = False) -> "MLPEngine":
+        coefs = [np.asarray(c, dtype=ENGINE_DTYPE) for c in model.coefs_]
+        intercepts = [np.asarray(b, dtype=ENGINE_DTYPE) for b in model.intercepts_]
+        scales = None
+
+        if quantize:
+            quantized = [quantize_int8(c) for c in model.coefs_]
+            coefs = [q for q, _ in quantized]
+            scales = [s for _, s in quantized]
+
+        return cls(coefs, intercepts, model.activation, model.out_activation_, scales)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        activation = np.asarray(X, dtype=ENGINE_DTYPE)
+        last = len(self.coefs) - 1
+
+        for i, (coef, intercept) in enumerate(zip(self.coefs, self.intercepts)):
+            if self.scales is not None:
+                activation = _int8_matmul(activation, coef, self.scales[i])
+            else:
+                activation = activation @ coef
+            activation += intercept
+
+            if i != last:
+                self._hidden(activation)
+
+        return self._output(activation)
+
+
+def export_mlp_engine(model, path: str, quantize: bool = False) -> Dict[str, Any]:
+    os.makedirs(path, exist_ok=True)
+    engine = MLPEngine.from_model(model, quantize=quantize)
+
+    for i, (coef, intercept) in enumerate(zip(engine.coefs, engine.intercepts)):
+        np.save(os.path.join(path, f"coef_{i}.npy"), coef)
+        np.save(os.path.join(path, f"intercept_{i}.npy"), intercept)
+
+        if engine.quantized:
+            np.save(os.path.join(path, f"scale_{i}.npy"), engine.scales[i])
+
+    manifest = {
+        "n_layers": len(engine.coefs),
+        "layer_shapes": [list(coef.shape) for coef in engine.coefs],
+        "activation": engine.activation,
+        "out_activation": engine.out_activation,
+        "weight_dtype": "int8" if engine.quantized else "float32",
+    }
+
+    with open(os.path.join(path, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+
+def load_mlp_engine(path: str) -> MLPEngine:
+    with open(os.path.join(path, "manifest.json"), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    def load(name: str) -> np.ndarray:
+        return np.load(os.path.join(path, name), mmap_mode="r")
+
+    n_layers = manifest["n_layers"]
+    coefs = [load(f"coef_{i}.npy") for i in range(n_layers)]
+    intercepts = [load(f"intercept_{i}.npy") for i in range(n_layers)]
+    scales = None
+
+    if manifest["weight_dtype"] == "int8":
+        scales = [load(f"scale_{i}.npy") for i in range(n_layers)]
+
+    return MLPEngine(
+        coefs,
+        intercepts,
+        manifest["activation"],
+        manifest["out_activation"],
+        scales,
+    )
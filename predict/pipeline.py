@@ -0,0 +1,159 @@
+from typing import Dict, Any, List, Optional
+
+from ai_module.validation import (
+    validate_extraction,
+    normalize_fields,
+    split_blood_pressure,
+)
+from predict.feature_mapper import map_to_model_features
+from predict.predict_combined import predict_combined, predict_combined_batch
+from predict.prediction_cache import prediction_cache
+from monitoring.metrics import timed, count
+
+
+def prepare_model_input(extraction_result: Dict) -> Dict[str, Any]:
+    with timed("validate"):
+        validated = validate_extraction(extraction_result)
+
+    if validated["missing_fields"]:
+        count("sleep_incomplete_extractions_total")
+        return {
+            "status": "incomplete",
+            "extracted": validated.get("extracted", {}),
+            "missing_fields": validated["missing_fields"],
+        }
+
+    with timed("normalize"):
+        extracted = normalize_fields(validated["extracted"])
+        extracted = split_blood_pressure(extracted)
+
+    with timed("map_features"):
+        model_input = map_to_model_features(extracted)
+
+    return {
+        "status": "ready",
+        "extracted": extracted,
+        "model_input": model_input,
+    }
+
+
+def _model_kwargs(models: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "tree_model": models["tree_model"],
+        "nn_model": models["nn_model"],
+        "scaler": models["nn_scaler"],
+        "target_encoder": models["nn_target_encoder"],
+        "encoders": models["tree_encoders"],
+        "dummy_columns": models["nn_dummy_columns"],
+        "feature_encoder": models.get("feature_encoder"),
+        "compiled_tree": models.get("compiled_tree"),
+        "nn_engine": models.get("nn_engine"),
+    }
+
+
+def run_prediction(
+    model_input: Dict[str, Any], models: Dict[str, Any], use_cache: bool = True
+) -> Dict[str, Any]:
+    cache = prediction_cache if use_cache and prediction_cache.enabled else None
+    key = cache.key(model_input, models.get("version")) if cache else None
+    prediction = cache.get(key) if cache else None
+
+    if prediction is None:
+        prediction = predict_combined(input_data=model_input, **_model_kwargs(models))
+        prediction["model_version"] = models.get("version")
+
+        if cache:
+            cache.set(key, prediction)
+
+    count("sleep_predictions_total", model=prediction["model_used"])
+    return prediction
+
+
+def run_prediction_batch(
+    model_inputs: List[Dict[str, Any]], models: Dict[str, Any], use_cache: bool = True
+) -> List[Dict[str, Any]]:
+    cache = prediction_cache if use_cache and prediction_cache.enabled else None
+    version = models.get("version")
+    predictions: List[Optional[Dict[str, Any]]] = [None] * len(model_inputs)
+    keys: List[Any] = [None] * len(model_inputs)
+
+    if cache:
+        for i, model_input in enumerate(model_inputs):
+            keys[i] = cache.key(model_input, version)
+            predictions[i] = cache.get(keys[i])
+
+    # Only the misses go through the models, in a single batch; repeated
+    # inputs within the batch are computed once.
+    missing: Dict[Any, List[int]] = {}
+    for i, prediction in enumerate(predictions):
+        if prediction is None:
+            missing.setdefault(i if keys[i] is None else keys[i], []).append(i)
+
+    if missing:
+        computed = predict_combined_batch(
+            input_data=[model_inputs[rows[0]] for rows in missing.values()],
+            **_model_kwargs(models),
+        )
+
+        for rows, prediction in zip(missing.values(), computed):
+            prediction["model_version"] = version
+
+            if cache:
+                cache.set(keys[rows[0]], prediction)
+
+            predictions[rows[0]] = prediction
+            for i in rows[1:]:
+                predictions[i] = dict(prediction)
+
+    for prediction in predictions:
+        count("sleep_predictions_total", model=prediction["model_used"])
+
+    return predictions
+
+
+def _unknown_category(model_input: Dict[str, Any], models: Dict[str, Any]):
+    for col, encoder in models["tree_encoders"].items():
+        value = model_input.get(col)
+
+        if not isinstance(value, str) or value not in encoder.classes_:
+            return f"Unknown category {value!r} for '{col}'"
+
+    return None
+
+
+def predict_records(
+    records: List[Dict], models: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    results = []
+    model_inputs = []
+    complete_idx = []
+
+    for record in records:
+        prepared = prepare_model_input({"extracted": record or {}})
+
+        if prepared["status"] == "incomplete":
+            results.append(prepared)
+            continue
+
+        # One bad row must not fail the vectorized batch for all the others.
+        error = _unknown_category(prepared["model_input"], models)
+        if error is not None:
+            results.append(
+                {
+                    "status": "error",
+                    "model_input": prepared["model_input"],
+                    "message": error,
+                }
+            )
+            continue
+
+        complete_idx.append(len(results))
+        model_inputs.append(prepared["model_input"])
+        results.append({"status": "success", "model_input": prepared["model_input"]})
+
+    predictions = run_prediction_batch(model_inputs, models)
+
+    for i, prediction in zip(complete_idx, predictions):
+        results[i]["prediction"] = prediction
+
+    return results
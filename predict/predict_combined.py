@@ -1,7 +1,8 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 
-from predict.predict_tree import predict_tree
-from predict.predict_nn import predict_nn
+from predict.predict_tree import predict_tree, predict_tree_batch
+from predict.predict_nn import predict_nn, predict_nn_batch
+from monitoring.metrics import timed
 
 
 def predict_combined(
@@ -13,15 +14,30 @@ def predict_combined(
     encoders,
     dummy_columns,
     threshold: float = 0.85,
+    feature_encoder=None,
+    compiled_tree=None,
+    nn_engine=None,
 ) -> Dict[str, Any]:
 
-    result_tree = predict_tree(input_data, tree_model, encoders)
+    with timed("predict_tree"):
+        result_tree = predict_tree(
+            input_data, tree_model, encoders, feature_encoder, compiled_tree
+        )
 
     if result_tree["probability"] >= threshold:
         result_tree["model_used"] = "decision_tree"
         return result_tree
 
-    result_nn = predict_nn(input_data, nn_model, scaler, target_encoder, dummy_columns)
+    with timed("predict_nn"):
+        result_nn = predict_nn(
+            input_data,
+            nn_model,
+            scaler,
+            target_encoder,
+            dummy_columns,
+            feature_encoder,
+            nn_engine,
+        )
 
     if result_nn["probability"] > result_tree["probability"]:
         result_nn["model_used"] = "neural_network"
@@ -29,3 +45,51 @@ def predict_combined(
     else:
         result_tree["model_used"] = "decision_tree"
         return result_tree
+
+
+def predict_combined_batch(
+    input_data: List[Dict[str, Any]],
+    tree_model,
+    nn_model,
+    scaler,
+    target_encoder,
+    encoders,
+    dummy_columns,
+    threshold: float = 0.85,
+    feature_encoder=None,
+    compiled_tree=None,
+    nn_engine=None,
+) -> List[Dict[str, Any]]:
+
+    if not input_data:
+        return []
+
+    with timed("predict_tree_batch"):
+        results = predict_tree_batch(
+            input_data, tree_model, encoders, feature_encoder, compiled_tree
+        )
+    for result in results:
+        result["model_used"] = "decision_tree"
+
+    uncertain = [i for i, r in enumerate(results) if r["probability"] < threshold]
+
+    if not uncertain:
+        return results
+
+    with timed("predict_nn_batch"):
+        nn_results = predict_nn_batch(
+            [input_data[i] for i in uncertain],
+            nn_model,
+            scaler,
+            target_encoder,
+            dummy_columns,
+            feature_encoder,
+            nn_engine,
+        )
+
+    for i, result_nn in zip(uncertain, nn_results):
+        if result_nn["probability"] > results[i]["probability"]:
+            result_nn["model_used"] = "neural_network"
+            results[i] = result_nn
+
+    return results
@@ -1,26 +1,82 @@
-import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 
 def predict_nn(
-    input_data: Dict[str, Any], model, scaler, target_encoder, dummy_columns
+    input_data: Dict[str, Any],
+    model,
+    scaler,
+    target_encoder,
+    dummy_columns,
+    feature_encoder=None,
+    nn_engine=None,
 ) -> Dict[str, Any]:
 
-    df = pd.DataFrame([input_data])
-    df = pd.get_dummies(df, drop_first=True)
-    df = df.reindex(columns=dummy_columns, fill_value=0)
+    if feature_encoder is not None:
+        X_scaled = feature_encoder.nn_matrix([input_data])
+    else:
+        import pandas as pd
 
-    X_scaled = scaler.transform(df)
+        df = pd.DataFrame([input_data])
+        df = pd.get_dummies(df, drop_first=True)
+        df = df.reindex(columns=dummy_columns, fill_value=0)
 
-    proba = model.predict_proba(X_scaled)[0]
+        X_scaled = scaler.transform(df)
+
+    if nn_engine is not None:
+        proba = nn_engine.predict_proba(X_scaled)[0]
+    else:
+        proba = model.predict_proba(X_scaled)[0]
     class_idx = int(np.argmax(proba))
     confidence = float(proba[class_idx])
 
-    class_name = target_encoder.inverse_transform([class_idx])[0]
+    class_name = target_encoder.classes_[class_idx]
 
     return {
         "class_id": int(class_idx),
         "class_name": class_name,
         "probability": round(confidence, 4),
     }
+
+
+def predict_nn_batch(
+    input_data: List[Dict[str, Any]],
+    model,
+    scaler,
+    target_encoder,
+    dummy_columns,
+    feature_encoder=None,
+    nn_engine=None,
+) -> List[Dict[str, Any]]:
+
+    if feature_encoder is not None:
+        X_scaled = feature_encoder.nn_matrix(input_data)
+    else:
+        # get_dummies(drop_first=True) on the one-row frame built by predict_nn
+        # drops every categorical column, so only the numeric values ever reach
+        # the scaler. Mirror that so a batch scores like the same rows one by one.
+        import pandas as pd
+
+        df = pd.DataFrame(input_data).reindex(columns=dummy_columns, fill_value=0)
+        for col in df.select_dtypes(include="object"):
+            df[col] = df[col].map(lambda x: 0 if isinstance(x, str) else x)
+
+        X_scaled = scaler.transform(df)
+
+    if nn_engine is not None:
+        proba = nn_engine.predict_proba(X_scaled)
+    else:
+        proba = model.predict_proba(X_scaled)
+    class_idx = np.argmax(proba, axis=1)
+    confidence = proba[np.arange(len(proba)), class_idx]
+
+    class_names = target_encoder.classes_[class_idx]
+
+    return [
+        {
+            "class_id": int(idx),
+            "class_name": name,
+            "probability": round(float(conf), 4),
+        }
+        for idx, name, conf in zip(class_idx, class_names, confidence)
+    ]
@@ -1,25 +1,52 @@
-import pandas as pd
+import warnings
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 CLASS_MAPPING = {0: "Insomnia", 1: "None", 2: "Sleep Apnea"}
 
 
+def _predict_proba(model, X: np.ndarray) -> np.ndarray:
+    # FeatureEncoder lays columns out in feature_names_in_ order and hands the
+    # tree a plain ndarray, so sklearn's feature-name check has nothing to add.
+    with warnings.catch_warnings():
+        warnings.filterwarnings(
+            "ignore",
+            message="X does not have valid feature names",
+            category=UserWarning,
+        )
+        return model.predict_proba(X)
+
+
 def predict_tree(
-    input_data: Dict[str, Any], model, encoders: Dict[str, Any]
+    input_data: Dict[str, Any],
+    model,
+    encoders: Dict[str, Any],
+    feature_encoder=None,
+    compiled_tree=None,
 ) -> Dict[str, Any]:
 
-    df = pd.DataFrame([input_data])
+    if feature_encoder is not None:
+        X = feature_encoder.tree_matrix([input_data])
+
+        if compiled_tree is not None:
+            proba = compiled_tree.predict_proba_row(X[0])
+        else:
+            proba = _predict_proba(model, X)[0]
+    else:
+        import pandas as pd
+
+        df = pd.DataFrame([input_data])
 
-    for col, encoder in encoders.items():
-        if col in df:
-            df[col] = df[col].apply(
-                lambda x: (
-                    encoder.transform([x])[0] if x in encoder.classes_ else "Other"
+        for col, encoder in encoders.items():
+            if col in df:
+                df[col] = df[col].apply(
+                    lambda x: (
+                        encoder.transform([x])[0] if x in encoder.classes_ else "Other"
+                    )
                 )
-            )
 
-    proba = model.predict_proba(df)[0]
+        proba = model.predict_proba(df)[0]
+
     class_idx = int(np.argmax(proba))
     confidence = float(proba[class_idx])
 
@@ -28,3 +55,42 @@ def predict_tree(
         "class_name": CLASS_MAPPING[class_idx],
         "probability": round(confidence, 4),
     }
+
+
+def predict_tree_batch(
+    input_data: List[Dict[str, Any]],
+    model,
+    encoders: Dict[str, Any],
+    feature_encoder=None,
+    compiled_tree=None,
+) -> List[Dict[str, Any]]:
+
+    if feature_encoder is not None:
+        X = feature_encoder.tree_matrix(input_data)
+
+        if compiled_tree is not None:
+            proba = compiled_tree.predict_proba(X)
+        else:
+            proba = _predict_proba(model, X)
+    else:
+        import pandas as pd
+
+        df = pd.DataFrame(input_data)
+
+        for col, encoder in encoders.items():
+            if col in df:
+                df[col] = encoder.transform(df[col])
+
+        proba = model.predict_proba(df)
+
+    class_idx = np.argmax(proba, axis=1)
+    confidence = proba[np.arange(len(proba)), class_idx]
+
+    return [
+        {
+            "class_id": int(idx),
+            "class_name": CLASS_MAPPING[int(idx)],
+            "probability": round(float(conf), 4),
+        }
+        for idx, conf in zip(class_idx, confidence)
+    ]
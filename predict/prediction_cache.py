@@ -0,0 +1,105 @@
+import numbers
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Hashable, Optional
+
+from dotenv import load_dotenv
+
+
+def _canonical(value: Any) -> Any:
+    # 35, 35.0 and np.int64(35) are the same feature value. Nothing else is
+    # normalized (e.g. no stripping): "Doctor " must miss, and fail in the
+    # encoder, just as it would with the cache off. The type tag keeps True
+    # apart from 1, which hash equal inside a tuple.
+    if isinstance(value, bool):
+        return (bool, value)
+    if isinstance(value, numbers.Number):
+        return (float, float(value))
+    return (type(value), value)
+
+
+class PredictionCache:
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def key(
+        self, model_input: Dict[str, Any], version: Optional[str]
+    ) -> Optional[Hashable]:
+        # Order-independent and keyed on the model version, so a reload can
+        # never serve a prediction made by the previous models.
+        try:
+            features = tuple(
+                sorted((name, _canonical(value)) for name, value in model_input.items())
+            )
+            hash(features)
+        except TypeError:
+            return None
+
+        return (version, features)
+
+    def get(self, key: Optional[Hashable]) -> Optional[Dict[str, Any]]:
+        if key is None:
+            return None
+
+        with self._lock:
+            prediction = self._entries.get(key)
+
+            if prediction is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        # Callers add fields to the result; the cached copy stays untouched.
+        return dict(prediction)
+
+    def set(self, key: Optional[Hashable], prediction: Dict[str, Any]) -> None:
+        if key is None:
+            return
+
+        with self._lock:
+            self._entries[key] = dict(prediction)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, models: Optional[Dict[str, Any]] = None) -> None:
+        # Registered as a ModelManager listener; entries of the old version
+        # could never be hit again, so they are dropped right away.
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+def build_prediction_cache() -> PredictionCache:
+    load_dotenv()
+
+    # 0 disables the cache.
+    return PredictionCache(max_size=int(os.getenv("PREDICTION_CACHE_SIZE", "4096")))
+
+
+prediction_cache = build_prediction_cache()
@@ -0,0 +1,101 @@
+import numpy as np
+from typing import List
+
+# sklearn trees compare float32 features against float64 thresholds.
+TREE_DTYPE = np.float32
+
+# CPython refuses more than 100 nested blocks ("too many levels of
+# indentation"); deeper trees (max_depth=None) are walked node by node instead.
+MAX_COMPILED_DEPTH = 64
+
+
+class CompiledTree:
+    def __init__(self, tree_model):
+        tree = tree_model.tree_
+
+        self.n_features = tree.n_features
+        self.max_depth = tree.max_depth
+        self.feature = tree.feature.astype(np.intp)
+        self.threshold = tree.threshold.astype(np.float64)
+        self.children_left = tree.children_left.astype(np.intp)
+        self.children_right = tree.children_right.astype(np.intp)
+
+        # Same normalisation as DecisionTreeClassifier.predict_proba, done once
+        # per leaf instead of once per row.
+        value = tree.value[:, 0, : tree_model.n_classes_]
+        normalizer = value.sum(axis=1)[:, np.newaxis]
+        normalizer[normalizer == 0.0] = 1.0
+        self.leaf_proba = value / normalizer
+
+        # Leaves point to themselves so every row can take exactly max_depth
+        # steps without checking whether it already reached a leaf.
+        is_leaf = self.children_left == -1
+        nodes = np.arange(tree.node_count)
+        self._left = np.where(is_leaf, nodes, self.children_left)
+        self._right = np.where(is_leaf, nodes, self.children_right)
+        self._feature = np.where(is_leaf, 0, self.feature)
+
+        if self.max_depth <= MAX_COMPILED_DEPTH:
+            self._evaluate_row = self._compile()
+        else:
+            self._nodes = list(
+                zip(
+                    self.feature.tolist(),
+                    self.threshold.tolist(),
+                    self.children_left.tolist(),
+                    self.children_right.tolist(),
+                )
+            )
+            self._evaluate_row = self._walk
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=TREE_DTYPE)
+        rows = np.arange(X.shape[0])
+        node = np.zeros(X.shape[0], dtype=np.intp)
+
+        for _ in range(self.max_depth):
+            go_left = X[rows, self._feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self._left[node], self._right[node])
+
+        return node
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        return self.leaf_proba[self.apply(X)]
+
+    def predict_proba_row(self, x: np.ndarray) -> np.ndarray:
+        row = np.asarray(x, dtype=TREE_DTYPE).tolist()
+        return self.leaf_proba[self._evaluate_row(row)]
+
+    def _walk(self, x: List[float]) -> int:
+        nodes = self._nodes
+        node = 0
+        feature, threshold, left, right = nodes[node]
+
+        while left != -1:
+            node = left if x[feature] <= threshold else right
+            feature, threshold, left, right = nodes[node]
+
+        return node
+
+    def _compile(self):
+        lines = ["def evaluate(x):"]
+        self._emit(0, 1, lines)
+
+        namespace = {}
+        exec(compile("\n".join(lines), "<compiled_tree>", "exec"), namespace)
+        return namespace["evaluate"]
+
+    def _emit(self, node: int, depth: int, lines: List[str]) -> None:
+        indent = "    " * depth
+
+        if self.children_left[node] == -1:
+            lines.append(f"{indent}return {node}")
+            return
+
+        # repr() of a float round-trips exactly, so the generated comparison
+        # uses the very same float64 threshold as the tree.
+        threshold = repr(float(self.threshold[node]))
+        lines.append(f"{indent}if x[{self.feature[node]}] <= {threshold}:")
+        self._emit(int(self.children_left[node]), depth + 1, lines)
+        lines.append(f"{indent}else:")
+        self._emit(int(self.children_right[node]), depth + 1, lines)
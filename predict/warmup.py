@@ -0,0 +1,69 @@
+import itertools
+from typing import Dict, Any, List
+
+from predict.predict_tree import predict_tree_batch
+from predict.predict_nn import predict_nn_batch
+from predict.pipeline import run_prediction, run_prediction_batch
+from monitoring.metrics import paused
+
+CATEGORICAL_FEATURES = ("gender", "occupation", "bmi_category")
+
+BASE_INPUT = {
+    "age": 40,
+    "sleep_duration": 7.0,
+    "quality_of_sleep": 7,
+    "physical_activity_level": 60,
+    "stress_level": 5,
+    "heart_rate": 70,
+    "daily_steps": 7000,
+    "systolic": 125,
+    "diastolic": 80,
+}
+
+
+def build_warmup_inputs(models: Dict[str, Any]) -> List[Dict[str, Any]]:
+    encoders = models["tree_encoders"]
+    categories = [
+        [str(c) for c in encoders[col].classes_] for col in CATEGORICAL_FEATURES
+    ]
+
+    return [
+        {**dict(zip(CATEGORICAL_FEATURES, combination)), **BASE_INPUT}
+        for combination in itertools.product(*categories)
+    ]
+
+
+def warm_up(models: Dict[str, Any]) -> int:
+    with paused():
+        return _run_warmup(models)
+
+
+def _run_warmup(models: Dict[str, Any]) -> int:
+    inputs = build_warmup_inputs(models)
+
+    # Both models run over every input, whatever the tree's confidence, so the
+    # MLP path is warmed too.
+    predict_tree_batch(
+        inputs,
+        models["tree_model"],
+        models["tree_encoders"],
+        models.get("feature_encoder"),
+        models.get("compiled_tree"),
+    )
+    predict_nn_batch(
+        inputs,
+        models["nn_model"],
+        models["nn_scaler"],
+        models["nn_target_encoder"],
+        models["nn_dummy_columns"],
+        models.get("feature_encoder"),
+        models.get("nn_engine"),
+    )
+    # Bypasses the prediction cache, which would otherwise answer the second
+    # pass and fill up with synthetic inputs.
+    run_prediction_batch(inputs, models, use_cache=False)
+
+    for model_input in inputs:
+        run_prediction(model_input, models, use_cache=False)
+
+    return len(inputs)
@@ -9,7 +9,7 @@ def encode_tree(
 
     df = df.copy()
 
-    label_cols = df.select_dtypes(include="object").columns.tolist()
+    label_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
     label_cols = [c for c in label_cols if c != target_col]
 
     encoders: Dict[str, LabelEncoder] = {}
@@ -0,0 +1,117 @@
+import argparse
+import json
+import multiprocessing as mp
+import time
+from typing import Dict, Any, List
+
+SMAPS_FIELDS = ("Rss", "Pss", "Shared_Clean", "Private_Clean", "Private_Dirty")
+
+
+def read_memory() -> Dict[str, int]:
+    # Linux only: smaps_rollup gives RSS plus PSS/private memory, which is what
+    # tells shared page-cache mappings apart from per-worker copies.
+    memory = {}
+
+    with open("/proc/self/smaps_rollup", "r", encoding="utf-8") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in SMAPS_FIELDS:
+                memory[key] = int(value.split()[0])
+
+    memory["Uss"] = memory.get("Private_Clean", 0) + memory.get("Private_Dirty", 0)
+    return memory
+
+
+def _worker(base_path: str, mmap: bool, nn_engine: str, results, release) -> None:
+    start = time.perf_counter()
+
+    from models.load_models import load_models
+
+    imported = time.perf_counter()
+    models = load_models(base_path, nn_engine=nn_engine, mmap=mmap)
+    loaded = time.perf_counter()
+
+    from predict.pipeline import run_prediction
+
+    run_prediction(
+        {
+            "gender": "Male",
+            "age": 35,
+            "occupation": "Doctor",
+            "sleep_duration": 6.1,
+            "quality_of_sleep": 6,
+            "physical_activity_level": 45,
+            "stress_level": 7,
+            "bmi_category": "Overweight",
+            "heart_rate": 72,
+            "daily_steps": 8000,
+            "systolic": 128,
+            "diastolic": 85,
+        },
+        models,
+    )
+
+    results.put(
+        {
+            "import_seconds": imported - start,
+            "load_seconds": loaded - imported,
+            **read_memory(),
+        }
+    )
+    # Stay alive until every worker has measured, so PSS reflects the sharing.
+    release.wait()
+
+
+def run_benchmark(
+    base_path: str, workers: int, mmap: bool, nn_engine: str
+) -> Dict[str, Any]:
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+    release = ctx.Event()
+
+    processes = [
+        ctx.Process(target=_worker, args=(base_path, mmap, nn_engine, results, release))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    samples: List[Dict[str, Any]] = [results.get() for _ in processes]
+    release.set()
+
+    for process in processes:
+        process.join()
+
+    def mean(key: str) -> float:
+        return round(sum(sample[key] for sample in samples) / len(samples), 3)
+
+    return {
+        "mode": "mmap" if mmap else "copy",
+        "nn_engine": nn_engine,
+        "workers": workers,
+        "import_seconds": mean("import_seconds"),
+        "load_seconds": mean("load_seconds"),
+        "rss_kb": mean("Rss"),
+        "pss_kb": mean("Pss"),
+        "uss_kb": mean("Uss"),
+        "total_pss_kb": sum(sample["Pss"] for sample in samples),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare per-worker memory and startup time of copied vs "
+        "memory-mapped model artifacts."
+    )
+    parser.add_argument("--base-path", default="models")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--nn-engine", default="off", choices=["off", "float32", "int8"]
+    )
+    args = parser.parse_args()
+
+    report = [
+        run_benchmark(args.base_path, args.workers, mmap, args.nn_engine)
+        for mmap in (False, True)
+    ]
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,480 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ai_module.validation import ALLOWED_FIELDS
+from scripts.benchmark_model_loading import read_memory
+from scripts.benchmark_rule_extractor import TEMPLATES
+from scripts.expand_csv import DEFAULT_INPUT, clean_dataset, generate_synthetic
+
+BATCH_SIZES = (1, 32, 1024)
+DEFAULT_PAYLOADS = "data/benchmark/predict_requests.jsonl"
+
+# Fallback answer of the stubbed Gemini for payloads without "extracted".
+DEFAULT_EXTRACTED = {
+    "Gender": "Male",
+    "Age": 35,
+    "Occupation": "Doctor",
+    "Sleep Duration": 6.1,
+    "Quality of Sleep": 6,
+    "Physical Activity Level": 45,
+    "Stress Level": 7,
+    "BMI Category": "Overweight",
+    "Blood Pressure": "128/85",
+    "Heart Rate": 72,
+    "Daily Steps": 8000,
+}
+
+
+def synthetic_records(
+    n: int, seed: Optional[int] = None, input_csv: str = DEFAULT_INPUT
+) -> List[Dict[str, Any]]:
+    # Same jittered distributions as scripts/expand_csv.py, as extracted fields.
+    rng = np.random.default_rng(seed)
+    df = generate_synthetic(clean_dataset(pd.read_csv(input_csv)), n, rng)
+    return json.loads(df[sorted(ALLOWED_FIELDS)].to_json(orient="records"))
+
+
+def synthetic_model_inputs(
+    n: int, seed: Optional[int] = None, input_csv: str = DEFAULT_INPUT
+) -> List[Dict[str, Any]]:
+    from predict.pipeline import prepare_model_input
+
+    return [
+        prepare_model_input({"extracted": record})["model_input"]
+        for record in synthetic_records(n, seed, input_csv)
+    ]
+
+
+def synthetic_payloads(
+    n: int, seed: Optional[int] = None, input_csv: str = DEFAULT_INPUT
+) -> List[Dict[str, Any]]:
+    payloads = []
+
+    for i, record in enumerate(synthetic_records(n, seed, input_csv)):
+        text = TEMPLATES[i % len(TEMPLATES)].format(
+            **record,
+            gender=record["Gender"].lower(),
+            occupation=record["Occupation"].lower(),
+            bmi=record["BMI Category"].lower(),
+        )
+        # "extracted" is what the stubbed Gemini answers for this text.
+        payloads.append({"text": text, "extracted": record})
+
+    return payloads
+
+
+def write_payloads(path: str, payloads: List[Dict[str, Any]]) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(path, "w", encoding="utf-8") as f:
+        for payload in payloads:
+            f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+
+
+def load_payloads(path: str) -> List[Dict[str, Any]]:
+    payloads = []
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                payloads.append(json.loads(line))
+
+    return payloads
+
+
+def _percentile_ms(samples: List[float], q: float) -> Optional[float]:
+    if not samples:
+        return None
+    return round(float(np.percentile(samples, q)) * 1000, 4)
+
+
+def _memory() -> Dict[str, int]:
+    memory = read_memory()
+    return {
+        "rss_kb": memory["Rss"],
+        "uss_kb": memory["Uss"],
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def _environment(**extra: Any) -> Dict[str, Any]:
+    # Enough context to tell whether two reports are comparable.
+    import sklearn
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+        "cpus": os.cpu_count(),
+        **extra,
+    }
+
+
+def time_calls(
+    fn: Callable[[Any], Any], inputs: List[Any], iterations: int, warmup: int = 5
+) -> List[float]:
+    # Cycles through the inputs so every call sees a different row or batch.
+    for i in range(warmup):
+        fn(inputs[i % len(inputs)])
+
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn(inputs[i % len(inputs)])
+        samples.append(time.perf_counter() - start)
+
+    return samples
+
+
+def _predict_functions(models: Dict[str, Any]) -> Dict[str, Callable]:
+    from predict.predict_tree import predict_tree, predict_tree_batch
+    from predict.predict_nn import predict_nn, predict_nn_batch
+    from predict.predict_combined import predict_combined, predict_combined_batch
+
+    tree_args = (
+        models["tree_model"],
+        models["tree_encoders"],
+        models.get("feature_encoder"),
+        models.get("compiled_tree"),
+    )
+    nn_args = (
+        models["nn_model"],
+        models["nn_scaler"],
+        models["nn_target_encoder"],
+        models["nn_dummy_columns"],
+        models.get("feature_encoder"),
+        models.get("nn_engine"),
+    )
+    combined_kwargs = {
+        "tree_model": models["tree_model"],
+        "nn_model": models["nn_model"],
+        "scaler": models["nn_scaler"],
+        "target_encoder": models["nn_target_encoder"],
+        "encoders": models["tree_encoders"],
+        "dummy_columns": models["nn_dummy_columns"],
+        "feature_encoder": models.get("feature_encoder"),
+        "compiled_tree": models.get("compiled_tree"),
+        "nn_engine": models.get("nn_engine"),
+    }
+
+    # name -> (single-row function, batch function)
+    return {
+        "predict_tree": (
+            lambda row: predict_tree(row, *tree_args),
+            lambda rows: predict_tree_batch(rows, *tree_args),
+        ),
+        "predict_nn": (
+            lambda row: predict_nn(row, *nn_args),
+            lambda rows: predict_nn_batch(rows, *nn_args),
+        ),
+        "predict_combined": (
+            lambda row: predict_combined(input_data=row, **combined_kwargs),
+            lambda rows: predict_combined_batch(input_data=rows, **combined_kwargs),
+        ),
+    }
+
+
+def run_micro_benchmarks(
+    models: Dict[str, Any],
+    model_inputs: List[Dict[str, Any]],
+    batch_sizes=BATCH_SIZES,
+    iterations: int = 200,
+) -> List[Dict[str, Any]]:
+    from monitoring.metrics import paused
+
+    results = []
+
+    with paused():
+        for name, (single, batch) in _predict_functions(models).items():
+            for batch_size in batch_sizes:
+                batches = [
+                    model_inputs[i : i + batch_size]
+                    for i in range(0, len(model_inputs) - batch_size + 1, batch_size)
+                ] or [model_inputs[:batch_size]]
+
+                # Batch size 1 also measures the single-row path /predict uses.
+                variants = [("batch", batch)]
+                if batch_size == 1:
+                    variants.insert(0, ("single", lambda rows: single(rows[0])))
+
+                for variant, fn in variants:
+                    # Large batches get fewer iterations so each case takes
+                    # roughly the same wall time.
+                    n = max(iterations // max(batch_size // 32, 1), 20)
+                    samples = time_calls(fn, batches, n)
+                    total = sum(samples)
+
+                    results.append(
+                        {
+                            "function": (
+                                name if variant == "single" else f"{name}_batch"
+                            ),
+                            "batch_size": batch_size,
+                            "iterations": n,
+                            "rows_per_second": round(n * batch_size / total, 1),
+                            "p50_ms": _percentile_ms(samples, 50),
+                            "p99_ms": _percentile_ms(samples, 99),
+                        }
+                    )
+
+    return results
+
+
+def _stub_gemini(payloads: List[Dict[str, Any]], latency: float) -> None:
+    # Answers every prompt locally: the payload's "extracted" fields for its
+    # text, DEFAULT_EXTRACTED for texts that came without them.
+    import ai_module.selector as selector
+    from ai_module.prompt_registry import prompt_registry
+
+    answers = {
+        payload["text"]: json.dumps(
+            {"extracted": payload.get("extracted") or DEFAULT_EXTRACTED}
+        )
+        for payload in payloads
+    }
+    default = json.dumps({"extracted": DEFAULT_EXTRACTED})
+
+    # Whatever surrounds the user text in both the full and the
+    # missing-fields-only prompt, so the text can be cut back out.
+    template = prompt_registry.get()
+    full_head, tail = template.render("\0").split("\0")
+    partial_head = template.render("\0", fields=["Age"]).split("\0")[0]
+    lead = os.path.commonprefix([full_head[::-1], partial_head[::-1]])[::-1]
+
+    def answer(prompt: str) -> str:
+        text = prompt.rsplit(lead, 1)[-1]
+        if tail and text.endswith(tail):
+            text = text[: -len(tail)]
+        return answers.get(text, default)
+
+    def call_gemini(prompt: str) -> str:
+        if latency:
+            time.sleep(latency)
+        return answer(prompt)
+
+    async def call_gemini_async(prompt: str) -> str:
+        if latency:
+            await asyncio.sleep(latency)
+        return answer(prompt)
+
+    selector.call_gemini = call_gemini
+    selector.call_gemini_async = call_gemini_async
+
+
+def _load_flask(payloads, requests_total, concurrency):
+    from main import app
+
+    samples: List[float] = []
+    statuses: Counter = Counter()
+    sources: Counter = Counter()
+    lock = threading.Lock()
+    local = threading.local()
+
+    def send(i: int) -> None:
+        if not hasattr(local, "client"):
+            local.client = app.test_client()
+
+        payload = payloads[i % len(payloads)]
+        start = time.perf_counter()
+        response = local.client.post("/predict", json={"text": payload["text"]})
+        elapsed = time.perf_counter() - start
+        body = response.get_json(silent=True) or {}
+
+        with lock:
+            samples.append(elapsed)
+            statuses[response.status_code] += 1
+            sources[body.get("extraction_source")] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(send, range(requests_total)))
+    duration = time.perf_counter() - start
+
+    return samples, statuses, sources, duration
+
+
+def _load_asgi(payloads, requests_total, concurrency):
+    import httpx
+    from asgi import app
+
+    samples: List[float] = []
+    statuses: Counter = Counter()
+    sources: Counter = Counter()
+
+    async def run() -> float:
+        transport = httpx.ASGITransport(app=app)
+        queue: asyncio.Queue = asyncio.Queue()
+        for i in range(requests_total):
+            queue.put_nowait(i)
+
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+
+            async def worker() -> None:
+                while not queue.empty():
+                    payload = payloads[queue.get_nowait() % len(payloads)]
+                    start = time.perf_counter()
+                    response = await client.post(
+                        "/predict", json={"text": payload["text"]}
+                    )
+                    samples.append(time.perf_counter() - start)
+                    statuses[response.status_code] += 1
+                    sources[response.json().get("extraction_source")] += 1
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            return time.perf_counter() - start
+
+    duration = asyncio.run(run())
+    return samples, statuses, sources, duration
+
+
+def run_load_test(
+    payloads: List[Dict[str, Any]],
+    app: str = "asgi",
+    requests_total: int = 1000,
+    concurrency: int = 8,
+    llm_latency: float = 0.0,
+) -> Dict[str, Any]:
+    _stub_gemini(payloads, llm_latency)
+    runner = _load_asgi if app == "asgi" else _load_flask
+
+    # The first request pays for lazy imports and model warm-up; keep it out.
+    runner(payloads[:1], 1, 1)
+    samples, statuses, sources, duration = runner(payloads, requests_total, concurrency)
+
+    return {
+        "app": app,
+        "requests": requests_total,
+        "concurrency": concurrency,
+        "llm_latency_ms": llm_latency * 1000,
+        "duration_seconds": round(duration, 3),
+        "throughput_rps": round(requests_total / duration, 1),
+        "p50_ms": _percentile_ms(samples, 50),
+        "p95_ms": _percentile_ms(samples, 95),
+        "p99_ms": _percentile_ms(samples, 99),
+        "status_codes": {str(k): v for k, v in sorted(statuses.items())},
+        "extraction_sources": {str(k): v for k, v in sorted(sources.items(), key=str)},
+        **_memory(),
+    }
+
+
+def _micro(args) -> Dict[str, Any]:
+    from models.load_models import load_models
+    from models.registry import ModelRegistry
+
+    models = load_models(
+        ModelRegistry(args.models).current_path(), nn_engine=args.nn_engine
+    )
+    model_inputs = synthetic_model_inputs(max(BATCH_SIZES) * 4, args.seed, args.csv)
+
+    return {
+        "environment": _environment(
+            seed=args.seed, model_version=models["version"], nn_engine=args.nn_engine
+        ),
+        "micro": run_micro_benchmarks(models, model_inputs, iterations=args.iterations),
+        **_memory(),
+    }
+
+
+def _load(args) -> Dict[str, Any]:
+    # Settings must be in place before the app modules are imported.
+    os.environ["EXTRACTION_CACHE"] = args.extraction_cache
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+    if args.nn_engine:
+        os.environ["NN_ENGINE"] = args.nn_engine
+
+    if args.payloads and os.path.exists(args.payloads):
+        payloads = load_payloads(args.payloads)
+    else:
+        payloads = synthetic_payloads(args.requests, args.seed, args.csv)
+
+    return {
+        "environment": _environment(
+            seed=args.seed,
+            payloads=args.payloads,
+            extraction_cache=args.extraction_cache,
+            nn_engine=os.getenv("NN_ENGINE", "off"),
+        ),
+        "load": run_load_test(
+            payloads,
+            app=args.app,
+            requests_total=args.requests,
+            concurrency=args.concurrency,
+            llm_latency=args.llm_latency_ms / 1000,
+        ),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmarks and an offline load test of the prediction path."
+    )
+    parser.add_argument(
+        "mode",
+        choices=["micro", "load", "payloads"],
+        help="micro: predict functions at batch sizes 1/32/1024; load: replay "
+        "/predict payloads against the app with Gemini stubbed; payloads: write "
+        "synthetic payloads to --payloads",
+    )
+    parser.add_argument("--models", default="models")
+    parser.add_argument("--csv", default=DEFAULT_INPUT)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--nn-engine", default=None, choices=["off", "float32", "int8"])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument(
+        "--payloads",
+        default=DEFAULT_PAYLOADS,
+        help='JSONL of {"text": ..., "extracted": {...}}; synthetic when missing',
+    )
+    parser.add_argument("--app", choices=["asgi", "flask"], default="asgi")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--extraction-cache", default="off")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    if args.mode == "payloads":
+        write_payloads(
+            args.payloads, synthetic_payloads(args.requests, args.seed, args.csv)
+        )
+        print(f"Wrote {args.requests} payloads to {args.payloads}")
+        raise SystemExit(0)
+
+    report = _micro(args) if args.mode == "micro" else _load(args)
+    output = json.dumps(report, indent=2)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+
+    print(output)
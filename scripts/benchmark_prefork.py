@@ -0,0 +1,151 @@
+import argparse
+import gc
+import json
+import multiprocessing as mp
+import os
+import time
+from typing import Dict, Any, List
+
+import numpy as np
+
+from scripts.benchmark_model_loading import read_memory
+
+MODES = ("per-worker", "preload", "preload+freeze")
+
+
+def _serve(
+    app_state, model_inputs: List[Dict[str, Any]], requests: int
+) -> Dict[str, Any]:
+    from predict.pipeline import run_prediction
+
+    models = app_state.models
+    samples = []
+
+    for i in range(requests):
+        start = time.perf_counter()
+        run_prediction(model_inputs[i % len(model_inputs)], models)
+        samples.append(time.perf_counter() - start)
+
+    # A full collection, as a long-running worker eventually does; without
+    # gc.freeze() it touches every object inherited from the master.
+    gc.collect()
+
+    return {
+        "first_request_ms": samples[0] * 1000,
+        "p50_ms": float(np.percentile(samples[1:], 50)) * 1000,
+        "p99_ms": float(np.percentile(samples[1:], 99)) * 1000,
+        **read_memory(),
+    }
+
+
+def _worker(
+    mode: str, app_state, model_inputs, requests: int, out_fd: int, release_fd: int
+):
+    if mode == "per-worker":
+        app_state.model_manager.get()
+    else:
+        app_state.post_fork()
+
+    result = _serve(app_state, model_inputs, requests)
+    os.write(out_fd, (json.dumps(result) + "\n").encode("utf-8"))
+
+    # Stay alive until every worker has measured, so PSS reflects the sharing.
+    os.read(release_fd, 1)
+
+
+def _master(mode: str, models_root: str, workers: int, requests: int, results) -> None:
+    os.environ["EAGER_INIT"] = "0"
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+    from app_state import AppState
+    from scripts.benchmark_predict import synthetic_model_inputs
+
+    model_inputs = synthetic_model_inputs(256, seed=42)
+    app_state = AppState(models_root)
+
+    start = time.perf_counter()
+    if mode == "preload+freeze":
+        app_state.prefork()
+    elif mode == "preload":
+        app_state.model_manager.get()
+        app_state.llm_client.get()
+    master_seconds = time.perf_counter() - start
+
+    out_read, out_write = os.pipe()
+    release_read, release_write = os.pipe()
+    pids = []
+
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            os.close(out_read)
+            os.close(release_write)
+            try:
+                _worker(
+                    mode, app_state, model_inputs, requests, out_write, release_read
+                )
+            finally:
+                os._exit(0)
+        pids.append(pid)
+
+    os.close(out_write)
+    os.close(release_read)
+
+    with os.fdopen(out_read, "r", encoding="utf-8") as reader:
+        samples = [json.loads(reader.readline()) for _ in pids]
+
+    os.close(release_write)
+    for pid in pids:
+        os.waitpid(pid, 0)
+
+    def mean(key: str) -> float:
+        return round(sum(sample[key] for sample in samples) / len(samples), 3)
+
+    results.put(
+        {
+            "mode": mode,
+            "workers": workers,
+            "master_init_seconds": round(master_seconds, 3),
+            "first_request_ms": mean("first_request_ms"),
+            "p50_ms": mean("p50_ms"),
+            "p99_ms": mean("p99_ms"),
+            "rss_kb": mean("Rss"),
+            "pss_kb": mean("Pss"),
+            "uss_kb": mean("Uss"),
+            "total_uss_kb": sum(sample["Uss"] for sample in samples),
+        }
+    )
+
+
+def run_benchmark(
+    mode: str, models_root: str, workers: int, requests: int
+) -> Dict[str, Any]:
+    # A fresh master per mode, so nothing is inherited from earlier runs.
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+    master = ctx.Process(
+        target=_master, args=(mode, models_root, workers, requests, results)
+    )
+    master.start()
+    report = results.get()
+    master.join()
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare per-worker unique memory (USS) and first-request "
+        "latency of workers that load models themselves vs. workers forked from a "
+        "master that preloaded (and froze) them. Linux only."
+    )
+    parser.add_argument("--models", default="models")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    args = parser.parse_args()
+
+    report = [
+        run_benchmark(mode, args.models, args.workers, args.requests)
+        for mode in args.modes
+    ]
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,159 @@
+import argparse
+import json
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ai_module.rule_extractor import extract_with_rules
+from ai_module.validation import ALLOWED_FIELDS
+
+DEFAULT_CSV = "data/processed/Sleep_Health_Massive_Dataset.csv"
+
+# Phrasings from fully structured to free text, used by --synthetic.
+TEMPLATES = [
+    "Age: {Age}, Gender: {Gender}, Occupation: {Occupation}, Sleep Duration: "
+    "{Sleep Duration}, Quality of Sleep: {Quality of Sleep}, Physical Activity Level: "
+    "{Physical Activity Level}, Stress Level: {Stress Level}, BMI Category: "
+    "{BMI Category}, BP {Blood Pressure}, Heart Rate: {Heart Rate}, Daily Steps: "
+    "{Daily Steps}",
+    "I'm a {Age} year old {gender} {occupation}. I sleep {Sleep Duration} hours, "
+    "sleep quality {Quality of Sleep}/10, stress {Stress Level}/10. I exercise "
+    "{Physical Activity Level} minutes a day and walk {Daily Steps} steps. BMI is "
+    "{bmi}, blood pressure {Blood Pressure}, resting heart rate {Heart Rate} bpm.",
+    "Lately I feel exhausted. I work long shifts as a {occupation} and barely rest, "
+    "maybe {Sleep Duration} hours a night. My doctor says my pressure is "
+    "{Blood Pressure}.",
+]
+
+
+def load_texts(path: str) -> List[str]:
+    # One /predict payload per line: {"text": "..."}.
+    texts = []
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            text = json.loads(line).get("text")
+            if isinstance(text, str):
+                texts.append(text)
+
+    return texts
+
+
+def synthetic_texts(
+    csv_path: str, n: int, seed: Optional[int] = None
+) -> Tuple[List[str], List[Dict[str, Any]]]:
+    rng = np.random.default_rng(seed)
+    df = pd.read_csv(csv_path, nrows=max(n * 10, 1000))
+    rows = df.iloc[rng.integers(0, len(df), size=n)].to_dict("records")
+
+    texts, truths = [], []
+    for i, row in enumerate(rows):
+        truth = {field: row[field] for field in ALLOWED_FIELDS}
+        template = TEMPLATES[i % len(TEMPLATES)]
+
+        texts.append(
+            template.format(
+                **truth,
+                gender=str(row["Gender"]).lower(),
+                occupation=str(row["Occupation"]).lower(),
+                bmi=str(row["BMI Category"]).lower(),
+            )
+        )
+        truths.append(truth)
+
+    return texts, truths
+
+
+def _same(expected: Any, actual: Any) -> bool:
+    if isinstance(expected, (int, float, np.number)):
+        return float(expected) == float(actual)
+    return str(expected).lower() == str(actual).lower()
+
+
+def run_benchmark(
+    texts: List[str], truths: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    complete = partial = none = 0
+    requested_fields = 0
+    filled = {field: 0 for field in sorted(ALLOWED_FIELDS)}
+    correct = wrong = 0
+
+    start = time.perf_counter()
+    results = [extract_with_rules(text) for text in texts]
+    elapsed = time.perf_counter() - start
+
+    for i, result in enumerate(results):
+        extracted = result["extracted"]
+
+        # Same decision as AISelector: Gemini is skipped when every field was
+        # read, and otherwise asked only for the missing ones.
+        if not result["missing_fields"]:
+            complete += 1
+        elif extracted:
+            partial += 1
+            requested_fields += len(result["missing_fields"])
+        else:
+            none += 1
+
+        for field in extracted:
+            filled[field] += 1
+
+        if truths is not None:
+            for field, value in extracted.items():
+                if _same(truths[i][field], value):
+                    correct += 1
+                else:
+                    wrong += 1
+
+    total = len(texts)
+    report = {
+        "texts": total,
+        "llm_calls_eliminated": complete,
+        "llm_calls_reduced": partial,
+        "llm_calls_full": none,
+        "llm_call_reduction": round(complete / total, 4) if total else 0.0,
+        "mean_fields_requested_when_partial": (
+            round(requested_fields / partial, 2) if partial else 0.0
+        ),
+        "field_fill_rate": {
+            field: round(count / total, 4) if total else 0.0
+            for field, count in filled.items()
+        },
+        "mean_extraction_us": round(elapsed / total * 1e6, 2) if total else 0.0,
+    }
+
+    if truths is not None:
+        # Only measured on template texts, which contain no sentences about
+        # other people, so it overstates real-world precision.
+        checked = correct + wrong
+        report["precision"] = round(correct / checked, 4) if checked else None
+
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure how many Gemini calls the rule-based extractor saves."
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", help='JSONL file of {"text": ...} payloads')
+    source.add_argument(
+        "--synthetic",
+        type=int,
+        help="Generate this many texts from the dataset CSV (checks precision too)",
+    )
+    parser.add_argument("--csv", default=DEFAULT_CSV)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.input:
+        report = run_benchmark(load_texts(args.input))
+    else:
+        report = run_benchmark(*synthetic_texts(args.csv, args.synthetic, args.seed))
+
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,68 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, Any, List
+
+# Heavy packages that should only load once models or Gemini are first used.
+HEAVY_MODULES = ("google.genai", "pandas", "sklearn", "scipy", "imblearn", "joblib")
+
+# Runs in a fresh interpreter so nothing is already imported.
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+module = __import__(sys.argv[1])
+imported = time.perf_counter()
+app_state = module.app.state.app_state if sys.argv[1] == "asgi" else module.app.extensions["app_state"]
+heavy = [name for name in json.loads(sys.argv[2]) if name in sys.modules]
+ready = app_state.initialize()
+initialized = time.perf_counter()
+print(json.dumps({
+    "import_seconds": imported - start,
+    "init_seconds": initialized - imported,
+    "ready": ready,
+    "heavy_modules_at_import": heavy,
+}))
+"""
+
+
+def measure(app: str, repeat: int) -> Dict[str, Any]:
+    env = {**os.environ, "EAGER_INIT": "0"}
+    samples: List[Dict[str, Any]] = []
+
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE, app, json.dumps(HEAVY_MODULES)],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    def best(key: str) -> float:
+        return round(min(sample[key] for sample in samples), 3)
+
+    return {
+        "app": app,
+        "repeat": repeat,
+        "import_seconds": best("import_seconds"),
+        "init_seconds": best("init_seconds"),
+        "ready": all(sample["ready"] for sample in samples),
+        "heavy_modules_at_import": samples[0]["heavy_modules_at_import"],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure how long importing the app takes (until /health can "
+        "answer) versus building models and the Gemini client (until /ready)."
+    )
+    parser.add_argument(
+        "--app", choices=["main", "asgi"], nargs="+", default=["main", "asgi"]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps([measure(app, args.repeat) for app in args.app], indent=2))
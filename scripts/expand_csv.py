@@ -1,82 +1,181 @@
+import argparse
+import os
 import pandas as pd
 import numpy as np
+from typing import Iterator, Optional
 
+ALLOWED_OCCUPATIONS = [
+    "Accountant",
+    "Doctor",
+    "Engineer",
+    "Lawyer",
+    "Nurse",
+    "Salesperson",
+    "Teacher",
+]
 
-def expand_dataset(df_original, total_final=10000):
+DEFAULT_INPUT = "data/raw/Sleep_health_and_lifestyle_dataset_ORIGINAL.csv"
+DEFAULT_OUTPUT = "data/processed/Sleep_Health_Massive_Dataset.csv"
+
+
+def clean_dataset(df_original: pd.DataFrame) -> pd.DataFrame:
     df_clean = df_original.copy()
 
     df_clean["Occupation"] = df_clean["Occupation"].fillna("Other")
-
-    allowed_occupations = [
-        "Accountant",
-        "Doctor",
-        "Engineer",
-        "Lawyer",
-        "Nurse",
-        "Salesperson",
-        "Teacher",
-    ]
-
-    df_clean["Occupation"] = df_clean["Occupation"].apply(
-        lambda x: x if x in allowed_occupations else "Other"
+    df_clean["Occupation"] = df_clean["Occupation"].where(
+        df_clean["Occupation"].isin(ALLOWED_OCCUPATIONS), "Other"
     )
     df_clean["Sleep Disorder"] = df_clean["Sleep Disorder"].fillna("None")
     df_clean["BMI Category"] = df_clean["BMI Category"].replace(
         "Normal Weight", "Normal"
     )
 
-    new_data = []
-    n_needed = total_final - len(df_clean)
+    return df_clean.reset_index(drop=True)
 
-    bp_split = df_clean["Blood Pressure"].str.split("/", expand=True).astype(int)
-    df_clean["sys_val"] = bp_split[0]
-    df_clean["dia_val"] = bp_split[1]
 
-    print(f"Generating {n_needed} new records...")
+def generate_synthetic(
+    df_clean: pd.DataFrame, n: int, rng: np.random.Generator
+) -> pd.DataFrame:
+    base = df_clean.iloc[rng.integers(0, len(df_clean), size=n)].reset_index(drop=True)
+    bp_split = base["Blood Pressure"].str.split("/", expand=True).astype(int)
 
-    for _ in range(n_needed):
-        base = df_clean.sample(n=1).iloc[0]
-        new_row = base.copy()
+    new_rows = base.copy()
 
-        new_row["Age"] = int(np.clip(base["Age"] + np.random.randint(-2, 3), 20, 65))
-        new_row["Sleep Duration"] = round(
-            np.clip(base["Sleep Duration"] + np.random.uniform(-0.5, 0.5), 4, 10), 1
-        )
-        new_row["Physical Activity Level"] = int(
-            np.clip(
-                base["Physical Activity Level"] + np.random.randint(-10, 11), 30, 120
-            )
-        )
-        new_row["Heart Rate"] = int(
-            np.clip(base["Heart Rate"] + np.random.randint(-3, 4), 60, 100)
-        )
-        new_row["Daily Steps"] = int(
-            np.clip(base["Daily Steps"] + np.random.randint(-800, 801), 2000, 15000)
-        )
+    new_rows["Age"] = np.clip(base["Age"] + rng.integers(-2, 3, size=n), 20, 65)
+    new_rows["Sleep Duration"] = np.round(
+        np.clip(base["Sleep Duration"] + rng.uniform(-0.5, 0.5, size=n), 4, 10), 1
+    )
+    new_rows["Physical Activity Level"] = np.clip(
+        base["Physical Activity Level"] + rng.integers(-10, 11, size=n), 30, 120
+    )
+    new_rows["Heart Rate"] = np.clip(
+        base["Heart Rate"] + rng.integers(-3, 4, size=n), 60, 100
+    )
+    new_rows["Daily Steps"] = np.clip(
+        base["Daily Steps"] + rng.integers(-800, 801, size=n), 2000, 15000
+    )
 
-        sys = int(base["sys_val"] + np.random.randint(-4, 5))
-        dia = int(base["dia_val"] + np.random.randint(-3, 4))
-        new_row["Blood Pressure"] = f"{sys}/{dia}"
+    systolic = bp_split[0] + rng.integers(-4, 5, size=n)
+    diastolic = bp_split[1] + rng.integers(-3, 4, size=n)
+    new_rows["Blood Pressure"] = systolic.astype(str) + "/" + diastolic.astype(str)
 
-        new_row["sys_val"] = sys
-        new_row["dia_val"] = dia
+    return new_rows
 
-        new_data.append(new_row)
 
-    df_final = pd.concat([df_clean, pd.DataFrame(new_data)], ignore_index=True)
-    df_final = df_final.drop(columns=["sys_val", "dia_val"])
+def iter_expanded_chunks(
+    df_original: pd.DataFrame,
+    total_final: int = 10000,
+    chunk_size: int = 100000,
+    seed: Optional[int] = None,
+) -> Iterator[pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    df_clean = clean_dataset(df_original)
+
+    n_needed = total_final - len(df_clean)
+    print(f"Generating {max(n_needed, 0)} new records...")
 
-    df_final["Person ID"] = range(1, len(df_final) + 1)
+    yield df_clean.assign(**{"Person ID": np.arange(1, len(df_clean) + 1)})
 
-    return df_final
+    next_id = len(df_clean) + 1
+    generated = 0
 
+    while generated < n_needed:
+        n = min(chunk_size, n_needed - generated)
+        chunk = generate_synthetic(df_clean, n, rng)
+        chunk["Person ID"] = np.arange(next_id, next_id + n)
 
-df_original = pd.read_csv("Sleep_health_and_lifestyle_dataset_ORIGINAL.csv")
+        next_id += n
+        generated += n
+        yield chunk
 
-df_massive = expand_dataset(df_original, total_final=10000)
 
-print("\nOccupation Distribution:")
-print(df_massive["Occupation"].value_counts())
+def expand_dataset(
+    df_original: pd.DataFrame, total_final: int = 10000, seed: Optional[int] = None
+) -> pd.DataFrame:
+    chunks = iter_expanded_chunks(
+        df_original, total_final, chunk_size=max(total_final, 1), seed=seed
+    )
+    return pd.concat(chunks, ignore_index=True)
+
+
+def expand_dataset_to_file(
+    df_original: pd.DataFrame,
+    output_path: str,
+    total_final: int = 10000,
+    chunk_size: int = 100000,
+    seed: Optional[int] = None,
+    output_format: Optional[str] = None,
+) -> pd.Series:
+    output_format = output_format or (
+        "parquet" if output_path.endswith(".parquet") else "csv"
+    )
+
+    if output_format not in ("csv", "parquet"):
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    occupation_counts = pd.Series(dtype="int64")
+    writer = None
+
+    try:
+        for i, chunk in enumerate(
+            iter_expanded_chunks(df_original, total_final, chunk_size, seed)
+        ):
+            if output_format == "csv":
+                chunk.to_csv(
+                    output_path,
+                    mode="w" if i == 0 else "a",
+                    header=(i == 0),
+                    index=False,
+                )
+            else:
+                # pyarrow is only needed for Parquet output.
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, table.schema)
+                writer.write_table(table.cast(writer.schema))
+
+            occupation_counts = occupation_counts.add(
+                chunk["Occupation"].value_counts(), fill_value=0
+            )
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return occupation_counts.astype("int64").sort_values(ascending=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Expand the original sleep dataset with jittered synthetic rows."
+    )
+    parser.add_argument("--input", default=DEFAULT_INPUT)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--total", type=int, default=10000)
+    parser.add_argument("--chunk-size", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--format", choices=["csv", "parquet"], default=None)
+    args = parser.parse_args()
+
+    df_original = pd.read_csv(args.input)
+
+    occupation_counts = expand_dataset_to_file(
+        df_original,
+        args.output,
+        total_final=args.total,
+        chunk_size=args.chunk_size,
+        seed=args.seed,
+        output_format=args.format,
+    )
+
+    print("\nOccupation Distribution:")
+    print(occupation_counts)
 
-df_massive.to_csv("Sleep_Health_Massive_Dataset.csv", index=False)
-print(f"\nFile saved with {len(df_massive)} records and ZERO NaNs in Occupation.")
+    total = int(occupation_counts.sum())
+    print(f"\nFile saved with {total} records and ZERO NaNs in Occupation.")
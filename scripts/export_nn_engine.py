@@ -0,0 +1,69 @@
+import os
+import numpy as np
+from typing import Dict, Any
+
+from data.fetch_data import fetch_sql_sleep_data_chunked
+from data.database import build_database
+
+from preprocessing.base_preprocessing import base_preprocessing
+from preprocessing.encode_nn import encode_nn
+
+from training.prepare_data import prepare_data
+
+from models.load_models import load_models, NN_ENGINE_DIRS
+from models.registry import ModelRegistry
+from predict.mlp_engine import export_mlp_engine, load_mlp_engine
+
+
+def evaluate_engine(model, engine, x_test, y_test) -> Dict[str, Any]:
+    reference = model.predict_proba(x_test)
+    proba = engine.predict_proba(x_test)
+
+    reference_accuracy = float(np.mean(reference.argmax(axis=1) == y_test))
+    accuracy = float(np.mean(proba.argmax(axis=1) == y_test))
+
+    return {
+        "accuracy": round(accuracy, 4),
+        "reference_accuracy": round(reference_accuracy, 4),
+        "accuracy_delta": round(accuracy - reference_accuracy, 4),
+        "prediction_agreement": round(
+            float(np.mean(proba.argmax(axis=1) == reference.argmax(axis=1))), 4
+        ),
+        "max_probability_error": float(np.abs(proba - reference).max()),
+    }
+
+
+def export_nn_engines(base_path: str | None = None) -> Dict[str, Dict[str, Any]]:
+    base_path = base_path or ModelRegistry().current_path()
+    models = load_models(base_path, nn_engine="off")
+    nn_model = models["nn_model"]
+
+    raw_df = fetch_sql_sleep_data_chunked(
+        build_database(), snapshot_dir=os.getenv("DATA_SNAPSHOT_DIR")
+    )
+
+    preprocessed_df = base_preprocessing(raw_df)
+    encoded_nn_df, _ = encode_nn(
+        preprocessed_df, dummy_columns=models["nn_dummy_columns"]
+    )
+    nn_data = prepare_data(encoded_nn_df, model_type="nn")
+
+    report = {}
+
+    for mode, directory in NN_ENGINE_DIRS.items():
+        path = os.path.join(base_path, "nn", directory)
+        export_mlp_engine(nn_model, path, quantize=(mode == "int8"))
+
+        engine = load_mlp_engine(path)
+        report[mode] = evaluate_engine(
+            nn_model, engine, nn_data["x_test"], nn_data["y_test"]
+        )
+
+    return report
+
+
+if __name__ == "__main__":
+    report = export_nn_engines()
+
+    for mode, metrics in report.items():
+        print(f"{mode}: {metrics}")
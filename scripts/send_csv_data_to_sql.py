@@ -1,45 +1,47 @@
-import pandas as pd
-import mysql.connector
-import os
-from dotenv import load_dotenv
+import argparse
 
-load_dotenv()
+from data.db_config import load_env_variables
+from data.bulk_load import load_csv_to_sql
+from data.database import MySQLDatabase, SQLiteDatabase
 
-df = pd.read_csv("Sleep_Health_Massive_Dataset.csv")
-df = df.fillna("None")
 
-try:
-    connection = mysql.connector.connect(
-        host=os.getenv("DB_HOST"),
-        user=os.getenv("DB_USER"),
-        password=os.getenv("DB_PASSWORD"),
-        database=os.getenv("DB_NAME"),
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Stream a sleep dataset CSV into the sleep_data table."
     )
-
-    if connection.is_connected():
-        cursor = connection.cursor()
-        print("Connected to database. Starting insertion...")
-
-        sql_command = """
-        INSERT INTO sleep_data (
-            person_id, gender, age, occupation, sleep_duration, 
-            quality_of_sleep, physical_activity_level, stress_level, 
-            bmi_category, blood_pressure, heart_rate, daily_steps, sleep_disorder
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-
-        values = [tuple(x) for x in df.values]
-
-        cursor.executemany(sql_command, values)
-
-        connection.commit()
-        print(f"Success! {cursor.rowcount} rows inserted into sleep_data table.")
-
-except mysql.connector.Error as error:
-    print(f"Error connecting or inserting: {error}")
-
-finally:
-    if "connection" in locals() and connection.is_connected():
-        cursor.close()
-        connection.close()
-        print("Connection closed.")
+    parser.add_argument(
+        "--csv", default="data/processed/Sleep_Health_Massive_Dataset.csv"
+    )
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--mode", choices=["insert", "load_data"], default="insert")
+    parser.add_argument("--no-resume", action="store_true")
+    parser.add_argument(
+        "--sqlite", default=None, help="Load into this SQLite file instead of MySQL"
+    )
+    args = parser.parse_args()
+
+    try:
+        if args.sqlite:
+            database = SQLiteDatabase(args.sqlite, pool_size=1)
+        else:
+            database = MySQLDatabase(
+                load_env_variables(),
+                pool_size=1,
+                allow_local_infile=(args.mode == "load_data"),
+            )
+
+        stats = load_csv_to_sql(
+            args.csv,
+            database,
+            chunk_size=args.chunk_size,
+            batch_size=args.batch_size,
+            mode=args.mode,
+            resume=not args.no_resume,
+        )
+        print(
+            f"Success! {stats['rows_inserted']} rows inserted into sleep_data table "
+            f"in {stats['seconds']}s ({stats['rows_per_second']} rows/sec)."
+        )
+    except Exception as error:
+        print(f"Error connecting or inserting: {error}")
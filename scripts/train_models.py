@@ -1,55 +1,144 @@
-from typing import Dict, Any
-import joblib
+from typing import Dict, Any, Optional
+import argparse
 import os
 
-from data.fetch_data import fetch_sql_sleep_data
-from data.db_config import load_env_variables
+import pandas as pd
+from dotenv import load_dotenv
 
-from preprocessing.base_preprocessing import base_preprocessing
-from preprocessing.encode_tree import encode_tree
-from preprocessing.encode_nn import encode_nn
+from data.fetch_data import (
+    fetch_sql_sleep_data_chunked,
+    iter_sql_sleep_data_chunks,
+    iter_csv_sleep_data_chunks,
+)
+from data.database import build_database
 
-from training.prepare_data import prepare_data
-from training.train_tree import train_decision_tree
-from training.train_nn import train_neural_network
+from training.orchestrator import (
+    run_training_pipeline,
+    prepare_branches,
+    format_timing_report,
+)
+from training.search import search_hyperparameters, format_frontier
+from training.incremental import train_incremental
 
-from models.save_models import save_models
+from models.registry import ModelRegistry
 
 
-def train_models() -> Dict[str, Any]:
-    db_config = load_env_variables()
-    raw_df = fetch_sql_sleep_data(db_config)
+def _cache_dir() -> Optional[str]:
+    return os.getenv("TRAINING_CACHE_DIR", "data/cache/training") or None
 
-    preprocessed_df = base_preprocessing(raw_df)
 
-    encoded_tree_df, tree_encoders = encode_tree(preprocessed_df)
-    encoded_nn_df, dummy_columns = encode_nn(preprocessed_df)
+def fetch_training_data() -> pd.DataFrame:
+    load_dotenv()
 
-    tree_data = prepare_data(encoded_tree_df, model_type="tree")
-    nn_data = prepare_data(encoded_nn_df, model_type="nn")
+    return fetch_sql_sleep_data_chunked(
+        build_database(), snapshot_dir=os.getenv("DATA_SNAPSHOT_DIR")
+    )
+
+
+def train_models(
+    raw_df: Optional[pd.DataFrame] = None,
+    tree_params: Optional[Dict[str, Any]] = None,
+    nn_params: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    raw_df = fetch_training_data() if raw_df is None else raw_df
+
+    # Tree and MLP branches are fitted in parallel processes; preprocessing and
+    # SMOTE output is reused from TRAINING_CACHE_DIR when the data is unchanged.
+    return run_training_pipeline(
+        raw_df,
+        cache_dir=_cache_dir(),
+        parallel=os.getenv("TRAINING_PARALLEL", "1").lower() in ("1", "true", "yes"),
+        tree_params=tree_params,
+        nn_params=nn_params,
+    )
 
-    tree_model = train_decision_tree(
-        X_train=tree_data["x_train_bal"],
-        y_train=tree_data["y_train_bal"],
+
+def search_and_train(n_jobs: int = -1, f1_tolerance: float = 0.005) -> Dict[str, Any]:
+    raw_df = fetch_training_data()
+
+    search = search_hyperparameters(
+        prepare_branches(raw_df, cache_dir=_cache_dir()),
+        n_jobs=n_jobs,
+        f1_tolerance=f1_tolerance,
     )
+    print(format_frontier(search))
 
-    nn_model = train_neural_network(
-        X_train=nn_data["x_train_bal"],
-        y_train=nn_data["y_train_bal"],
+    results = train_models(
+        raw_df,
+        tree_params=search["tree"]["chosen"]["params"],
+        nn_params=search["nn"]["chosen"]["params"],
     )
+    results["search"] = search
+    return results
+
+
+def train_models_incremental(
+    csv_path: Optional[str] = None, chunk_size: int = 50000, epochs: int = 5
+) -> Dict[str, Any]:
+    load_dotenv()
+
+    # Streams the data once per pass instead of materializing the whole table.
+    if csv_path:
+        chunk_source = lambda: iter_csv_sleep_data_chunks(csv_path, chunk_size)
+    else:
+        database = build_database()
+        chunk_source = lambda: iter_sql_sleep_data_chunks(database, chunk_size)
 
-    return {
-        "tree_model": tree_model,
-        "tree_encoders": tree_encoders,
-        "nn_model": nn_model,
-        "nn_scaler": nn_data["scaler"],
-        "nn_target_encoder": nn_data["target_encoder"],
-        "nn_dummy_columns": dummy_columns,
-    }
+    return train_incremental(chunk_source, epochs=epochs)
 
 
 if __name__ == "__main__":
-    results = train_models()
-    save_models(results)
+    parser = argparse.ArgumentParser(description="Train and publish the models.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--search",
+        action="store_true",
+        help="Grid-search both model families and train the chosen configs",
+    )
+    mode.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Out-of-core training for tables that do not fit in memory",
+    )
+    parser.add_argument(
+        "--csv", default=None, help="Stream this dataset CSV instead of sleep_data"
+    )
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--search-jobs", type=int, default=-1)
+    parser.add_argument(
+        "--f1-tolerance",
+        type=float,
+        default=0.005,
+        help="Pick the fastest config within this macro-F1 of the best",
+    )
+    args = parser.parse_args()
+
+    if args.search:
+        results = search_and_train(args.search_jobs, args.f1_tolerance)
+    elif args.incremental:
+        results = train_models_incremental(args.csv, args.chunk_size, args.epochs)
+    else:
+        results = train_models()
+
+    print(format_timing_report(results["timings"]))
+
+    extra = {"training_seconds": results["timings"]["total_seconds"]}
+
+    if args.incremental:
+        extra["training_mode"] = "incremental"
+        extra["training_rows"] = results["timings"]["rows"]
+
+    if "search" in results:
+        extra["hyperparameters"] = {
+            branch: result["chosen"]["params"]
+            for branch, result in results["search"].items()
+        }
+        extra["hyperparameter_search"] = {
+            branch: {"chosen": result["chosen"], "frontier": result["frontier"]}
+            for branch, result in results["search"].items()
+        }
+
+    version = ModelRegistry().publish(results, metrics=results["metrics"], extra=extra)
     print("Models trained successfully!")
-    print(results.keys())
+    print(f"Published model version {version}: {results['metrics']}")
@@ -0,0 +1,51 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules import each other from the repository root (`from predict...`).
+sys.path.insert(0, ROOT)
+
+DATASET_CSV = os.path.join(
+    ROOT, "data", "raw", "Sleep_health_and_lifestyle_dataset_ORIGINAL.csv"
+)
+
+
+@pytest.fixture(scope="session")
+def models_root(tmp_path_factory):
+    from data.fetch_data import concat_chunks, iter_csv_sleep_data_chunks
+    from models.registry import ModelRegistry
+    from training.orchestrator import run_training_pipeline
+
+    # Small models trained on the bundled dataset and published like
+    # scripts.train_models does, so tests need no database or artifacts.
+    raw_df = concat_chunks(list(iter_csv_sleep_data_chunks(DATASET_CSV)))
+    results = run_training_pipeline(
+        raw_df, parallel=False, nn_params={"hidden_layer_sizes": (32, 32)}
+    )
+
+    root = str(tmp_path_factory.mktemp("models"))
+    ModelRegistry(root).publish(results, metrics=results["metrics"])
+    return root
+
+
+@pytest.fixture(scope="session")
+def models(models_root):
+    from models.load_models import load_models
+    from models.registry import ModelRegistry
+
+    return load_models(ModelRegistry(models_root).current_path())
+
+
+@pytest.fixture(scope="session")
+def dataset_records():
+    from preprocessing.base_preprocessing import base_preprocessing
+
+    # Model inputs as /predict builds them: plain Python values, one per row.
+    df = pd.read_csv(DATASET_CSV)
+    df.columns = [c.strip().lower().replace(" ", "_") for c in df.columns]
+    df = base_preprocessing(df).drop(columns=["sleep_disorder"])
+    return df.to_dict("records")
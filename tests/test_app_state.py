@@ -0,0 +1,41 @@
+import gc
+
+import pytest
+
+from app_state import AppState, LazyResource
+
+
+@pytest.fixture
+def frozen_gc():
+    yield
+    gc.unfreeze()
+    gc.enable()
+
+
+def _state(model_factory):
+    state = AppState()
+    state.model_manager = LazyResource("models", model_factory)
+    state.llm_client = LazyResource("llm_client", object)
+    return state
+
+
+def test_prefork_reenables_gc_in_the_master(frozen_gc):
+    gc_enabled = []
+    state = _state(lambda: gc_enabled.append(gc.isenabled()))
+
+    state.prefork()
+
+    # Off while the models load, back on once they are frozen.
+    assert gc_enabled == [False]
+    assert gc.isenabled()
+    assert gc.get_freeze_count() > 0
+
+
+def test_prefork_reenables_gc_when_loading_fails(frozen_gc):
+    def fail():
+        raise RuntimeError("no models published")
+
+    with pytest.raises(RuntimeError):
+        _state(fail).prefork()
+
+    assert gc.isenabled()
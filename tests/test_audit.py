@@ -0,0 +1,48 @@
+import json
+import multiprocessing
+import os
+
+from monitoring.audit import JSONLAuditSink, build_audit_log
+
+
+def _write(path, worker, batches):
+    sink = JSONLAuditSink(path, max_bytes=4000, backup_count=1000)
+    for batch in range(batches):
+        sink.write_batch(
+            [{"worker": worker, "batch": batch, "row": row} for row in range(5)]
+        )
+
+
+def test_concurrent_rotation_keeps_every_record(tmp_path):
+    # Pre-forked workers rotating the same file at the same time.
+    path = str(tmp_path / "predictions.jsonl")
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(target=_write, args=(path, worker, 40)) for worker in range(4)
+    ]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(30)
+        assert process.exitcode == 0
+
+    records = []
+    for name in os.listdir(tmp_path):
+        if name.startswith("predictions.jsonl") and not name.endswith(".lock"):
+            with open(tmp_path / name, encoding="utf-8") as f:
+                records.extend(json.loads(line) for line in f)
+
+    assert len(records) == 4 * 40 * 5
+    assert len({(r["worker"], r["batch"], r["row"]) for r in records}) == len(records)
+
+
+def test_jsonl_is_the_default(monkeypatch, tmp_path):
+    monkeypatch.delenv("AUDIT_LOG", raising=False)
+    monkeypatch.setenv("AUDIT_LOG_PATH", str(tmp_path / "audit.jsonl"))
+    monkeypatch.setattr("monitoring.audit.load_dotenv", lambda: None)
+
+    audit_log = build_audit_log()
+    try:
+        assert isinstance(audit_log.sink, JSONLAuditSink)
+    finally:
+        audit_log.stop()
@@ -0,0 +1,167 @@
+import asyncio
+import os
+
+import httpx
+import pytest
+
+# Importing the apps must not start loading models from ./models.
+os.environ.setdefault("EAGER_INIT", "0")
+
+import asgi  # noqa: E402
+import main  # noqa: E402
+from app_state import AppState, LazyResource  # noqa: E402
+
+STRUCTURED = (
+    "Age: 45, Gender: male, Occupation: Doctor, Sleep Duration: 7, Quality of "
+    "Sleep: 8, Physical Activity Level: 60, Stress Level: 4, BMI Category: normal, "
+    "BP 120/80, Heart Rate: 70, Daily Steps: 8000"
+)
+
+
+class RecordingAuditLog:
+    def __init__(self):
+        self.records = []
+
+    def record(self, entry):
+        self.records.append(entry)
+        return True
+
+    def stats(self):
+        return {"recorded": len(self.records)}
+
+    def stop(self):
+        pass
+
+
+def _state(models_root, audit_log, broken_models=False):
+    app_state = AppState(models_root)
+    app_state.audit_log = LazyResource("audit_log", lambda: audit_log)
+    app_state.audit_log.get()
+
+    if broken_models:
+
+        def fail():
+            raise RuntimeError("no models published")
+
+        app_state.model_manager = LazyResource("models", fail)
+
+    return app_state
+
+
+def _post(framework, app_state, path, payload):
+    if framework == "flask":
+        client = main.create_app(app_state).test_client()
+        response = client.post(path, json=payload)
+        return response.status_code, response.get_json()
+
+    async def send():
+        transport = httpx.ASGITransport(app=asgi.create_app(app_state))
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            return await c.post(path, json=payload)
+
+    response = asyncio.run(send())
+    return response.status_code, response.json()
+
+
+RECORDS = [
+    {
+        "Gender": "Male",
+        "Age": 45,
+        "Occupation": "Doctor",
+        "Sleep Duration": 7.0,
+        "Quality of Sleep": 8,
+        "Physical Activity Level": 60,
+        "Stress Level": 4,
+        "BMI Category": "Normal",
+        "Blood Pressure": "120/80",
+        "Heart Rate": 70,
+        "Daily Steps": 8000,
+    },
+    {"Age": 30},
+]
+
+
+@pytest.mark.parametrize("framework", ["flask", "asgi"])
+def test_failed_predict_is_audited(framework, models_root):
+    audit_log = RecordingAuditLog()
+    app_state = _state(models_root, audit_log, broken_models=True)
+
+    status_code, _ = _post(framework, app_state, "/predict", {"text": STRUCTURED})
+
+    assert status_code == 500
+    assert [r["status"] for r in audit_log.records] == ["error"]
+    assert audit_log.records[0]["latency_ms"] is not None
+
+
+@pytest.mark.parametrize("framework", ["flask", "asgi"])
+def test_batch_rows_are_audited(framework, models_root):
+    audit_log = RecordingAuditLog()
+    app_state = _state(models_root, audit_log)
+
+    status_code, body = _post(
+        framework, app_state, "/predict/batch", {"records": RECORDS}
+    )
+
+    assert status_code == 200
+    assert [r["status"] for r in audit_log.records] == ["success", "incomplete"]
+    assert (
+        audit_log.records[0]["class_name"]
+        == body["results"][0]["prediction"]["class_name"]
+    )
+    assert audit_log.records[1]["extracted"] == {"Age": 30}
+
+
+@pytest.mark.parametrize("framework", ["flask", "asgi"])
+def test_failed_batch_is_audited(framework, models_root):
+    audit_log = RecordingAuditLog()
+    app_state = _state(models_root, audit_log, broken_models=True)
+
+    status_code, _ = _post(framework, app_state, "/predict/batch", {"records": RECORDS})
+
+    assert status_code == 500
+    assert [r["status"] for r in audit_log.records] == ["error"]
+
+
+@pytest.mark.parametrize("framework", ["flask", "asgi"])
+@pytest.mark.parametrize("payload", [["text"], "text", 3])
+@pytest.mark.parametrize("path", ["/predict", "/predict/batch"])
+def test_non_object_body_is_rejected(framework, payload, path, models_root):
+    app_state = _state(models_root, RecordingAuditLog())
+
+    status_code, body = _post(framework, app_state, path, payload)
+
+    assert status_code == 400
+    assert "error" in body
+
+
+def test_app_shutdown_leaves_other_apps_serving(models_root):
+    first = asgi.create_app(_state(models_root, RecordingAuditLog()))
+    second = asgi.create_app(_state(models_root, RecordingAuditLog()))
+
+    async def run():
+        async with first.router.lifespan_context(first):
+            pass
+
+        async with second.router.lifespan_context(second):
+            transport = httpx.ASGITransport(app=second)
+            async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+                return await c.post("/predict/batch", json={"records": RECORDS})
+
+    assert asyncio.run(run()).status_code == 200
+    assert first.state.executor is not second.state.executor
+
+
+@pytest.mark.parametrize("framework", ["flask", "asgi"])
+def test_unknown_category_fails_only_its_row(framework, models_root):
+    audit_log = RecordingAuditLog()
+    app_state = _state(models_root, audit_log)
+    records = [RECORDS[0], {**RECORDS[0], "Occupation": "Astronaut"}]
+
+    status_code, body = _post(
+        framework, app_state, "/predict/batch", {"records": records}
+    )
+
+    assert status_code == 200
+    assert [r["status"] for r in body["results"]] == ["success", "error"]
+    assert "Astronaut" in body["results"][1]["message"]
+    assert [r["status"] for r in audit_log.records] == ["success", "error"]
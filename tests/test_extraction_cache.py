@@ -0,0 +1,163 @@
+import asyncio
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+
+import pytest
+
+import ai_module.extraction_cache as extraction_cache_module
+from ai_module.extraction_cache import (
+    ExtractionCache,
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "cache.sqlite")
+
+
+def _accessed_at(path, key):
+    with sqlite3.connect(path) as connection:
+        return connection.execute(
+            "SELECT accessed_at FROM extraction_cache WHERE key = ?", (key,)
+        ).fetchone()[0]
+
+
+def test_accessed_at_is_indexed(db_path):
+    SQLiteCacheBackend(db_path)
+
+    with sqlite3.connect(db_path) as connection:
+        plan = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT key FROM extraction_cache "
+            "ORDER BY accessed_at LIMIT 10"
+        ).fetchall()
+
+    assert "extraction_cache_accessed_at" in str(plan)
+
+
+def test_hits_do_not_write_until_the_batch_is_due(db_path):
+    backend = SQLiteCacheBackend(db_path, touch_batch_size=3, touch_interval=3600)
+    for key in "abc":
+        backend.set(key, key)
+    stored = _accessed_at(db_path, "a")
+
+    assert backend.get("a") == "a"
+    assert backend.get("b") == "b"
+    assert _accessed_at(db_path, "a") == stored
+
+    backend.get("c")
+    assert _accessed_at(db_path, "a") > stored
+
+
+def test_evicts_least_recently_used_past_high_water_mark(db_path, monkeypatch):
+    clock = iter(range(1, 1000))
+    monkeypatch.setattr(extraction_cache_module.time, "time", lambda: next(clock))
+
+    backend = SQLiteCacheBackend(db_path, max_size=20, touch_interval=3600)
+    assert (backend.high_water, backend.evict_check_interval) == (22, 2)
+
+    for i in range(20):
+        backend.set(f"k{i}", str(i))
+    # k0 is hit, but its access time is still pending when eviction runs.
+    assert backend.get("k0") == "0"
+
+    for i in range(20, 23):
+        backend.set(f"k{i}", str(i))
+    assert len(backend) == 23
+
+    backend.set("k23", "23")
+
+    assert len(backend) == 20
+    assert backend.get("k0") == "0"
+    for i in range(1, 5):
+        assert backend.get(f"k{i}") is None
+    assert backend.get("k5") == "5"
+
+
+def test_expired_entries_are_dropped(db_path):
+    backend = SQLiteCacheBackend(db_path, ttl=1e-9)
+    backend.set("a", "a")
+
+    assert backend.get("a") is None
+    assert len(backend) == 0
+
+
+def test_async_path_runs_sqlite_on_a_thread(db_path):
+    backend = SQLiteCacheBackend(db_path)
+    cache = ExtractionCache(backend)
+    threads = []
+    get = backend.get
+
+    def recording_get(key):
+        threads.append(threading.current_thread())
+        return get(key)
+
+    backend.get = recording_get
+
+    async def roundtrip():
+        await cache.set_async("k", {"extracted": {"Age": 40}})
+        return await cache.get_async("k")
+
+    assert asyncio.run(roundtrip()) == {"extracted": {"Age": 40}}
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_memory_backend_stays_on_the_event_loop():
+    cache = ExtractionCache(MemoryCacheBackend())
+    threads = []
+    get = cache.backend.get
+
+    def recording_get(key):
+        threads.append(threading.current_thread())
+        return get(key)
+
+    cache.backend.get = recording_get
+
+    async def roundtrip():
+        await cache.set_async("k", {"extracted": {}})
+        return await cache.get_async("k")
+
+    assert asyncio.run(roundtrip()) == {"extracted": {}}
+    assert threads == [threading.main_thread()]
+
+
+def test_sqlite_cache_is_not_opened_at_import(tmp_path, monkeypatch):
+    path = tmp_path / "cache" / "extraction.sqlite"
+    env = {
+        **os.environ,
+        "EAGER_INIT": "0",
+        "EXTRACTION_CACHE": "sqlite",
+        "EXTRACTION_CACHE_PATH": str(path),
+    }
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run(
+        [sys.executable, "-c", "import asgi, main"], cwd=root, env=env, check=True
+    )
+
+    assert not path.parent.exists()
+
+    monkeypatch.setattr(extraction_cache_module, "_extraction_cache", None)
+    monkeypatch.setenv("EXTRACTION_CACHE", "sqlite")
+    monkeypatch.setenv("EXTRACTION_CACHE_PATH", str(path))
+    cache = extraction_cache_module.get_extraction_cache()
+
+    assert cache.backend.name == "sqlite"
+    assert path.exists()
+    assert extraction_cache_module.get_extraction_cache() is cache
+
+
+def test_memory_backend_len_takes_the_lock():
+    backend = MemoryCacheBackend()
+    backend.set("key", "value")
+
+    with backend._lock:
+        thread = threading.Thread(target=len, args=(backend,))
+        thread.start()
+        thread.join(timeout=0.2)
+        assert thread.is_alive()
+
+    thread.join()
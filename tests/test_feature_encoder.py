@@ -0,0 +1,101 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from predict.predict_nn import predict_nn, predict_nn_batch
+from predict.predict_tree import predict_tree, predict_tree_batch
+
+FEATURE_NAMES_WARNING = "X does not have valid feature names"
+
+
+def _reference_tree_frame(records, models):
+    # The pandas path predict_tree_batch takes without a FeatureEncoder.
+    df = pd.DataFrame(records)
+    for col, encoder in models["tree_encoders"].items():
+        df[col] = encoder.transform(df[col])
+    return df[list(models["tree_model"].feature_names_in_)]
+
+
+def _reference_nn_row(record, models):
+    # The pandas path predict_nn takes without a FeatureEncoder.
+    df = pd.get_dummies(pd.DataFrame([record]), drop_first=True)
+    df = df.reindex(columns=models["nn_dummy_columns"], fill_value=0)
+    return models["nn_scaler"].transform(df)[0]
+
+
+def _tree_kwargs(models, encoded: bool):
+    return {
+        "model": models["tree_model"],
+        "encoders": models["tree_encoders"],
+        "feature_encoder": models["feature_encoder"] if encoded else None,
+    }
+
+
+def _nn_kwargs(models, encoded: bool):
+    return {
+        "model": models["nn_model"],
+        "scaler": models["nn_scaler"],
+        "target_encoder": models["nn_target_encoder"],
+        "dummy_columns": models["nn_dummy_columns"],
+        "feature_encoder": models["feature_encoder"] if encoded else None,
+    }
+
+
+def test_tree_matrix_matches_pandas_encoding(models, dataset_records):
+    expected = _reference_tree_frame(dataset_records, models).to_numpy(np.float64)
+    actual = models["feature_encoder"].tree_matrix(dataset_records)
+
+    np.testing.assert_array_equal(actual, expected)
+
+
+def test_nn_matrix_matches_pandas_encoding(models, dataset_records):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        expected = np.array(
+            [_reference_nn_row(record, models) for record in dataset_records]
+        )
+    actual = models["feature_encoder"].nn_matrix(dataset_records)
+
+    np.testing.assert_array_equal(actual, expected)
+
+
+def test_batch_predictions_match_pandas_path(models, dataset_records):
+    assert predict_tree_batch(
+        dataset_records, **_tree_kwargs(models, True)
+    ) == predict_tree_batch(dataset_records, **_tree_kwargs(models, False))
+    assert predict_tree_batch(
+        dataset_records,
+        **_tree_kwargs(models, True),
+        compiled_tree=models["compiled_tree"],
+    ) == predict_tree_batch(dataset_records, **_tree_kwargs(models, False))
+    assert predict_nn_batch(
+        dataset_records, **_nn_kwargs(models, True)
+    ) == predict_nn_batch(dataset_records, **_nn_kwargs(models, False))
+
+
+@pytest.mark.parametrize("row", range(0, 373, 37))
+def test_single_predictions_match_pandas_path(models, dataset_records, row):
+    record = dataset_records[row]
+
+    assert predict_tree(record, **_tree_kwargs(models, True)) == predict_tree(
+        record, **_tree_kwargs(models, False)
+    )
+    assert predict_nn(record, **_nn_kwargs(models, True)) == predict_nn(
+        record, **_nn_kwargs(models, False)
+    )
+
+
+def test_feature_name_warning_is_only_silenced_for_the_tree_call(
+    models, dataset_records
+):
+    X = models["feature_encoder"].tree_matrix(dataset_records[:1])
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        predict_tree_batch(dataset_records[:1], **_tree_kwargs(models, True))
+        models["tree_model"].predict_proba(X)
+
+    messages = [str(warning.message) for warning in caught]
+    assert sum(FEATURE_NAMES_WARNING in message for message in messages) == 1
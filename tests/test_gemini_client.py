@@ -0,0 +1,12 @@
+from ai_module import gemini_client
+
+
+def test_http_requests_time_out(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(gemini_client, "_client", None)
+
+    client = gemini_client.get_client()
+
+    # Abandoned sync calls must end on their own rather than hold a pool thread.
+    options = client._api_client._http_options
+    assert options["timeout"] == gemini_client.GEMINI_HTTP_TIMEOUT
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+
+import pytest
+
+from predict.micro_batcher import BatcherTimeout, MicroBatcher
+
+
+class BlockingPredictor:
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, inputs):
+        self.started.set()
+        self.release.wait(5)
+
+        if any(model_input.get("bad") for model_input in inputs):
+            raise ValueError("bad row")
+
+        return [{"value": model_input["value"]} for model_input in inputs]
+
+
+@pytest.fixture
+def predictor():
+    return BlockingPredictor()
+
+
+@pytest.fixture
+def batcher(predictor):
+    batcher = MicroBatcher(predictor, max_batch_size=1, max_wait_ms=0)
+    yield batcher
+    predictor.release.set()
+    batcher.stop()
+
+
+def test_cancelled_future_is_skipped_and_batcher_keeps_serving(batcher, predictor):
+    first = batcher.submit({"value": 1})
+    assert predictor.started.wait(5)
+
+    cancelled = batcher.submit({"value": 2})
+    kept = batcher.submit({"value": 3})
+    assert cancelled.cancel()
+
+    predictor.release.set()
+
+    assert first.result(timeout=5) == {"value": 1}
+    assert kept.result(timeout=5) == {"value": 3}
+    assert batcher.predict({"value": 4}, timeout=5) == {"value": 4}
+    assert batcher.stats()["requests"] == 3
+
+
+def test_asyncio_timeout_on_queued_request(batcher, predictor):
+    async def timed_out_request():
+        future = asyncio.wrap_future(batcher.submit({"value": 2}))
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(future, 0.05)
+
+    first = batcher.submit({"value": 1})
+    assert predictor.started.wait(5)
+
+    asyncio.run(timed_out_request())
+    predictor.release.set()
+
+    assert first.result(timeout=5) == {"value": 1}
+    assert batcher.predict({"value": 3}, timeout=5) == {"value": 3}
+
+
+def test_failing_batch_falls_back_to_single_rows(predictor):
+    predictor.release.set()
+    batcher = MicroBatcher(predictor, max_batch_size=8, max_wait_ms=50)
+
+    try:
+        good = batcher.submit({"value": 1})
+        bad = batcher.submit({"value": 2, "bad": True})
+
+        assert good.result(timeout=5) == {"value": 1}
+        with pytest.raises(ValueError):
+            bad.result(timeout=5)
+    finally:
+        batcher.stop()
+
+
+def test_predict_times_out_and_drops_the_queued_request(batcher, predictor):
+    batcher.submit({"value": 1})
+    assert predictor.started.wait(5)
+
+    with pytest.raises(BatcherTimeout):
+        batcher.predict({"value": 2}, timeout=0.05)
+
+    predictor.release.set()
+    assert batcher.predict({"value": 3}, timeout=5) == {"value": 3}
+    assert batcher.stats()["requests"] == 2
+
+
+def test_stop_fails_queued_requests_even_with_a_full_queue(predictor):
+    batcher = MicroBatcher(predictor, max_batch_size=1, max_wait_ms=0, max_queue_size=2)
+    running = batcher.submit({"value": 1})
+    assert predictor.started.wait(5)
+    queued = [batcher.submit({"value": 2}), batcher.submit({"value": 3})]
+
+    stopper = threading.Thread(target=batcher.stop)
+    stopper.start()
+    predictor.release.set()
+    stopper.join(5)
+
+    assert not stopper.is_alive()
+    assert running.result(timeout=5) == {"value": 1}
+    for future in queued:
+        with pytest.raises(RuntimeError, match="batcher stopped"):
+            future.result(timeout=5)
+    with pytest.raises(RuntimeError, match="batcher stopped"):
+        batcher.submit({"value": 4})
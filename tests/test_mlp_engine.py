@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from sklearn.neural_network import MLPClassifier
+
+from predict import mlp_engine
+from predict.mlp_engine import (
+    ENGINE_DTYPE,
+    MLPEngine,
+    export_mlp_engine,
+    load_mlp_engine,
+    quantize_int8,
+)
+
+
+@pytest.fixture(scope="module")
+def mlp():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 8))
+    y = (X[:, 0] + X[:, 1] > 0).astype(int) + (X[:, 2] > 1)
+    model = MLPClassifier(hidden_layer_sizes=(16, 16), max_iter=1000, random_state=0)
+    return model.fit(X, y), X
+
+
+def test_float32_engine_matches_sklearn(mlp):
+    model, X = mlp
+    engine = MLPEngine.from_model(model)
+
+    np.testing.assert_allclose(
+        engine.predict_proba(X), model.predict_proba(X), atol=1e-5
+    )
+
+
+def test_int8_engine_keeps_only_the_shared_int8_weights(mlp, tmp_path):
+    model, X = mlp
+    export_mlp_engine(model, str(tmp_path), quantize=True)
+    engine = load_mlp_engine(str(tmp_path))
+
+    assert engine.quantized
+    assert all(isinstance(coef, np.memmap) for coef in engine.coefs)
+    assert all(coef.dtype == np.int8 for coef in engine.coefs)
+
+    # No private float32 copy of the weights is held per worker.
+    held = [
+        array
+        for value in vars(engine).values()
+        if isinstance(value, list)
+        for array in value
+        if isinstance(array, np.ndarray) and not isinstance(array, np.memmap)
+    ]
+    assert held == []
+
+    proba = engine.predict_proba(X)
+    np.testing.assert_allclose(proba, model.predict_proba(X), atol=0.05)
+    assert (proba.argmax(axis=1) == model.predict(X)).mean() > 0.95
+
+
+def test_int8_matmul_matches_dequantized_weights(monkeypatch):
+    rng = np.random.default_rng(1)
+    coef, scale = quantize_int8(rng.normal(size=(20, 50)))
+    X = rng.normal(size=(7, 20)).astype(ENGINE_DTYPE)
+
+    # Blocks that do not divide the column count evenly.
+    monkeypatch.setattr(mlp_engine, "INT8_BLOCK_COLUMNS", 16)
+
+    np.testing.assert_allclose(
+        mlp_engine._int8_matmul(X, coef, scale),
+        X @ (coef.astype(ENGINE_DTYPE) * scale),
+        rtol=1e-5,
+        atol=1e-5,
+    )
@@ -0,0 +1,37 @@
+import os
+import shutil
+
+import pytest
+
+from models.model_manager import ModelManager
+from models.registry import ModelRegistry
+
+
+@pytest.fixture
+def registry(models_root, tmp_path):
+    root = str(tmp_path / "models")
+    shutil.copytree(models_root, root)
+    return ModelRegistry(root)
+
+
+def test_broken_version_is_not_activated(registry):
+    manager = ModelManager(registry)
+    active = registry.current_version()
+
+    # A published version whose artifacts are missing.
+    broken = registry.version_path("99990101T000000Z")
+    shutil.copytree(registry.current_path(), broken)
+    os.remove(os.path.join(broken, "tree", "model.joblib"))
+
+    with pytest.raises(Exception):
+        manager.reload("99990101T000000Z")
+
+    assert registry.current_version() == active
+    assert manager.version == active
+
+
+def test_unknown_version_is_rejected_before_loading(registry):
+    manager = ModelManager(registry)
+
+    with pytest.raises(KeyError):
+        manager.reload("missing")
@@ -0,0 +1,38 @@
+import pytest
+
+import predict.pipeline as pipeline
+from predict.prediction_cache import PredictionCache
+
+
+def test_key_ignores_field_order_and_number_type():
+    cache = PredictionCache()
+
+    assert cache.key({"age": 35, "gender": "Male"}, "v1") == cache.key(
+        {"gender": "Male", "age": 35.0}, "v1"
+    )
+    assert cache.key({"age": 35}, "v1") != cache.key({"age": 35}, "v2")
+
+
+def test_key_keeps_exact_strings_and_bools():
+    cache = PredictionCache()
+
+    assert cache.key({"occupation": "Doctor"}, "v1") != cache.key(
+        {"occupation": "Doctor "}, "v1"
+    )
+    assert cache.key({"flag": True}, "v1") != cache.key({"flag": 1}, "v1")
+
+
+def test_cache_does_not_answer_input_the_encoder_rejects(
+    monkeypatch, models, dataset_records
+):
+    monkeypatch.setattr(pipeline, "prediction_cache", PredictionCache(16))
+    record = dict(dataset_records[0])
+
+    pipeline.run_prediction(record, models)
+    padded = {**record, "occupation": record["occupation"] + " "}
+
+    # Same outcome as with the cache off.
+    with pytest.raises(Exception):
+        pipeline.run_prediction(padded, models, use_cache=False)
+    with pytest.raises(Exception):
+        pipeline.run_prediction(padded, models)
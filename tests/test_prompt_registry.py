@@ -0,0 +1,29 @@
+import os
+import shutil
+
+from ai_module.prompt_registry import PROMPT_DIR, PromptRegistry
+
+
+def _registry(tmp_path, check_interval):
+    shutil.copy(os.path.join(PROMPT_DIR, "extract_sleep.yaml"), tmp_path)
+    return PromptRegistry(str(tmp_path), check_interval=check_interval)
+
+
+def test_names_are_not_listed_on_every_call(tmp_path, monkeypatch):
+    registry = _registry(tmp_path, check_interval=60)
+    calls = []
+    listdir = os.listdir
+    monkeypatch.setattr(os, "listdir", lambda path: calls.append(path) or listdir(path))
+
+    for _ in range(100):
+        assert registry.names() == ["extract_sleep"]
+
+    assert calls == []
+
+
+def test_new_prompt_appears_after_check_interval(tmp_path):
+    registry = _registry(tmp_path, check_interval=0)
+    shutil.copy(tmp_path / "extract_sleep.yaml", tmp_path / "extract_sleep_v2.yaml")
+
+    assert registry.names() == ["extract_sleep", "extract_sleep_v2"]
+    assert registry.get("extract_sleep_v2").name == "extract_sleep_v2"
@@ -0,0 +1,233 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from ai_module.resilient_client import (
+    CircuitBreaker,
+    CircuitOpen,
+    LLMUnavailable,
+    ResilientLLMClient,
+    TokenBucket,
+    is_transient,
+)
+
+
+class StubAPIError(Exception):
+    # Shaped like google.genai.errors.APIError.
+    def __init__(self, code: int):
+        super().__init__(f"{code} error")
+        self.code = code
+
+
+class StubLLM:
+    # Plays one scripted outcome per call: an exception to raise, a number of
+    # seconds to stall before answering, or None to answer right away.
+    def __init__(self, *script):
+        self.script = list(script)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _next(self):
+        with self._lock:
+            self.calls += 1
+            return self.script.pop(0) if self.script else None
+
+    def __call__(self, prompt: str) -> str:
+        outcome = self._next()
+        if isinstance(outcome, Exception):
+            raise outcome
+        if outcome:
+            time.sleep(outcome)
+        return f"answer to {prompt}"
+
+    async def call_async(self, prompt: str) -> str:
+        outcome = self._next()
+        if isinstance(outcome, Exception):
+            raise outcome
+        if outcome:
+            await asyncio.sleep(outcome)
+        return f"answer to {prompt}"
+
+
+def _client(llm: StubLLM, **kwargs) -> ResilientLLMClient:
+    options = {"deadline": 2.0, "backoff": 0.0, "hedge": False}
+    options.update(kwargs)
+    return ResilientLLMClient(llm, llm.call_async, **options)
+
+
+def _warm_latency(client: ResilientLLMClient, seconds: float = 0.01) -> None:
+    for _ in range(client.hedge_min_samples):
+        client.latency.add(seconds)
+
+
+@pytest.mark.parametrize(
+    "error, transient",
+    [
+        (StubAPIError(500), True),
+        (StubAPIError(503), True),
+        (StubAPIError(429), True),
+        (StubAPIError(400), False),
+        (StubAPIError(401), False),
+        (StubAPIError(403), False),
+        (TimeoutError(), True),
+        (ConnectionResetError(), True),
+        (ValueError("bad prompt"), False),
+    ],
+)
+def test_is_transient(error, transient):
+    assert is_transient(error) is transient
+
+
+def test_retries_transient_errors():
+    llm = StubLLM(StubAPIError(503), StubAPIError(429))
+    client = _client(llm, max_retries=2)
+
+    assert client.generate("q") == "answer to q"
+    assert llm.calls == 3
+    assert client.stats()["retries"] == 2
+    assert client.breaker.failures == 0
+
+
+@pytest.mark.parametrize("code", [400, 401, 403, 404])
+def test_client_errors_are_not_retried_nor_trip_the_breaker(code):
+    llm = StubLLM(*[StubAPIError(code)] * 5)
+    client = _client(llm, max_retries=2, breaker=CircuitBreaker(failure_threshold=1))
+
+    with pytest.raises(LLMUnavailable):
+        client.generate("q")
+
+    assert llm.calls == 1
+    assert client.breaker.state == CircuitBreaker.CLOSED
+    assert client.breaker.failures == 0
+
+
+def test_breaker_opens_then_probes_once():
+    llm = StubLLM(StubAPIError(500), StubAPIError(500))
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.1)
+    client = _client(llm, max_retries=0, breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(LLMUnavailable):
+            client.generate("q")
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpen):
+        client.generate("q")
+    assert llm.calls == 2
+
+    time.sleep(0.15)
+    assert client.generate("q") == "answer to q"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_client_error_during_half_open_probe_frees_the_probe():
+    llm = StubLLM(StubAPIError(500), StubAPIError(400))
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    client = _client(llm, max_retries=0, breaker=breaker)
+
+    with pytest.raises(LLMUnavailable):
+        client.generate("q")
+    time.sleep(0.1)
+    with pytest.raises(LLMUnavailable):
+        client.generate("q")
+
+    # Not stuck with a probe "in flight": the next call is let through.
+    assert client.generate("q") == "answer to q"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_cancelled_half_open_probe_frees_the_probe():
+    llm = StubLLM(StubAPIError(500), 5.0)
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    client = _client(llm, max_retries=0, breaker=breaker)
+
+    async def scenario():
+        with pytest.raises(LLMUnavailable):
+            await client.generate_async("q")
+        await asyncio.sleep(0.1)
+
+        # The probe stalls and its caller goes away, as on a client disconnect.
+        probe = asyncio.ensure_future(client.generate_async("q"))
+        await asyncio.sleep(0.05)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        return await client.generate_async("q")
+
+    assert asyncio.run(scenario()) == "answer to q"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_hedge_wins_over_slow_primary():
+    llm = StubLLM(1.0)
+    client = _client(llm, hedge=True, hedge_min_samples=5, hedge_min_delay=0.01)
+    _warm_latency(client)
+
+    start = time.monotonic()
+    assert client.generate("q") == "answer to q"
+
+    assert time.monotonic() - start < 0.5
+    assert client.stats()["hedges"] == 1
+    assert client.stats()["hedge_wins"] == 1
+
+
+def test_hedge_needs_a_rate_limit_token():
+    llm = StubLLM(0.2)
+    client = _client(
+        llm,
+        hedge=True,
+        hedge_min_samples=5,
+        hedge_min_delay=0.01,
+        rate_limiter=TokenBucket(rate=0.1, capacity=1),
+    )
+    _warm_latency(client)
+
+    assert client.generate("q") == "answer to q"
+    assert llm.calls == 1
+    assert client.stats()["hedges"] == 0
+
+
+def test_no_hedge_while_half_open():
+    llm = StubLLM(StubAPIError(500), 0.2)
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    client = _client(
+        llm, max_retries=0, breaker=breaker, hedge=True, hedge_min_samples=5
+    )
+    client.hedge_min_delay = 0.01
+
+    with pytest.raises(LLMUnavailable):
+        client.generate("q")
+    _warm_latency(client)
+    time.sleep(0.1)
+
+    assert client.generate("q") == "answer to q"
+    assert llm.calls == 2
+    assert client.stats()["hedges"] == 0
+
+
+def test_async_retries_and_hedges():
+    llm = StubLLM(StubAPIError(503), 1.0)
+    client = _client(llm, max_retries=1, hedge=True, hedge_min_samples=5)
+    client.hedge_min_delay = 0.01
+    _warm_latency(client)
+
+    start = time.monotonic()
+    assert asyncio.run(client.generate_async("q")) == "answer to q"
+
+    assert time.monotonic() - start < 0.5
+    assert client.stats()["retries"] == 1
+    assert client.stats()["hedge_wins"] == 1
+
+
+def test_async_client_error_is_not_retried():
+    llm = StubLLM(StubAPIError(401), StubAPIError(401))
+    client = _client(llm, max_retries=2)
+
+    with pytest.raises(LLMUnavailable):
+        asyncio.run(client.generate_async("q"))
+
+    assert llm.calls == 1
+    assert client.breaker.failures == 0
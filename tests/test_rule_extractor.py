@@ -0,0 +1,147 @@
+import json
+
+import pytest
+
+import ai_module.selector as selector
+from ai_module.extraction_cache import ExtractionCache, MemoryCacheBackend
+from ai_module.rule_extractor import extract_with_rules
+from ai_module.validation import ALLOWED_FIELDS
+
+STRUCTURED = (
+    "Age: 45, Gender: male, Occupation: Doctor, Sleep Duration: 7, Quality of "
+    "Sleep: 8, Physical Activity Level: 60, Stress Level: 4, BMI Category: normal, "
+    "BP 120/80, Heart Rate: 70, Daily Steps: 8000"
+)
+
+
+@pytest.mark.parametrize(
+    "text, field",
+    [
+        ("I'm seeing a doctor about my insomnia", "Occupation"),
+        ("I'm a patient of a nurse practitioner", "Occupation"),
+        ("My husband is obese", "BMI Category"),
+        ("I am not overweight", "BMI Category"),
+        ("My male coworkers sleep fine", "Gender"),
+        # Other people and other times.
+        ("My 5-year-old daughter wakes me up at night", "Age"),
+        ("I worked as a nurse 10 years ago", "Occupation"),
+        ("My son sleeps 10 hours", "Sleep Duration"),
+        ("My dog does 20000 steps a day", "Daily Steps"),
+        ("Durmo mal há 10 anos", "Age"),
+        ("My wife's pressure is 140/90 mmHg", "Blood Pressure"),
+        ("His age: 50", "Age"),
+        ("My husband's steps: 8000", "Daily Steps"),
+    ],
+)
+def test_free_text_is_not_extracted(text, field):
+    assert field not in extract_with_rules(text)["extracted"]
+
+
+def test_structured_text_is_fully_extracted():
+    result = extract_with_rules(STRUCTURED)
+
+    assert result["missing_fields"] == []
+    assert result["extracted"]["Occupation"] == "Doctor"
+    assert result["extracted"]["Blood Pressure"] == "120/80"
+
+
+class StubGemini:
+    def __init__(self, extracted):
+        self.extracted = extracted
+        self.prompts = []
+
+    def __call__(self, prompt):
+        self.prompts.append(prompt)
+        return json.dumps({"extracted": self.extracted})
+
+
+def _extract(monkeypatch, text, gemini_extracted):
+    gemini = StubGemini(gemini_extracted)
+    monkeypatch.setattr(selector, "call_gemini", gemini)
+
+    ai = selector.AISelector(
+        text, cache=ExtractionCache(MemoryCacheBackend()), use_rules=True
+    )
+    return ai, ai.extract_information(), gemini
+
+
+def test_gemini_is_asked_only_for_missing_fields(monkeypatch):
+    ai, result, gemini = _extract(
+        monkeypatch,
+        "Age: 40. I'm a 40 year old man, my male coworkers say I snore.",
+        {"Gender": "Female", "Occupation": "Teacher"},
+    )
+
+    requested = gemini.prompts[0].split("already known: ")[1].split(".\n")[0]
+
+    assert ai.source == "rules+llm"
+    assert "Gender" in requested.split(", ")
+    assert "Age" not in requested.split(", ")
+    assert result["extracted"]["Gender"] == "Female"
+    assert result["extracted"]["Age"] == 40
+
+
+@pytest.mark.parametrize(
+    "text, field",
+    [
+        (
+            "My 5-year-old daughter wakes me up. I worked as a nurse 10 years ago.",
+            "Age",
+        ),
+        (
+            "My 5-year-old daughter wakes me up. I worked as a nurse 10 years ago.",
+            "Occupation",
+        ),
+        ("My son sleeps 10 hours, I don't", "Sleep Duration"),
+        ("My dog does 20000 steps a day", "Daily Steps"),
+    ],
+)
+def test_fields_gemini_left_out_stay_empty(monkeypatch, text, field):
+    # Gemini is told not to infer; nothing local fills those fields back in.
+    _, result, _ = _extract(monkeypatch, text, {field: None})
+
+    assert result["extracted"].get(field) is None
+
+
+def test_anchored_value_overrides_gemini(monkeypatch):
+    _, result, _ = _extract(
+        monkeypatch, "Age: 40, I sleep badly", {"Age": 41, "Gender": "Male"}
+    )
+
+    assert result["extracted"]["Age"] == 40
+    assert result["extracted"]["Gender"] == "Male"
+
+
+def test_free_text_only_input_asks_gemini_for_everything(monkeypatch):
+    ai, result, gemini = _extract(
+        monkeypatch,
+        "I'm a 38 year old male nurse. I sleep 6 hours and walk 8000 steps.",
+        {"Occupation": "Nurse"},
+    )
+
+    assert len(gemini.prompts) == 1
+    assert ai.source == "llm"
+    assert result["extracted"] == {"Occupation": "Nurse"}
+
+
+def test_fallback_returns_only_key_anchored_fields(monkeypatch):
+    def unavailable(prompt):
+        raise selector.LLMUnavailable("down")
+
+    monkeypatch.setattr(selector, "call_gemini", unavailable)
+    ai = selector.AISelector(
+        "Age: 40. My son sleeps 10 hours and I'm a nurse.",
+        cache=ExtractionCache(MemoryCacheBackend()),
+        use_rules=True,
+    )
+
+    assert ai.extract_information() == {"extracted": {"Age": 40}}
+    assert ai.source == "fallback"
+
+
+def test_fully_structured_input_skips_gemini(monkeypatch):
+    ai, result, gemini = _extract(monkeypatch, STRUCTURED, {})
+
+    assert ai.source == "rules"
+    assert gemini.prompts == []
+    assert result["extracted"]["Age"] == 45
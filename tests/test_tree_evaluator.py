@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from sklearn.tree import DecisionTreeClassifier
+
+from predict.tree_evaluator import CompiledTree, MAX_COMPILED_DEPTH
+
+
+def _chain_tree(n: int) -> DecisionTreeClassifier:
+    # Halving sample weights make every split peel off a single sample, so the
+    # tree is a chain about n levels deep.
+    X = np.arange(n, dtype=float).reshape(-1, 1)
+    y = np.arange(n) % 3
+    return DecisionTreeClassifier(random_state=0).fit(
+        X, y, sample_weight=2.0 ** -np.arange(n)
+    )
+
+
+@pytest.mark.parametrize("n", [20, 130])
+def test_matches_sklearn(n):
+    model = _chain_tree(n)
+    compiled = CompiledTree(model)
+    X = np.linspace(-1, n + 1, 500).reshape(-1, 1)
+    expected = model.predict_proba(X)
+
+    np.testing.assert_array_equal(compiled.predict_proba(X), expected)
+    for x, row_expected in zip(X, expected):
+        np.testing.assert_array_equal(compiled.predict_proba_row(x), row_expected)
+
+
+def test_deep_tree_is_not_compiled():
+    model = _chain_tree(130)
+    assert model.tree_.max_depth > 100
+
+    compiled = CompiledTree(model)
+
+    assert compiled.max_depth > MAX_COMPILED_DEPTH
+    assert compiled._evaluate_row == compiled._walk
@@ -0,0 +1,11 @@
+from typing import Dict
+from sklearn.metrics import accuracy_score, f1_score
+
+
+def evaluate_model(model, x_test, y_test) -> Dict[str, float]:
+    y_pred = model.predict(x_test)
+
+    return {
+        "accuracy": round(float(accuracy_score(y_test, y_pred)), 4),
+        "macro_f1": round(float(f1_score(y_test, y_pred, average="macro")), 4),
+    }
@@ -0,0 +1,225 @@
+import time
+from typing import Dict, Any, Callable, Iterable, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+from imblearn.over_sampling import SMOTE, RandomOverSampler
+from sklearn.preprocessing import LabelEncoder, MinMaxScaler
+
+from preprocessing.base_preprocessing import base_preprocessing
+from preprocessing.encode_nn import encode_nn
+
+from training.evaluate import evaluate_model
+from training.orchestrator import StageTimer
+from training.train_tree import train_decision_tree
+from training.train_nn import build_incremental_network
+
+ChunkSource = Callable[[], Iterable[pd.DataFrame]]
+
+
+class Reservoir:
+    # Uniform sample of at most `size` rows over a stream of chunks: every row
+    # gets a random key and the `size` smallest keys are kept.
+    def __init__(self, size: int, random_state: int = 42):
+        self.size = size
+        self.rng = np.random.default_rng(random_state)
+        self.sample: Optional[pd.DataFrame] = None
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        if chunk.empty:
+            return
+
+        keyed = chunk.assign(_key=self.rng.random(len(chunk)))
+        if self.sample is not None:
+            keyed = pd.concat([self.sample, keyed], ignore_index=True)
+
+        self.sample = (
+            keyed.nsmallest(self.size, "_key") if len(keyed) > self.size else keyed
+        )
+
+    def frame(self) -> pd.DataFrame:
+        if self.sample is None:
+            return pd.DataFrame()
+        return self.sample.drop(columns="_key").reset_index(drop=True)
+
+
+def test_mask(person_id: pd.Series, test_size: float) -> np.ndarray:
+    # Deterministic per-row split, stable across passes and chunk boundaries.
+    hashed = (person_id.to_numpy(dtype=np.uint64) * np.uint64(2654435761)) % np.uint64(
+        2**32
+    )
+    return hashed / 2**32 < test_size
+
+
+class IncrementalEncoders:
+    def __init__(self, categories: Dict[str, List[str]], target_col: str):
+        self.categories = categories
+        self.target_col = target_col
+
+        self.tree_encoders = {
+            col: LabelEncoder().fit(values)
+            for col, values in categories.items()
+            if col != target_col
+        }
+        self.target_encoder = LabelEncoder().fit(categories[target_col])
+        self.dummy_columns: List[str] = []
+
+    def with_categories(self, df: pd.DataFrame) -> pd.DataFrame:
+        # Fixing the category list means get_dummies(drop_first=True) emits and
+        # drops the same columns for every chunk, whatever values it contains.
+        df = df.copy()
+        for col, values in self.categories.items():
+            df[col] = pd.Categorical(df[col].astype(object), categories=values)
+        return df
+
+    def fit_dummy_columns(self, df: pd.DataFrame) -> None:
+        _, self.dummy_columns = encode_nn(self.with_categories(df), self.target_col)
+
+    def tree_xy(self, df: pd.DataFrame):
+        df = df.copy()
+        for col, encoder in self.tree_encoders.items():
+            df[col] = encoder.transform(df[col].astype(object))
+
+        return df.drop(columns=[self.target_col]), df[self.target_col].astype(object)
+
+    def nn_xy(self, df: pd.DataFrame):
+        encoded, _ = encode_nn(
+            self.with_categories(df), self.target_col, self.dummy_columns
+        )
+        X = encoded.drop(columns=[self.target_col]).to_numpy(dtype=np.float64)
+        y = self.target_encoder.transform(encoded[self.target_col].astype(object))
+        return X, y
+
+
+def balance_chunk(X: np.ndarray, y: np.ndarray, random_state: int = 42):
+    # Per-chunk stand-in for the global SMOTE of prepare_data.
+    counts = np.bincount(y)
+    counts = counts[counts > 0]
+
+    if len(counts) < 2:
+        return X, y
+
+    k_neighbors = min(5, int(counts.min()) - 1)
+    if k_neighbors >= 1:
+        sampler = SMOTE(k_neighbors=k_neighbors, random_state=random_state)
+    else:
+        sampler = RandomOverSampler(random_state=random_state)
+
+    return sampler.fit_resample(X, y)
+
+
+def _split(chunk: pd.DataFrame, test_size: float):
+    mask = test_mask(chunk["person_id"], test_size)
+    preprocessed = base_preprocessing(chunk)
+    return preprocessed[~mask], preprocessed[mask]
+
+
+def train_incremental(
+    chunk_source: ChunkSource,
+    target_col: str = "sleep_disorder",
+    test_size: float = 0.3,
+    epochs: int = 5,
+    tree_sample_size: int = 200_000,
+    test_sample_size: int = 100_000,
+    tree_params: Optional[Dict[str, Any]] = None,
+    nn_params: Optional[Dict[str, Any]] = None,
+    random_state: int = 42,
+) -> Dict[str, Any]:
+    start = time.perf_counter()
+    timer = StageTimer("stream")
+    rng = np.random.default_rng(random_state)
+
+    tree_reservoir = Reservoir(tree_sample_size, random_state)
+    test_reservoir = Reservoir(test_sample_size, random_state + 1)
+    seen: Dict[str, Set[str]] = {}
+    rows = 0
+    train_rows = 0
+
+    # Pass 1: category vocabularies (for fixed encoders) and bounded samples for
+    # the tree fit and the held-out evaluation.
+    with timer.stage("scan"):
+        for chunk in chunk_source():
+            train, test = _split(chunk, test_size)
+            rows += len(chunk)
+            train_rows += len(train)
+
+            for col in train.select_dtypes(include=["object", "category"]).columns:
+                seen.setdefault(col, set()).update(
+                    value
+                    for frame in (train, test)
+                    for value in frame[col].dropna().astype(str).unique()
+                )
+
+            tree_reservoir.add(train)
+            test_reservoir.add(test)
+
+    if train_rows == 0:
+        raise ValueError("No training rows in the data source")
+
+    encoders = IncrementalEncoders(
+        {col: sorted(values) for col, values in seen.items()}, target_col
+    )
+    tree_sample = tree_reservoir.frame()
+    test_sample = test_reservoir.frame()
+    encoders.fit_dummy_columns(tree_sample.head(1))
+
+    with timer.stage("fit_tree"):
+        x_tree, y_tree = encoders.tree_xy(tree_sample)
+        x_tree_bal, y_tree_bal = SMOTE(random_state=random_state).fit_resample(
+            x_tree, y_tree
+        )
+        tree_model = train_decision_tree(x_tree_bal, y_tree_bal, **(tree_params or {}))
+
+    # Pass 2: streaming min/max for the scaler.
+    scaler = MinMaxScaler()
+    with timer.stage("fit_scaler"):
+        for chunk in chunk_source():
+            train, _ = _split(chunk, test_size)
+            if not train.empty:
+                X, _ = encoders.nn_xy(train)
+                scaler.partial_fit(X)
+
+    # Remaining passes: MLP epochs, one partial_fit per balanced chunk.
+    nn_model = build_incremental_network(**(nn_params or {}))
+    classes = np.arange(len(encoders.target_encoder.classes_))
+
+    for epoch in range(epochs):
+        with timer.stage(f"fit_nn_epoch_{epoch + 1}"):
+            for chunk in chunk_source():
+                train, _ = _split(chunk, test_size)
+                if train.empty:
+                    continue
+
+                X, y = encoders.nn_xy(train)
+                X, y = balance_chunk(scaler.transform(X), y, random_state)
+
+                order = rng.permutation(len(y))
+                nn_model.partial_fit(X[order], y[order], classes=classes)
+
+    with timer.stage("evaluate"):
+        x_test_tree, y_test_tree = encoders.tree_xy(test_sample)
+        x_test_nn, y_test_nn = encoders.nn_xy(test_sample)
+
+        metrics = {
+            "tree": evaluate_model(tree_model, x_test_tree, y_test_tree),
+            "nn": evaluate_model(nn_model, scaler.transform(x_test_nn), y_test_nn),
+        }
+
+    return {
+        "tree_model": tree_model,
+        "tree_encoders": encoders.tree_encoders,
+        "nn_model": nn_model,
+        "nn_scaler": scaler,
+        "nn_target_encoder": encoders.target_encoder,
+        "nn_dummy_columns": encoders.dummy_columns,
+        "metrics": metrics,
+        "timings": {
+            "rows": rows,
+            "train_rows": train_rows,
+            "tree_sample_rows": len(tree_sample),
+            "test_sample_rows": len(test_sample),
+            "epochs": epochs,
+            "stages": timer.stages,
+            "total_seconds": round(time.perf_counter() - start, 3),
+        },
+    }
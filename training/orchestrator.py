@@ -0,0 +1,250 @@
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+import joblib
+import pandas as pd
+
+from preprocessing.base_preprocessing import base_preprocessing
+from preprocessing.encode_tree import encode_tree
+from preprocessing.encode_nn import encode_nn
+
+from training.prepare_data import prepare_data
+from training.train_tree import train_decision_tree
+from training.train_nn import train_neural_network
+from training.evaluate import evaluate_model
+
+# Bump when a cached stage changes its output, so old entries are not reused.
+CACHE_FORMAT = 1
+
+
+def dataset_fingerprint(df: pd.DataFrame) -> str:
+    digest = hashlib.sha256()
+    digest.update(",".join(f"{c}:{t}" for c, t in df.dtypes.items()).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()[:16]
+
+
+class StageCache:
+    def __init__(self, cache_dir: Optional[str]):
+        self.cache_dir = cache_dir
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def path(self, stage: str, key: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"{stage}_{key}.joblib")
+
+    def get_or_compute(
+        self, stage: str, key: str, compute: Callable[[], Any]
+    ) -> Tuple[Any, bool]:
+        path = self.path(stage, key)
+
+        if path and os.path.exists(path):
+            return joblib.load(path), True
+
+        value = compute()
+
+        if path:
+            # Write-then-rename so a concurrent or interrupted run never sees a
+            # half-written cache entry.
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            joblib.dump(value, tmp_path)
+            os.replace(tmp_path, path)
+
+        return value, False
+
+
+class StageTimer:
+    def __init__(self, branch: str = "main"):
+        self.branch = branch
+        self.stages: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        entry = {"branch": self.branch, "stage": name, "cached": False}
+        start = time.perf_counter()
+
+        try:
+            yield entry
+        finally:
+            entry["seconds"] = round(time.perf_counter() - start, 3)
+            self.stages.append(entry)
+
+
+def _stage_key(fingerprint: str, *params) -> str:
+    raw = "|".join([str(CACHE_FORMAT), fingerprint, *map(str, params)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _prepare_tree(preprocessed_df: pd.DataFrame) -> Dict[str, Any]:
+    encoded_tree_df, tree_encoders = encode_tree(preprocessed_df)
+    return {
+        "data": prepare_data(encoded_tree_df, model_type="tree"),
+        "tree_encoders": tree_encoders,
+    }
+
+
+def _prepare_nn(preprocessed_df: pd.DataFrame) -> Dict[str, Any]:
+    encoded_nn_df, dummy_columns = encode_nn(preprocessed_df)
+    return {
+        "data": prepare_data(encoded_nn_df, model_type="nn"),
+        "dummy_columns": dummy_columns,
+    }
+
+
+BRANCHES = {
+    "tree": (_prepare_tree, train_decision_tree),
+    "nn": (_prepare_nn, train_neural_network),
+}
+
+
+def _run_branch(
+    branch: str,
+    preprocessed: Any,
+    fingerprint: str,
+    cache_dir: Optional[str],
+    params: Optional[Dict[str, Any]] = None,
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    # Runs in a worker process: `preprocessed` is either the DataFrame itself or
+    # the path of its cache entry, which is cheaper to hand across processes.
+    timer = StageTimer(branch)
+    cache = StageCache(cache_dir)
+
+    prepare, fit = BRANCHES[branch]
+
+    def load_and_prepare():
+        df = (
+            joblib.load(preprocessed) if isinstance(preprocessed, str) else preprocessed
+        )
+        return prepare(df)
+
+    with timer.stage(f"prepare_{branch}") as entry:
+        prepared, entry["cached"] = cache.get_or_compute(
+            f"prepare_{branch}", _stage_key(fingerprint, branch), load_and_prepare
+        )
+
+    data = prepared["data"]
+
+    with timer.stage(f"fit_{branch}"):
+        model = fit(
+            X_train=data["x_train_bal"], y_train=data["y_train_bal"], **(params or {})
+        )
+
+    with timer.stage(f"evaluate_{branch}"):
+        metrics = evaluate_model(model, data["x_test"], data["y_test"])
+
+    prepared["model"] = model
+    prepared["metrics"] = metrics
+    return prepared, timer.stages
+
+
+def _preprocess(
+    raw_df: pd.DataFrame, cache: StageCache, timer: StageTimer
+) -> Tuple[str, pd.DataFrame]:
+    with timer.stage("fingerprint"):
+        fingerprint = dataset_fingerprint(raw_df)
+
+    with timer.stage("base_preprocessing") as entry:
+        preprocessed_df, entry["cached"] = cache.get_or_compute(
+            "base_preprocessing",
+            _stage_key(fingerprint),
+            lambda: base_preprocessing(raw_df),
+        )
+
+    return fingerprint, preprocessed_df
+
+
+def prepare_branches(
+    raw_df: pd.DataFrame, cache_dir: Optional[str] = None
+) -> Dict[str, Dict[str, Any]]:
+    # Encoded, split and SMOTE-resampled data for both branches, without fitting.
+    timer = StageTimer()
+    cache = StageCache(cache_dir)
+    fingerprint, preprocessed_df = _preprocess(raw_df, cache, timer)
+
+    prepared = {}
+    for branch, (prepare, _) in BRANCHES.items():
+        prepared[branch], _ = cache.get_or_compute(
+            f"prepare_{branch}",
+            _stage_key(fingerprint, branch),
+            lambda: prepare(preprocessed_df),
+        )
+
+    return prepared
+
+
+def run_training_pipeline(
+    raw_df: pd.DataFrame,
+    cache_dir: Optional[str] = None,
+    parallel: bool = True,
+    tree_params: Optional[Dict[str, Any]] = None,
+    nn_params: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    start = time.perf_counter()
+    timer = StageTimer()
+    cache = StageCache(cache_dir)
+
+    fingerprint, preprocessed_df = _preprocess(raw_df, cache, timer)
+
+    preprocessed = cache.path("base_preprocessing", _stage_key(fingerprint))
+    preprocessed = preprocessed if preprocessed else preprocessed_df
+
+    params = {"tree": tree_params, "nn": nn_params}
+
+    if parallel:
+        with ProcessPoolExecutor(max_workers=len(BRANCHES)) as pool:
+            futures = [
+                pool.submit(
+                    _run_branch,
+                    branch,
+                    preprocessed,
+                    fingerprint,
+                    cache_dir,
+                    params[branch],
+                )
+                for branch in BRANCHES
+            ]
+            outputs = [future.result() for future in futures]
+    else:
+        outputs = [
+            _run_branch(branch, preprocessed_df, fingerprint, cache_dir, params[branch])
+            for branch in BRANCHES
+        ]
+
+    (tree, tree_stages), (nn, nn_stages) = outputs
+    stages = timer.stages + tree_stages + nn_stages
+
+    return {
+        "tree_model": tree["model"],
+        "tree_encoders": tree["tree_encoders"],
+        "nn_model": nn["model"],
+        "nn_scaler": nn["data"]["scaler"],
+        "nn_target_encoder": nn["data"]["target_encoder"],
+        "nn_dummy_columns": nn["dummy_columns"],
+        "metrics": {"tree": tree["metrics"], "nn": nn["metrics"]},
+        "timings": {
+            "dataset_fingerprint": fingerprint,
+            "parallel": parallel,
+            "stages": stages,
+            "total_seconds": round(time.perf_counter() - start, 3),
+        },
+    }
+
+
+def format_timing_report(timings: Dict[str, Any]) -> str:
+    lines = [f"{'branch':<8}{'stage':<22}{'seconds':>10}  cached"]
+
+    for entry in timings["stages"]:
+        lines.append(
+            f"{entry['branch']:<8}{entry['stage']:<22}{entry['seconds']:>10.3f}"
+            f"  {'yes' if entry['cached'] else 'no'}"
+        )
+
+    lines.append(f"{'total':<30}{timings['total_seconds']:>10.3f}")
+    return "\n".join(lines)
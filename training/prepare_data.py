@@ -42,6 +42,8 @@ def prepare_data(
     return {
         "x_train": x_train,
         "y_train": y_train,
+        "x_test": x_test,
+        "y_test": y_test,
         "x_train_bal": x_train_bal,
         "y_train_bal": y_train_bal,
         "scaler": scaler,
@@ -0,0 +1,159 @@
+import itertools
+import time
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+from joblib import Parallel, delayed
+
+from predict.tree_evaluator import CompiledTree
+from training.evaluate import evaluate_model
+from training.train_tree import train_decision_tree
+from training.train_nn import train_neural_network
+
+TREE_GRID = {
+    "max_depth": [3, 4, 5, 6, 8, None],
+    "criterion": ["entropy", "gini"],
+    "min_samples_leaf": [1, 5],
+}
+
+NN_GRID = {
+    "hidden_layer_sizes": [(16,), (32,), (64,), (64, 64), (128, 128), (490, 490)],
+    "alpha": [1e-8, 1e-4],
+}
+
+# Rows timed one by one when measuring per-row inference latency.
+LATENCY_SAMPLE_ROWS = 200
+
+
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+
+
+def _row_latency_us(predict_row, X: np.ndarray) -> float:
+    rows = X[:LATENCY_SAMPLE_ROWS]
+    timings = []
+
+    for row in rows:
+        start = time.perf_counter()
+        predict_row(row)
+        timings.append(time.perf_counter() - start)
+
+    return round(float(np.median(timings)) * 1e6, 2)
+
+
+def measure_latency(branch: str, model, x_test) -> float:
+    # Times the path /predict actually takes: the compiled tree walks a single
+    # row, the MLP scores a 1-row matrix.
+    X = np.asarray(x_test, dtype=np.float64)
+
+    if branch == "tree":
+        compiled = CompiledTree(model)
+        return _row_latency_us(compiled.predict_proba_row, X)
+
+    return _row_latency_us(lambda row: model.predict_proba(row.reshape(1, -1)), X)
+
+
+def _fit_candidate(branch: str, params: Dict[str, Any], data: Dict[str, Any]):
+    fit = train_decision_tree if branch == "tree" else train_neural_network
+
+    start = time.perf_counter()
+    model = fit(X_train=data["x_train_bal"], y_train=data["y_train_bal"], **params)
+    fit_seconds = time.perf_counter() - start
+
+    return model, evaluate_model(model, data["x_test"], data["y_test"]), fit_seconds
+
+
+def pareto_frontier(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # A candidate is on the frontier if no other one is at least as accurate and
+    # at least as fast while being strictly better on one of the two.
+    frontier = []
+
+    for c in candidates:
+        dominated = any(
+            o["macro_f1"] >= c["macro_f1"]
+            and o["latency_us"] <= c["latency_us"]
+            and (o["macro_f1"] > c["macro_f1"] or o["latency_us"] < c["latency_us"])
+            for o in candidates
+        )
+        if not dominated:
+            frontier.append(c)
+
+    return sorted(frontier, key=lambda c: c["latency_us"])
+
+
+def choose_candidate(
+    frontier: List[Dict[str, Any]], f1_tolerance: float = 0.005
+) -> Dict[str, Any]:
+    # Fastest frontier point whose macro-F1 is within tolerance of the best.
+    best_f1 = max(c["macro_f1"] for c in frontier)
+    eligible = [c for c in frontier if c["macro_f1"] >= best_f1 - f1_tolerance]
+    return min(eligible, key=lambda c: c["latency_us"])
+
+
+def search_branch(
+    branch: str,
+    data: Dict[str, Any],
+    grid: Optional[Dict[str, List[Any]]] = None,
+    n_jobs: int = -1,
+    f1_tolerance: float = 0.005,
+) -> Dict[str, Any]:
+    grid = grid or (TREE_GRID if branch == "tree" else NN_GRID)
+    param_sets = expand_grid(grid)
+
+    fitted = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_candidate)(branch, params, data) for params in param_sets
+    )
+
+    # Latency is measured afterwards, one candidate at a time, so the timings
+    # are not skewed by the other fits competing for the same cores.
+    candidates = []
+    for params, (model, metrics, fit_seconds) in zip(param_sets, fitted):
+        candidates.append(
+            {
+                "params": params,
+                "macro_f1": metrics["macro_f1"],
+                "accuracy": metrics["accuracy"],
+                "latency_us": measure_latency(branch, model, data["x_test"]),
+                "fit_seconds": round(fit_seconds, 3),
+            }
+        )
+
+    frontier = pareto_frontier(candidates)
+
+    return {
+        "candidates": candidates,
+        "frontier": frontier,
+        "chosen": choose_candidate(frontier, f1_tolerance),
+    }
+
+
+def search_hyperparameters(
+    prepared: Dict[str, Dict[str, Any]],
+    n_jobs: int = -1,
+    f1_tolerance: float = 0.005,
+) -> Dict[str, Dict[str, Any]]:
+    return {
+        branch: search_branch(
+            branch, prepared[branch]["data"], n_jobs=n_jobs, f1_tolerance=f1_tolerance
+        )
+        for branch in ("tree", "nn")
+    }
+
+
+def format_frontier(results: Dict[str, Dict[str, Any]]) -> str:
+    lines = []
+
+    for branch, result in results.items():
+        lines.append(
+            f"{branch}: {len(result['candidates'])} candidates, Pareto frontier:"
+        )
+        lines.append(f"  {'macro_f1':>8}  {'latency_us':>10}  params")
+
+        for c in result["frontier"]:
+            marker = "  <- chosen" if c is result["chosen"] else ""
+            lines.append(
+                f"  {c['macro_f1']:>8.4f}  {c['latency_us']:>10.2f}  {c['params']}{marker}"
+            )
+
+    return "\n".join(lines)
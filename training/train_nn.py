@@ -1,17 +1,20 @@
 import numpy as np
 import pandas as pd
 from sklearn.neural_network import MLPClassifier
+from typing import Tuple
 
 
 def train_neural_network(
     X_train: np.ndarray,
     y_train: np.ndarray,
+    hidden_layer_sizes: Tuple[int, ...] = (490, 490),
+    alpha: float = 1e-8,
 ) -> MLPClassifier:
     model = MLPClassifier(
         solver="adam",
         activation="relu",
-        alpha=1e-8,
-        hidden_layer_sizes=(490, 490),
+        alpha=alpha,
+        hidden_layer_sizes=tuple(hidden_layer_sizes),
         random_state=1,
         max_iter=1000,
         early_stopping=True,
@@ -19,3 +22,18 @@ def train_neural_network(
 
     model.fit(X_train, y_train)
     return model
+
+
+def build_incremental_network(
+    hidden_layer_sizes: Tuple[int, ...] = (490, 490),
+    alpha: float = 1e-8,
+) -> MLPClassifier:
+    # Same network as train_neural_network, trained chunk by chunk with
+    # partial_fit (which does not support early_stopping).
+    return MLPClassifier(
+        solver="adam",
+        activation="relu",
+        alpha=alpha,
+        hidden_layer_sizes=tuple(hidden_layer_sizes),
+        random_state=1,
+    )
@@ -1,15 +1,21 @@
 import pandas as pd
 import numpy as np
 from sklearn.tree import DecisionTreeClassifier
-from typing import Union
+from typing import Optional, Union
 
 
 def train_decision_tree(
     X_train: pd.DataFrame | np.ndarray,
     y_train: pd.DataFrame | np.ndarray,
+    max_depth: Optional[int] = 5,
+    criterion: str = "entropy",
+    min_samples_leaf: int = 1,
 ) -> DecisionTreeClassifier:
     model = DecisionTreeClassifier(
-        max_depth=5, criterion="entropy", class_weight="balanced"
+        max_depth=max_depth,
+        criterion=criterion,
+        min_samples_leaf=min_samples_leaf,
+        class_weight="balanced",
     )
 
     model.fit(X_train, y_train)